@@ -1,72 +1,129 @@
-import os
 import sys
-from flask import Flask, render_template, request
+import time
+from contextlib import nullcontext
+from flask import Flask, Response, g, render_template, request, jsonify, url_for
 from src.RuralCreditPredictor.logger import logging
 from src.RuralCreditPredictor.exception import CustomException
 from src.RuralCreditPredictor.config.configuration import ConfigurationManager
-from src.RuralCreditPredictor.components.prediction import CustomData, Predictor
+from src.RuralCreditPredictor.components.request_decoder import RequestDecodeError
+from src.RuralCreditPredictor.components.training_jobs import TrainingJobManager, TrainingJobRunningError
+from src.RuralCreditPredictor.components.prediction_service import PredictionService, BatchTooLargeError
+from src.RuralCreditPredictor.components.sampling_profiler import ProfileOptionsError
+from src.RuralCreditPredictor.components.admission_control import (AdmissionController, ServiceOverloadedError,
+                                                                   get_deadline)
+from src.RuralCreditPredictor.components import metrics
 
 
 app = Flask(__name__)
 
+# Built once per worker: predictor, request decoder, coalescer and prediction cache
+prediction_service = PredictionService()
+
+# Bounded scoring concurrency and queue: overload is shed with fast 503s instead of letting every request time out
+serving_config = prediction_service.serving_config
+admission = AdmissionController(max_concurrency=serving_config.admission_max_concurrency,
+                                max_queue=serving_config.admission_max_queue) \
+    if serving_config.admission_enabled else None
+
+# Training runs as a separate, resource-limited background job; this worker only starts it and reports on it
+training_jobs = TrainingJobManager(config=ConfigurationManager().get_training_jobs_config())
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_response_status(response):
+    g.response_status = response.status_code
+    return response
+
+
+@app.teardown_request
+def record_request_metrics(error=None):
+    # Runs for every request, including failed ones (after_request has then recorded the 500)
+    if "request_started" not in g:
+        return
+
+    route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    metrics.REQUEST_LATENCY.observe(time.perf_counter() - g.request_started, route)
+    metrics.REQUESTS.inc(route, request.method, str(g.get("response_status", 500)))
+
+    prediction_service.profiler.request_finished()
+
+
+@app.errorhandler(ServiceOverloadedError)
+def service_overloaded(e):
+    return jsonify(error="Service overloaded, please retry", reason=e.reason), 503, \
+        {"Retry-After": str(e.retry_after)}
+
+
+def request_deadline() -> float:
+    return get_deadline(serving_config.deadline_ms, request.headers.get("X-Request-Deadline-Ms"))
+
+
+def admit(deadline: float):
+    return admission.admit(deadline) if admission is not None else nullcontext()
+
 
 @app.route('/', methods=['GET'])
 def home():
     return render_template('index.html')
 
 
-@app.route('/train', methods=['GET'])
+@app.route('/train', methods=['POST'])
 def training():
-    # launch app.py from the correct venv for successful training
-    os.system("dvc repro")
-    return "Training Successful!"
+    """
+    Starts the training pipeline (`dvc repro`) in the background and returns at once with the job to poll; only
+    one training job runs at a time.
+    """
+    try:
+        job = training_jobs.submit()
+
+    except TrainingJobRunningError as e:
+        return jsonify(error=str(e), job_id=e.job_id, status_url=url_for('training_status', job_id=e.job_id)), 409
+
+    return jsonify(job_id=job["job_id"], state=job["state"],
+                   status_url=url_for('training_status', job_id=job["job_id"])), 202
+
+
+@app.route('/train/<job_id>', methods=['GET'])
+def training_status(job_id):
+    status = training_jobs.status(job_id)
+    if status is None:
+        return jsonify(error="Unknown training job"), 404
+
+    return jsonify(status)
 
 
 @app.route('/predict', methods=['POST', 'GET'])
 def predict():
     if request.method == 'POST':
+        deadline = request_deadline()
+
+        try:
+            tier = prediction_service.decode_tier(request.headers.get("X-Model-Tier"))
+            record = prediction_service.decode(request.form)
+
+        except RequestDecodeError as e:
+            logging.warning(f"Rejected prediction request: {e}")
+            return f"Invalid input: {e}", 400
+
         try:
             logging.info("> Predicting the loan amount:")
 
-            age = int(request.form['age'])
-            sex = request.form['sex']
-            annual_income = float(request.form['annual_income'])
-            monthly_expenses = float(request.form['monthly_expenses'])
-            old_dependents = int(request.form['old_dependents'])
-            young_dependents = int(request.form['young_dependents'])
-            home_ownership = float(request.form['home_ownership'])
-            type_of_house = request.form['type_of_house']
-            occupants_count = int(request.form['occupants_count'])
-            house_area = float(request.form['house_area'])
-            loan_tenure = int(request.form['loan_tenure'])
-            loan_installments = int(request.form['loan_installments'])
-
-            custom_data = CustomData(
-                age=age,
-                sex=sex,
-                annual_income=annual_income,
-                monthly_expenses=monthly_expenses,
-                old_dependents=old_dependents,
-                young_dependents=young_dependents,
-                home_ownership=home_ownership,
-                type_of_house=type_of_house,
-                occupants_count=occupants_count,
-                house_area=house_area,
-                loan_tenure=loan_tenure,
-                loan_installments=loan_installments
-            )
-
-            input_data = custom_data.get_data_as_df()
-
-            # Get Prediction
-            config_manager = ConfigurationManager()
-            prediction_config = config_manager.get_prediction_config()
-            predictor = Predictor(config=prediction_config)
-            loan_amount = int(predictor.predict(input_data))
+            # Get Prediction (the typed record goes straight to the compiled encoder, no DataFrame needed)
+            with admit(deadline):
+                loan_amount = int(prediction_service.predict_one(record, tier=tier, deadline=deadline))
 
             logging.info(f"Predicted loan amount: {loan_amount}")
 
-            return render_template('results.html', prediction=str(loan_amount))
+            return render_template('results.html', prediction=str(loan_amount)), \
+                {"X-Model-Tier": prediction_service.served_tier(tier)}
+
+        except ServiceOverloadedError:
+            raise
 
         except Exception as e:
             logging.error(f"Error in predicting loan amount!")
@@ -76,5 +133,97 @@ def predict():
         return render_template('index.html')
 
 
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """
+    Scores many applicants in one vectorized pass.
+    Accepts either a JSON list of applicants or {"applicants": [...]}; predictions are returned in input order.
+    The `X-Model-Tier: fast` header scores them with the distilled pre-screening model instead.
+    """
+    deadline = request_deadline()
+
+    try:
+        tier = prediction_service.decode_tier(request.headers.get("X-Model-Tier"))
+        records = prediction_service.decode_batch(request.get_json(silent=True))
+
+    except RequestDecodeError as e:
+        return jsonify(error="Invalid applicants", fields=e.errors), 413 if isinstance(e, BatchTooLargeError) else 400
+
+    return score_batch(records, tier, deadline)
+
+
+@app.route('/predict/fast', methods=['POST'])
+def predict_fast():
+    """
+    Pre-screening: same payload as /predict/batch, scored by the distilled fast tier model (or the full model
+    while no surrogate passed the accuracy guardrail; the `X-Model-Tier` response header tells which).
+    """
+    deadline = request_deadline()
+
+    try:
+        records = prediction_service.decode_batch(request.get_json(silent=True))
+
+    except RequestDecodeError as e:
+        return jsonify(error="Invalid applicants", fields=e.errors), 413 if isinstance(e, BatchTooLargeError) else 400
+
+    return score_batch(records, "fast", deadline)
+
+
+def score_batch(records, tier, deadline):
+    try:
+        logging.info(f"> Predicting the loan amount for a batch of {len(records)} applicants ({tier} tier):")
+
+        with admit(deadline):
+            loan_amounts = prediction_service.predict_many(records, tier=tier, deadline=deadline)
+        served_tier = prediction_service.served_tier(tier)
+
+        logging.info("Batch loan amounts predicted successfully!")
+
+        return jsonify(predictions=loan_amounts, count=len(loan_amounts), tier=served_tier), \
+            {"X-Model-Tier": served_tier}
+
+    except ServiceOverloadedError:
+        raise
+
+    except Exception as e:
+        logging.error(f"Error in predicting batch loan amounts!")
+        raise CustomException(e, sys)
+
+
+@app.route('/predict/cache', methods=['GET'])
+def prediction_cache_stats():
+    return jsonify(prediction_service.cache_stats())
+
+
+@app.route('/admin/profile', methods=['GET', 'POST'])
+def admin_profile():
+    """
+    Admin-only: POST starts sampling this worker for `seconds` or the next `requests` requests (JSON body or query
+    parameters); GET returns the profiler status and the paths of the last profile written under artifacts/.
+    """
+    if not prediction_service.profiler.is_authorized(request.headers.get("X-Admin-Token")):
+        return jsonify(error="Forbidden"), 403
+
+    if request.method == 'GET':
+        return jsonify(prediction_service.profiler.status())
+
+    options = {**request.args.to_dict(), **(request.get_json(silent=True) or {})}
+    try:
+        status = prediction_service.profiler.start(seconds=options.get("seconds"),
+                                                   requests=options.get("requests"),
+                                                   interval_ms=options.get("interval_ms"))
+    except ProfileOptionsError as e:
+        return jsonify(error=str(e)), 400
+    except RuntimeError as e:
+        return jsonify(error=str(e)), 409
+
+    return jsonify(status), 202
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
+
 if __name__ == '__main__':
     app.run(host="0.0.0.0", port=8080)
@@ -0,0 +1,252 @@
+import time
+import asyncio
+import functools
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+from starlette.templating import Jinja2Templates
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.config.configuration import ConfigurationManager
+from src.RuralCreditPredictor.components.request_decoder import RequestDecodeError
+from src.RuralCreditPredictor.components.training_jobs import TrainingJobManager, TrainingJobRunningError
+from src.RuralCreditPredictor.components.prediction_service import PredictionService, BatchTooLargeError
+from src.RuralCreditPredictor.components.sampling_profiler import ProfileOptionsError
+from src.RuralCreditPredictor.components.admission_control import (AsyncAdmissionController, ServiceOverloadedError,
+                                                                   DeadlineExceededError, get_deadline)
+from src.RuralCreditPredictor.components import metrics
+
+
+# Async serving entry point: run with `uvicorn asgi:app --host 0.0.0.0 --port 8080`
+# Same prediction routes as app.py; slow clients only hold a coroutine, never a worker thread.
+
+templates = Jinja2Templates(directory="templates")
+
+prediction_service = PredictionService()
+
+# Training runs as a separate, resource-limited background job; this worker only starts it and reports on it
+training_jobs = TrainingJobManager(config=ConfigurationManager().get_training_jobs_config())
+
+serving_config = prediction_service.serving_config
+
+# CPU-bound scoring runs on a bounded pool; model loads run on the predictor's own loading thread and other
+# blocking housekeeping on this one, so neither ever takes a scoring slot
+scoring_executor = ThreadPoolExecutor(max_workers=serving_config.executor_workers, thread_name_prefix="scoring")
+loading_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="housekeeping")
+
+# Bounded scoring concurrency and queue in front of the pool (whose own queue is unbounded): overload is shed with
+# fast 503s instead of letting every request time out
+admission = AsyncAdmissionController(max_concurrency=serving_config.admission_max_concurrency,
+                                     max_queue=serving_config.admission_max_queue) \
+    if serving_config.admission_enabled else None
+
+
+def request_deadline(request: Request) -> float:
+    return get_deadline(serving_config.deadline_ms, request.headers.get("X-Request-Deadline-Ms"))
+
+
+async def ensure_model_loaded(deadline: float) -> None:
+    """
+    Awaits the serving artifacts, at most until the request deadline. A (re)load runs once in the background and
+    every request arriving meanwhile awaits that same load instead of starting its own; past the deadline the
+    previous model answers, or the request is shed when there is none yet.
+    """
+    predictor = prediction_service.predictor
+    if predictor.artifacts_are_current():
+        return
+
+    load = asyncio.wrap_future(predictor.reload_in_background())
+    try:
+        # Shielded: a client disconnecting must not cancel the load shared with other requests
+        await asyncio.wait_for(asyncio.shield(load), timeout=max(0.0, deadline - time.monotonic()))
+
+    except asyncio.TimeoutError:
+        if not predictor.has_artifacts():
+            raise DeadlineExceededError("the model is still loading")
+
+    except Exception:
+        if not predictor.has_artifacts():
+            raise
+
+
+async def run_scoring(fn, *args, deadline: float):
+    async with admission.admit(deadline) if admission is not None else nullcontext():
+        await ensure_model_loaded(deadline)
+        return await asyncio.get_running_loop().run_in_executor(scoring_executor,
+                                                                functools.partial(fn, *args, deadline=deadline))
+
+
+async def home(request: Request):
+    return templates.TemplateResponse(request, "index.html")
+
+
+async def training(request: Request):
+    try:
+        # Only forks the runner, but that still does not belong on the event loop
+        job = await asyncio.get_running_loop().run_in_executor(loading_executor, training_jobs.submit)
+
+    except TrainingJobRunningError as e:
+        return JSONResponse({"error": str(e), "job_id": e.job_id,
+                             "status_url": str(request.url_for("training_status", job_id=e.job_id))},
+                            status_code=409)
+
+    return JSONResponse({"job_id": job["job_id"], "state": job["state"],
+                         "status_url": str(request.url_for("training_status", job_id=job["job_id"]))},
+                        status_code=202)
+
+
+async def training_status(request: Request):
+    status = training_jobs.status(request.path_params["job_id"])
+    if status is None:
+        return JSONResponse({"error": "Unknown training job"}, status_code=404)
+
+    return JSONResponse(status)
+
+
+async def predict(request: Request):
+    if request.method != "POST":
+        return templates.TemplateResponse(request, "index.html")
+
+    deadline = request_deadline(request)
+
+    try:
+        tier = prediction_service.decode_tier(request.headers.get("X-Model-Tier"))
+        record = prediction_service.decode(await request.form())
+
+    except RequestDecodeError as e:
+        logging.warning(f"Rejected prediction request: {e}")
+        return PlainTextResponse(f"Invalid input: {e}", status_code=400)
+
+    logging.info("> Predicting the loan amount (async):")
+
+    loan_amount = int(await run_scoring(prediction_service.predict_one, record, tier, deadline=deadline))
+
+    logging.info(f"Predicted loan amount: {loan_amount}")
+
+    return templates.TemplateResponse(request, "results.html", {"prediction": str(loan_amount)},
+                                      headers={"X-Model-Tier": prediction_service.served_tier(tier)})
+
+
+async def predict_batch(request: Request, tier: str = None):
+    deadline = request_deadline(request)
+
+    try:
+        payload = await request.json()
+    except ValueError:
+        payload = None
+
+    try:
+        tier = tier or prediction_service.decode_tier(request.headers.get("X-Model-Tier"))
+        records = prediction_service.decode_batch(payload)
+
+    except RequestDecodeError as e:
+        return JSONResponse({"error": "Invalid applicants", "fields": e.errors},
+                            status_code=413 if isinstance(e, BatchTooLargeError) else 400)
+
+    logging.info(f"> Predicting the loan amount for a batch of {len(records)} applicants ({tier} tier, async):")
+
+    loan_amounts = await run_scoring(prediction_service.predict_many, records, tier, deadline=deadline)
+    served_tier = prediction_service.served_tier(tier)
+
+    return JSONResponse({"predictions": loan_amounts, "count": len(loan_amounts), "tier": served_tier},
+                        headers={"X-Model-Tier": served_tier})
+
+
+async def predict_fast(request: Request):
+    # Pre-screening: /predict/batch payloads scored by the distilled fast tier model
+    return await predict_batch(request, tier="fast")
+
+
+async def prediction_cache_stats(request: Request):
+    return JSONResponse(prediction_service.cache_stats())
+
+
+async def admin_profile(request: Request):
+    profiler = prediction_service.profiler
+    if not profiler.is_authorized(request.headers.get("X-Admin-Token")):
+        return JSONResponse({"error": "Forbidden"}, status_code=403)
+
+    if request.method == "GET":
+        return JSONResponse(profiler.status())
+
+    try:
+        body = await request.json()
+    except ValueError:
+        body = None
+
+    options = {**request.query_params, **(body if isinstance(body, dict) else {})}
+    try:
+        status = profiler.start(seconds=options.get("seconds"), requests=options.get("requests"),
+                                interval_ms=options.get("interval_ms"))
+    except ProfileOptionsError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    except RuntimeError as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+
+    return JSONResponse(status, status_code=202)
+
+
+async def service_overloaded(request: Request, e: ServiceOverloadedError):
+    return JSONResponse({"error": "Service overloaded, please retry", "reason": e.reason}, status_code=503,
+                        headers={"Retry-After": str(e.retry_after)})
+
+
+async def metrics_endpoint(request: Request):
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware recording request latency and status per route (unknown paths share one label).
+    """
+
+    def __init__(self, app, routes):
+        self.app = app
+        # The router records the matched endpoint in the scope; templated paths are labelled by their template
+        self.routes = {route.endpoint: route.path for route in routes if isinstance(route, Route)}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started, status = time.perf_counter(), [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = self.routes.get(scope.get("endpoint"), "unmatched")
+            metrics.REQUEST_LATENCY.observe(time.perf_counter() - started, route)
+            metrics.REQUESTS.inc(route, scope["method"], str(status[0]))
+
+            prediction_service.profiler.request_finished()
+
+
+routes = [
+    Route("/", home, methods=["GET"]),
+    Route("/train", training, methods=["POST"]),
+    Route("/train/{job_id}", training_status, methods=["GET"]),
+    Route("/predict", predict, methods=["GET", "POST"]),
+    Route("/predict/batch", predict_batch, methods=["POST"]),
+    Route("/predict/fast", predict_fast, methods=["POST"]),
+    Route("/predict/cache", prediction_cache_stats, methods=["GET"]),
+    Route("/metrics", metrics_endpoint, methods=["GET"]),
+    Route("/admin/profile", admin_profile, methods=["GET", "POST"]),
+    Mount("/static", app=StaticFiles(directory="static"), name="static"),
+]
+
+app = Starlette(routes=routes, exception_handlers={ServiceOverloadedError: service_overloaded})
+app.add_middleware(RequestMetricsMiddleware, routes=routes)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=8080)
@@ -7,6 +7,9 @@ from src.RuralCreditPredictor.pipeline.data_preprocessing import DataPreprocessi
 from src.RuralCreditPredictor.pipeline.data_transformation import DataTransformationPipeline
 from src.RuralCreditPredictor.pipeline.model_training import ModelTrainingPipeline
 from src.RuralCreditPredictor.pipeline.model_evaluation import ModelEvaluationPipeline
+from src.RuralCreditPredictor.pipeline.model_distillation import ModelDistillationPipeline
+from src.RuralCreditPredictor.pipeline.model_compaction import ModelCompactionPipeline
+from src.RuralCreditPredictor.pipeline.model_export import ModelExportPipeline
 
 
 logging.info(">>>>>> Rural Credit Predictor Pipeline started <<<<<<\n")
@@ -95,6 +98,51 @@ try:
     model_evaluator.main()
 
     logging.info(f">>>>>> stage '{STAGE_NAME}' completed <<<<<<\n")
+
+except Exception as e:
+    logging.error(f"Error occurred while running {STAGE_NAME}!")
+    raise CustomException(e, sys)
+
+
+STAGE_NAME = "Model Distillation"
+
+try:
+    logging.info(f">>>>>> stage '{STAGE_NAME}' started <<<<<<")
+
+    model_distiller = ModelDistillationPipeline()
+    model_distiller.main()
+
+    logging.info(f">>>>>> stage '{STAGE_NAME}' completed <<<<<<\n")
+
+except Exception as e:
+    logging.error(f"Error occurred while running {STAGE_NAME}!")
+    raise CustomException(e, sys)
+
+
+STAGE_NAME = "Model Compaction"
+
+try:
+    logging.info(f">>>>>> stage '{STAGE_NAME}' started <<<<<<")
+
+    model_compactor = ModelCompactionPipeline()
+    model_compactor.main()
+
+    logging.info(f">>>>>> stage '{STAGE_NAME}' completed <<<<<<\n")
+
+except Exception as e:
+    logging.error(f"Error occurred while running {STAGE_NAME}!")
+    raise CustomException(e, sys)
+
+
+STAGE_NAME = "Model Export"
+
+try:
+    logging.info(f">>>>>> stage '{STAGE_NAME}' started <<<<<<")
+
+    model_exporter = ModelExportPipeline()
+    model_exporter.main()
+
+    logging.info(f">>>>>> stage '{STAGE_NAME}' completed <<<<<<\n")
     logging.info(">>>>>> Rural Credit Predictor Pipeline completed <<<<<<")
 
 except Exception as e:
@@ -0,0 +1,125 @@
+import time
+import asyncio
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.components.metrics import IN_FLIGHT, QUEUE_DEPTH, REJECTIONS
+
+
+class ServiceOverloadedError(Exception):
+    """
+    The request was shed instead of served; answered with 503 and a Retry-After header.
+    """
+
+    def __init__(self, reason: str, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(ServiceOverloadedError):
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__("deadline", message, retry_after)
+
+
+def get_deadline(deadline_ms: float, requested_ms=None) -> float:
+    """
+    Monotonic deadline of a request: the serving deadline, or the client's own (`X-Request-Deadline-Ms`) when
+    shorter. An unparsable client deadline is ignored.
+    """
+    try:
+        if requested_ms is not None:
+            deadline_ms = min(deadline_ms, max(0.0, float(requested_ms)))
+    except ValueError:
+        pass
+
+    return time.monotonic() + deadline_ms / 1000
+
+
+class AdmissionController:
+    """
+    Admission control for the WSGI workers: at most `max_concurrency` requests are scored at once and at most
+    `max_queue` more wait for a slot. A request arriving to a full queue is rejected at once, and a queued request
+    that cannot get a slot before its deadline is rejected when the deadline passes, so under overload the excess is
+    shed with fast 503s instead of every request timing out.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.waiting = 0
+        self._slots = threading.Semaphore(max_concurrency)
+        self._lock = threading.Lock()
+
+        # Read when /metrics is scraped
+        IN_FLIGHT.set_function(lambda: self.in_flight)
+        QUEUE_DEPTH.set_function(lambda: self.waiting)
+
+    def _reject(self, reason: str, message: str):
+        REJECTIONS.inc(reason)
+        logging.warning(f"Request shed ({reason}): {message}")
+        return DeadlineExceededError(message) if reason == "deadline" else ServiceOverloadedError(reason, message)
+
+    @contextmanager
+    def admit(self, deadline: float):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self.waiting >= self.max_queue:
+                    raise self._reject("queue_full", f"{self.waiting} requests already waiting")
+                self.waiting += 1
+
+            try:
+                acquired = self._slots.acquire(timeout=max(0.0, deadline - time.monotonic()))
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+
+            if not acquired:
+                raise self._reject("deadline", "no scoring slot freed up before the request deadline")
+
+        with self._lock:
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+
+class AsyncAdmissionController(AdmissionController):
+    """
+    The same admission control for the ASGI entry point, waiting on the event loop instead of blocking a thread.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int):
+        super().__init__(max_concurrency, max_queue)
+        self._async_slots = None
+
+    @asynccontextmanager
+    async def admit(self, deadline: float):
+        # Created on first use, inside the serving event loop
+        if self._async_slots is None:
+            self._async_slots = asyncio.Semaphore(self.max_concurrency)
+
+        if self._async_slots.locked():
+            if self.waiting >= self.max_queue:
+                raise self._reject("queue_full", f"{self.waiting} requests already waiting")
+
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._async_slots.acquire(), timeout=max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                raise self._reject("deadline", "no scoring slot freed up before the request deadline")
+            finally:
+                self.waiting -= 1
+        else:
+            await self._async_slots.acquire()
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._async_slots.release()
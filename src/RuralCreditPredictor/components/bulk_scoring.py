@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.utils.common import table_writer
+from src.RuralCreditPredictor.entity.config_entity import BulkPredictionConfig, PredictionConfig
+from src.RuralCreditPredictor.components.prediction import Predictor
+
+
+# One predictor per pool worker, created by the pool initializer so each worker loads the model exactly once
+_worker_predictor = None
+
+
+def _init_worker(prediction_config: PredictionConfig) -> None:
+    global _worker_predictor
+
+    _worker_predictor = Predictor(config=prediction_config)
+    _worker_predictor.get_artifacts()
+
+
+def _score_chunk(features: pd.DataFrame):
+    return _worker_predictor.predict_batch(features)
+
+
+class BulkScorer:
+    """
+    Offline scoring of large CSV/Parquet files of applicants.
+
+    The input is read in chunks, chunks are scored in a process pool, and results are appended to the output file
+    in input order. At most `max_pending_chunks` chunks are in flight, so memory stays bounded by the chunk size
+    whatever the file size.
+    """
+
+    def __init__(self, config: BulkPredictionConfig, prediction_config: PredictionConfig, selected_features: list):
+        self.config = config
+        self.prediction_config = prediction_config
+        self.selected_features = selected_features
+
+    def read_chunks(self, input_file):
+        if str(input_file).endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            for batch in pq.ParquetFile(input_file).iter_batches(batch_size=self.config.chunk_size):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(input_file, chunksize=self.config.chunk_size)
+
+    def score_file(self, input_file, output_file, n_workers: int = None) -> int:
+        try:
+            n_workers = n_workers or self.config.n_workers or os.cpu_count()
+            max_pending = self.config.max_pending_chunks or 2 * n_workers
+
+            logging.info(f"> Bulk scoring {input_file} -> {output_file} "
+                         f"(chunk_size: {self.config.chunk_size}, workers: {n_workers}):")
+
+            rows_done, started = 0, time.monotonic()
+            pending = deque()
+
+            def drain_one(write):
+                nonlocal rows_done
+                chunk, future = pending.popleft()
+                chunk[self.config.prediction_column] = future.result()
+                write(chunk)
+
+                rows_done += len(chunk)
+                elapsed = time.monotonic() - started
+                logging.info(f"Scored {rows_done} rows ({rows_done / elapsed:.0f} rows/s)")
+
+            # Format given by the output file's extension; the file only appears once every chunk is written, so a
+            # failed run never leaves a truncated output behind
+            with table_writer(Path(output_file)) as write, \
+                    ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                        initargs=(self.prediction_config,)) as pool:
+                for chunk in self.read_chunks(input_file):
+                    # Only the model features are shipped to the workers
+                    pending.append((chunk, pool.submit(_score_chunk, chunk[self.selected_features])))
+
+                    if len(pending) >= max_pending:
+                        drain_one(write)
+
+                while pending:
+                    drain_one(write)
+
+            if Path(output_file).suffix.lower() == ".parquet":
+                import pyarrow.parquet as pq
+
+                # Reads the footer only: the output must be a complete Parquet file holding every scored row
+                written_rows = pq.read_metadata(output_file).num_rows
+                if written_rows != rows_done:
+                    raise ValueError(f"{output_file} holds {written_rows} rows, {rows_done} were scored")
+
+            logging.info(f"Bulk scoring completed! {rows_done} rows scored in {time.monotonic() - started:.1f}s, "
+                         f"saved at: {output_file}")
+
+            return rows_done
+
+        except Exception as e:
+            logging.error(f"Error in bulk scoring {input_file}!")
+            raise CustomException(e, sys)
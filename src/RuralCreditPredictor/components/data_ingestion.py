@@ -5,7 +5,7 @@ import requests
 from pathlib import Path
 from src.RuralCreditPredictor.logger import logging
 from src.RuralCreditPredictor.exception import CustomException
-from src.RuralCreditPredictor.utils.common import get_size
+from src.RuralCreditPredictor.utils.common import get_size, write_table
 from src.RuralCreditPredictor.config.configuration import ConfigurationManager
 from src.RuralCreditPredictor.entity.config_entity import DataIngestionConfig
 
@@ -53,6 +53,28 @@ class DataIngestion:
             logging.error(f"Error occurred while unzipping data file!")
             raise CustomException(e, sys)
 
+    def convert_raw_file(self):
+        try:
+            # The raw CSV is parsed once here; later stages read the (columnar) raw table instead
+            if not os.path.exists(self.config.raw_table) or \
+                    os.path.getmtime(self.config.raw_table) < os.path.getmtime(self.config.raw_file):
+                logging.info("Converting raw data file to the raw table format:")
+
+                from src.RuralCreditPredictor.components.data_loader import SchemaDataLoader
+
+                loader = SchemaDataLoader(self.config.raw_schema, self.config.categoricals,
+                                          self.config.downcast_integers)
+                write_table(loader.read(Path(self.config.raw_file)), Path(self.config.raw_table))
+
+                logging.info(f"Raw data converted successfully to: {self.config.raw_table}")
+
+            else:
+                logging.info(f"Raw table already up to date at: {self.config.raw_table}")
+
+        except Exception as e:
+            logging.error(f"Error occurred while converting raw data file!")
+            raise CustomException(e, sys)
+
 
 if __name__ == "__main__":
     config_manager = ConfigurationManager()
@@ -61,3 +83,4 @@ if __name__ == "__main__":
     data_ingestion = DataIngestion(config=data_ingestion_config)
     data_ingestion.download_file()
     data_ingestion.unzip_file()
+    data_ingestion.convert_raw_file()
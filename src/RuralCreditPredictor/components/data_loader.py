@@ -0,0 +1,281 @@
+import os
+import sys
+import json
+import dataclasses
+import resource
+import subprocess
+from pathlib import Path
+from datetime import datetime
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.constants import PROJECT_ROOT
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.utils.common import read_table, write_table, cast_to_schema, save_json_atomic
+from src.RuralCreditPredictor.entity.config_entity import DataLoadingConfig
+
+
+def frame_memory_mb(data) -> float:
+    return round(data.memory_usage(deep=True).sum() / 1024 ** 2, 3)
+
+
+def _proc_status_mb(field: str):
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+
+
+def _reset_peak_rss() -> None:
+    # Linux: resets the peak (VmHWM) to the current RSS, so the peak of the imports is not counted
+    try:
+        with open("/proc/self/clear_refs", "w") as file:
+            file.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss (KB on Linux) cannot be reset: only a fallback without procfs
+    peak = _proc_status_mb("VmHWM")
+    return peak if peak is not None else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _current_rss_mb() -> float:
+    current = _proc_status_mb("VmRSS")
+    return current if current is not None else _peak_rss_mb()
+
+
+class SchemaDataLoader:
+    """
+    Loads the pipeline's tables with the dtypes declared in raw_schema.yaml / processed_schema.yaml instead of
+    letting pandas infer them:
+
+    - only the columns a stage asks for are read (usecols / column projection);
+    - string (object) columns are loaded as categoricals: each value is stored once plus a small integer code per
+      row, instead of one Python string object per row;
+    - integer columns are stored in the smallest integer type that holds all their values. The downcast is
+      lossless; float columns are left as float64, as float32 would change the imputed means, outlier bounds and
+      scaling computed from them;
+    - an integer column with missing values cannot be an integer column and is loaded as float64, as pandas
+      inference does.
+    """
+
+    def __init__(self, dtypes: dict, categoricals: bool = True, downcast_integers: bool = True):
+        self.dtypes = dict(dtypes)
+        self.categoricals = categoricals
+        self.downcast_integers = downcast_integers
+
+    def _csv_dtype(self, column: str):
+        dtype = self.dtypes.get(column, "object")
+        if dtype == "object":
+            return "category" if self.categoricals else "object"
+        if dtype is not None and dtype.startswith("int"):
+            # Nullable while parsing; made a plain integer column (or float64 if it has missing values) afterwards
+            return "Int64"
+        return dtype
+
+    def optimize(self, data):
+        """
+        Applies the schema's dtypes (categoricals and integer downcasting) to an already loaded DataFrame.
+        """
+        import pandas as pd
+
+        for column in data.columns:
+            dtype = self.dtypes.get(column)
+            if dtype is None:
+                continue
+
+            if dtype.startswith("int"):
+                if isinstance(data[column].dtype, pd.Int64Dtype):
+                    data[column] = data[column].astype("int64" if not data[column].hasnans else "float64")
+                if self.downcast_integers and pd.api.types.is_integer_dtype(data[column].dtype):
+                    data[column] = pd.to_numeric(data[column], downcast="integer")
+
+            elif dtype == "object":
+                if self.categoricals:
+                    values = data[column] if isinstance(data[column].dtype, pd.CategoricalDtype) \
+                        else data[column].astype("category")
+                    # Sorted whatever the order of the file's dictionary, so every load and every chunk agrees
+                    if not values.cat.categories.is_monotonic_increasing:
+                        values = values.cat.reorder_categories(sorted(values.cat.categories))
+                    data[column] = values
+
+            else:
+                data = cast_to_schema(data, {column: dtype})
+
+        return data
+
+    def read(self, path: Path, columns=None):
+        try:
+            import pandas as pd
+
+            columns = list(columns) if columns is not None else None
+
+            if Path(path).suffix.lower() == ".csv":
+                dtypes = {column: self._csv_dtype(column) for column in (columns or self.dtypes)}
+                data = pd.read_csv(path, usecols=columns, dtype=dtypes)
+                if columns is not None:
+                    data = data[columns]
+            else:
+                data = read_table(path, columns=columns)
+
+            data = self.optimize(data)
+
+            logging.info(f"Loaded {data.shape[0]} rows x {data.shape[1]} columns from: {path} "
+                         f"({frame_memory_mb(data)} MB in memory)")
+
+            return data
+
+        except Exception as e:
+            logging.error(f"Error in loading data with the schema dtypes from: {path}")
+            raise CustomException(e, sys)
+
+    def read_chunks(self, path: Path, columns=None, chunk_size: int = 100000):
+        """
+        Yields the table in DataFrames of at most `chunk_size` rows, each loaded as `read` would. Parquet and CSV
+        files are streamed; a Feather file is memory mapped, so it is only read chunk by chunk when uncompressed.
+
+        Dtypes are per chunk: a downcast integer column may be narrower in one chunk than in another, and each
+        chunk's categoricals only know that chunk's categories (CSV).
+        """
+        try:
+            import pandas as pd
+
+            columns = list(columns) if columns is not None else None
+            suffix = Path(path).suffix.lower()
+
+            if suffix == ".csv":
+                dtypes = {column: self._csv_dtype(column) for column in (columns or self.dtypes)}
+                for chunk in pd.read_csv(path, usecols=columns, dtype=dtypes, chunksize=chunk_size):
+                    yield self.optimize(chunk[columns] if columns is not None else chunk)
+
+            elif suffix == ".parquet":
+                import pyarrow.parquet as pq
+
+                for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+                    yield self.optimize(batch.to_pandas())
+
+            else:
+                import pyarrow.feather as feather
+
+                table = feather.read_table(path, columns=columns, memory_map=True)
+                for batch in table.to_batches(max_chunksize=chunk_size):
+                    yield self.optimize(batch.to_pandas())
+
+        except Exception as e:
+            logging.error(f"Error in loading data in chunks with the schema dtypes from: {path}")
+            raise CustomException(e, sys)
+
+
+def _stage_loads(config_manager) -> dict:
+    """
+    Per stage: (file pandas inference would read, function loading the stage's data the way the stage does now).
+    """
+    from src.RuralCreditPredictor.components.data_preprocessing import DataPreprocessing
+    from src.RuralCreditPredictor.components.data_transformation import DataTransformation
+
+    data_ingestion_config = config_manager.get_data_ingestion_config(log=False)
+    data_preprocessing_config = config_manager.get_data_preprocessing_config(log=False)
+    data_transformation_config = config_manager.get_data_transformer_config(log=False)
+
+    return {
+        "data_ingestion": (
+            data_ingestion_config.raw_file,
+            lambda: SchemaDataLoader(
+                data_ingestion_config.raw_schema, data_ingestion_config.categoricals,
+                data_ingestion_config.downcast_integers
+            ).read(Path(data_ingestion_config.raw_file))
+        ),
+        "data_preprocessing": (
+            data_ingestion_config.raw_file,
+            # The in-memory load, whether or not the stage is configured to preprocess in chunks
+            lambda: DataPreprocessing(config=dataclasses.replace(data_preprocessing_config, chunk_size=None)).data
+        ),
+        "data_transformation": (
+            None,
+            lambda: DataTransformation(config=data_transformation_config).processed_data
+        )
+    }
+
+
+class DataLoadingReport:
+    """
+    Peak memory of each stage's data loading, with pandas dtype inference over the whole CSV (how every stage
+    loaded its data before) vs the schema loader. Each load is measured in a fresh process, as its peak RSS minus
+    the RSS after imports, so loads do not inherit each other's memory.
+    """
+
+    def __init__(self, config: DataLoadingConfig):
+        self.config = config
+
+    def _measure(self, stage: str, mode: str, csv_file=None) -> dict:
+        command = [sys.executable, "-m", "src.RuralCreditPredictor.components.data_loader", "measure", stage, mode]
+        if csv_file is not None:
+            command.append(str(csv_file))
+
+        output = subprocess.run(command, cwd=PROJECT_ROOT, check=True, capture_output=True, text=True).stdout
+        return json.loads(output.strip().splitlines()[-1])
+
+    def run(self, config_manager) -> dict:
+        try:
+            logging.info("> Measuring the memory of data loading per stage:")
+
+            report = {"stages": {}, "created_at": datetime.now().isoformat()}
+            processed_csv = os.path.join(self.config.root_dir, "processed_data.csv")
+
+            for stage, (csv_file, _) in _stage_loads(config_manager).items():
+                if csv_file is None:
+                    # The processed table as the CSV the stage used to read
+                    preprocessed_file = config_manager.get_data_transformer_config(log=False).preprocessed_file
+                    write_table(read_table(Path(preprocessed_file)), Path(processed_csv))
+                    csv_file = processed_csv
+
+                inferred = self._measure(stage, "inferred", csv_file)
+                schema = self._measure(stage, "schema")
+                report["stages"][stage] = {
+                    "inferred": inferred,
+                    "schema": schema,
+                    "peak_reduction": round(inferred["peak_rss_mb"] / max(schema["peak_rss_mb"], 1e-3), 2)
+                }
+
+                logging.info(f"{stage}: peak {inferred['peak_rss_mb']} -> {schema['peak_rss_mb']} MB, "
+                             f"frame {inferred['frame_mb']} -> {schema['frame_mb']} MB")
+
+            if os.path.exists(processed_csv):
+                os.remove(processed_csv)
+
+            save_json_atomic(Path(self.config.memory_report), report)
+
+            logging.info(f"Data loading memory report saved at: {self.config.memory_report}")
+
+            return report
+
+        except Exception as e:
+            logging.error(f"Error in measuring the memory of data loading!")
+            raise CustomException(e, sys)
+
+
+if __name__ == '__main__':
+    from src.RuralCreditPredictor.config.configuration import ConfigurationManager
+
+    config_manager = ConfigurationManager()
+
+    if len(sys.argv) > 1 and sys.argv[1] == "measure":
+        # Child mode, started by DataLoadingReport: `measure <stage> <inferred|schema> [csv file]`
+        import pandas as pd
+        import pyarrow.parquet  # noqa: F401, imported before measuring like pandas, whichever mode reads a table
+
+        stage, mode = sys.argv[2], sys.argv[3]
+        csv_file, load = _stage_loads(config_manager)[stage]
+        csv_file = sys.argv[4] if len(sys.argv) > 4 else csv_file
+
+        _reset_peak_rss()
+        started = _current_rss_mb()
+        data = pd.read_csv(csv_file) if mode == "inferred" else load()
+        print(json.dumps({"rows": data.shape[0], "columns": data.shape[1], "frame_mb": frame_memory_mb(data),
+                          "peak_rss_mb": round(_peak_rss_mb() - started, 2)}))
+    else:
+        data_loading_report = DataLoadingReport(config=config_manager.get_data_loading_config())
+        data_loading_report.run(config_manager)
@@ -1,15 +1,169 @@
 import sys
-import pandas as pd
+import math
+from pathlib import Path
+import numpy as np
 from src.RuralCreditPredictor.logger import logging
 from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.utils.common import write_table, table_writer
 from src.RuralCreditPredictor.config.configuration import ConfigurationManager
 from src.RuralCreditPredictor.entity.config_entity import DataPreprocessingConfig
+from src.RuralCreditPredictor.components.data_loader import SchemaDataLoader
+
+
+HISTOGRAM_BINS = 1024
+
+
+def exact_sum_terms(values) -> list:
+    """
+    Non-overlapping floats whose exact sum is the exact sum of `values`. Chunks' terms add up (with math.fsum) to
+    the correctly rounded sum of the whole column, whatever the chunking.
+    """
+    values = list(values)
+    terms = []
+    while True:
+        term = math.fsum(values + [-term for term in terms])
+        if term == 0:
+            return terms
+        terms.append(term)
+
+
+def exact_mean(values) -> float:
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    return math.fsum(values.tolist()) / len(values) if len(values) else float("nan")
+
+
+def quantile_ranks(n: int, q: float) -> tuple:
+    # Order statistics (0-based) pandas' default (numpy "linear") quantile interpolates between
+    lower = int(math.floor((n - 1) * q))
+    return lower, min(lower + 1, n - 1)
+
+
+def interpolate_quantile(lower: float, upper: float, n: int, q: float) -> float:
+    # numpy's "linear" interpolation, step for step (its result is not symmetric in lower/upper)
+    t = (n - 1) * q - math.floor((n - 1) * q)
+    if t >= 0.5:
+        return upper - (upper - lower) * (1 - t)
+    return lower + (upper - lower) * t
+
+
+def outlier_bounds(order_statistic, n: int) -> tuple:
+    """
+    IQR outlier bounds from the quartiles, `order_statistic(k)` giving the k-th smallest value (0-based). Works in
+    float64, as a downcast integer column would wrap around in its own dtype.
+    """
+    if n == 0:
+        return float("nan"), float("nan")
+
+    q1 = interpolate_quantile(*(float(order_statistic(k)) for k in quantile_ranks(n, 0.25)), n, 0.25)
+    q3 = interpolate_quantile(*(float(order_statistic(k)) for k in quantile_ranks(n, 0.75)), n, 0.75)
+    iqr = q3 - q1
+
+    return q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+
+def _merge_counts(counts, values: np.ndarray):
+    unique, unique_counts = np.unique(values, return_counts=True)
+    if counts is None:
+        return unique, unique_counts
+
+    merged, inverse = np.unique(np.concatenate([counts[0], unique]), return_inverse=True)
+    return merged, np.bincount(inverse, weights=np.concatenate([counts[1], unique_counts])).astype(np.int64)
+
+
+def select_order_statistics(values_pass, ranks_of, budget: int) -> tuple:
+    """
+    Exact order statistics of a column too large to hold, in bounded memory.
+
+    `values_pass()` yields the column's values (float64 arrays) chunk by chunk, a full pass each call. The first
+    pass counts the values and their distinct values; if there are at most `budget` distinct values the order
+    statistics are read off the counts. Otherwise each further pass narrows, for every rank still unresolved, the
+    value interval holding it down to one of `HISTOGRAM_BINS` equal-width bins, until an interval holds at most
+    `budget` distinct values.
+
+    Returns:
+        tuple: (number of values, {rank: value}) for the ranks `ranks_of(number of values)`
+    """
+    n, low, high, counts = 0, np.inf, -np.inf, None
+    for values in values_pass():
+        if not len(values):
+            continue
+        n += len(values)
+        low, high = min(low, values.min()), max(high, values.max())
+        if counts is not False:
+            counts = _merge_counts(counts, values)
+            if len(counts[0]) > budget:
+                counts = False
+
+    if n == 0:
+        return 0, {}
+
+    def read_off(counts, rank, offset):
+        cumulative = np.cumsum(counts[1])
+        return counts[0][np.searchsorted(cumulative, rank - offset, side="right")]
+
+    ranks = set(ranks_of(n))
+    if counts is not False:
+        return n, {rank: read_off(counts, rank, 0) for rank in ranks}
+
+    # rank -> [interval low, interval high, high included, values below the interval]
+    pending = {rank: [low, high, True, 0] for rank in ranks}
+    selected = {}
+    while pending:
+        edges = {rank: np.linspace(interval[0], interval[1], HISTOGRAM_BINS + 1) for rank, interval in pending.items()}
+        histograms = {rank: np.zeros(HISTOGRAM_BINS, dtype=np.int64) for rank in pending}
+        interval_counts = {rank: None for rank in pending}
+
+        for values in values_pass():
+            for rank, (low, high, closed, _) in pending.items():
+                inside = values[(values >= low) & ((values < high) | (closed & (values == high)))]
+                bins = np.clip(np.searchsorted(edges[rank], inside, side="right") - 1, 0, HISTOGRAM_BINS - 1)
+                histograms[rank] += np.bincount(bins, minlength=HISTOGRAM_BINS)
+                if interval_counts[rank] is not False and len(inside):
+                    interval_counts[rank] = _merge_counts(interval_counts[rank], inside)
+                    if len(interval_counts[rank][0]) > budget:
+                        interval_counts[rank] = False
+
+        for rank in list(pending):
+            low, high, closed, offset = pending[rank]
+            if interval_counts[rank] is not False:
+                selected[rank] = read_off(interval_counts[rank], rank, offset)
+                del pending[rank]
+                continue
+
+            cumulative = np.cumsum(histograms[rank])
+            b = int(np.searchsorted(cumulative, rank - offset, side="right"))
+            pending[rank] = [edges[rank][b], edges[rank][b + 1], closed and b == HISTOGRAM_BINS - 1,
+                             offset + (int(cumulative[b - 1]) if b > 0 else 0)]
+
+    return n, selected
 
 
 class DataPreprocessing:
+    """
+    Imputes missing values, drops applicants under 18 / over 65 and IQR outliers of the continuous features, and
+    keeps the selected features and the target.
+
+    With `chunk_size` set the raw table is never loaded whole: `preprocess_in_chunks` streams it in chunks of that
+    many rows (see its docstring); the result is identical to the in-memory path's.
+    """
+
     def __init__(self, config: DataPreprocessingConfig):
         self.config = config
-        self.data = pd.read_csv(self.config.raw_file)
+        self.missing_features = set()
+        self.data = self.load_data() if not self.config.chunk_size else None
+
+    def _columns(self) -> list:
+        # Only the columns the preprocessed data keeps: the filters and imputation of these do not read any other
+        _, _, selected_features, target_variable = self.get_columns_list(log=False)
+        return list(dict.fromkeys(selected_features + list(self.config.continuous_num_features.keys()) +
+                                  target_variable))
+
+    def _loader(self) -> SchemaDataLoader:
+        return SchemaDataLoader(self.config.raw_schema, self.config.categoricals, self.config.downcast_integers)
+
+    def load_data(self):
+        return self._loader().read(Path(self.config.raw_file), columns=self._columns())
 
     def get_columns_list(self, log=True) -> tuple:
         try:
@@ -40,6 +194,12 @@ class DataPreprocessing:
                 logging.error(f"Error occurred while getting columns list!")
             raise CustomException(e, sys)
 
+    def get_output_dtypes(self) -> dict:
+        # Schema dtypes, except integer features that had missing values: imputed, they are float64 in every chunk
+        dtypes = {**self.config.selected_features, **self.config.target_variable}
+        return {column: "float64" if column in self.missing_features and dtype.startswith("int") else dtype
+                for column, dtype in dtypes.items()}
+
     def impute_missing_values(self) -> None:
         try:
             logging.info("Imputing missing values:")
@@ -51,12 +211,14 @@ class DataPreprocessing:
 
             for feature in all_features:
                 if df[feature].isnull().sum() > 0:
+                    self.missing_features.add(feature)
+
                     if feature in cat_features:
                         df[feature] = df[feature].fillna(df[feature].mode()[0])  # Mode imputation for cat_features
                         logging.info("Mode imputation applied for: {}".format(feature))
 
                     elif feature in num_features:
-                        df[feature] = df[feature].fillna(df[feature].mean())  # Mean imputation for num_features
+                        df[feature] = df[feature].fillna(exact_mean(df[feature]))  # Mean imputation for num_features
                         logging.info("Mean imputation applied for: {}".format(feature))
 
             logging.info("Imputed missing values successfully!")
@@ -92,11 +254,8 @@ class DataPreprocessing:
             continuous_num_features = list(self.config.continuous_num_features.keys())
 
             for feature in continuous_num_features:
-                q1 = df[feature].quantile(0.25)
-                q3 = df[feature].quantile(0.75)
-                iqr = q3 - q1
-                lower_bound = q1 - 1.5 * iqr
-                upper_bound = q3 + 1.5 * iqr
+                values = np.sort(df[feature].dropna().to_numpy(dtype=np.float64))
+                lower_bound, upper_bound = outlier_bounds(values.__getitem__, len(values))
 
                 df_filtered = df[(df[feature] >= lower_bound) & (df[feature] <= upper_bound)]
                 df = df_filtered
@@ -132,7 +291,7 @@ class DataPreprocessing:
             logging.info("Exporting preprocessed data:")
 
             df = self.data
-            df.to_csv(self.config.preprocessed_file, index=False)
+            write_table(df, Path(self.config.preprocessed_file), dtypes=self.get_output_dtypes())
 
             logging.info("Preprocessed data exported successfully!")
 
@@ -140,13 +299,161 @@ class DataPreprocessing:
             logging.error(f"Error occurred while exporting preprocessed data!")
             raise CustomException(e, sys)
 
+    def _read_chunks(self, categories: dict = None):
+        for chunk in self._loader().read_chunks(Path(self.config.raw_file), columns=self._columns(),
+                                                chunk_size=self.config.chunk_size):
+            # Every chunk gets every category, so imputed values and the written table's categories match
+            for feature, feature_categories in (categories or {}).items():
+                chunk[feature] = chunk[feature].cat.set_categories(feature_categories)
+            yield chunk
+
+    def _prepare_chunk(self, chunk, imputation: dict, bounds: list):
+        # What the in-memory path does to these rows, with the statistics of the whole table
+        for feature, value in imputation.items():
+            chunk[feature] = chunk[feature].fillna(value)
+
+        chunk = chunk[~((chunk['age'] < 18) | (chunk['age'] > 65))]
+        for feature, lower_bound, upper_bound in bounds:
+            chunk = chunk[(chunk[feature] >= lower_bound) & (chunk[feature] <= upper_bound)]
+
+        return chunk
+
+    def get_imputation_statistics(self) -> tuple:
+        """
+        First pass: the imputation value of every feature with missing values (mode of the whole column for
+        categorical features, exact mean for numerical ones) and the categories of every categorical column.
+        """
+        cat_features, num_features, _, _ = self.get_columns_list(log=False)
+
+        value_counts, sum_terms, value_count, categories = {}, {}, {}, {}
+        for chunk in self._read_chunks():
+            for feature in chunk.columns:
+                column = chunk[feature]
+                if column.isnull().any():
+                    self.missing_features.add(feature)
+
+                if column.dtype.name == "category":
+                    categories.setdefault(feature, set()).update(column.cat.categories)
+
+                if feature in cat_features:
+                    counts = value_counts.setdefault(feature, {})
+                    for value, count in column.value_counts().items():
+                        if count:
+                            counts[value] = counts.get(value, 0) + int(count)
+
+                elif feature in num_features:
+                    values = column.dropna().to_numpy(dtype=np.float64)
+                    sum_terms.setdefault(feature, []).extend(exact_sum_terms(values.tolist()))
+                    value_count[feature] = value_count.get(feature, 0) + len(values)
+
+        imputation = {}
+        for feature in self.missing_features:
+            if feature in cat_features:
+                # Ties go to the smallest value, as pandas' mode()[0]
+                most = max(value_counts[feature].values())
+                imputation[feature] = min(value for value, count in value_counts[feature].items() if count == most)
+            elif feature in num_features:
+                imputation[feature] = math.fsum(sum_terms[feature]) / value_count[feature]
+
+        return imputation, {feature: sorted(values) for feature, values in categories.items()}
+
+    def preprocess_in_chunks(self) -> None:
+        """
+        Out-of-core preprocessing, holding at most `chunk_size` rows of the raw table (plus at most `chunk_size`
+        distinct values of one feature) at a time:
+
+        1. a pass for the imputation statistics (see get_imputation_statistics);
+        2. per continuous feature, in order, pass(es) for its exact quartiles over the rows kept by the age filter
+           and the outlier bounds of the features before it, as the in-memory path filters them one after the
+           other (see select_order_statistics);
+        3. a pass imputing and filtering each chunk and appending it to the preprocessed table.
+        """
+        try:
+            logging.info(f"Preprocessing data in chunks of {self.config.chunk_size} rows:")
+
+            _, _, selected_features, target_variable = self.get_columns_list()
+
+            imputation, categories = self.get_imputation_statistics()
+            for feature in imputation:
+                logging.info("{} imputation computed for: {}".format(
+                    "Mode" if feature in self.config.cat_features else "Mean", feature))
+
+            bounds = []
+            for feature in self.config.continuous_num_features.keys():
+                def values_pass(feature=feature, bounds=tuple(bounds)):
+                    for chunk in self._read_chunks(categories):
+                        chunk = self._prepare_chunk(chunk, imputation, list(bounds))
+                        yield chunk[feature].dropna().to_numpy(dtype=np.float64)
+
+                n, order_statistics = select_order_statistics(
+                    values_pass, lambda n: quantile_ranks(n, 0.25) + quantile_ranks(n, 0.75), self.config.chunk_size
+                )
+                lower_bound, upper_bound = outlier_bounds(order_statistics.__getitem__, n)
+                bounds.append((feature, lower_bound, upper_bound))
+
+                logging.info(f"Outlier bounds of {feature}: [{lower_bound}, {upper_bound}]")
+
+            rows_in, rows_out = 0, 0
+            with table_writer(Path(self.config.preprocessed_file), dtypes=self.get_output_dtypes()) as write:
+                for chunk in self._read_chunks(categories):
+                    rows_in += len(chunk)
+                    chunk = self._prepare_chunk(chunk, imputation, bounds)[selected_features + target_variable]
+                    rows_out += len(chunk)
+                    write(chunk)
+
+            logging.info(f"Preprocessed data exported successfully! Kept {rows_out} of {rows_in} rows")
+
+        except Exception as e:
+            logging.error(f"Error occurred while preprocessing data in chunks!")
+            raise CustomException(e, sys)
+
 
 if __name__ == '__main__':
+    import dataclasses
+
     config_manager = ConfigurationManager()
     data_preprocessing_config = config_manager.get_data_preprocessing_config()
-    data_preprocessing = DataPreprocessing(config=data_preprocessing_config)
-    data_preprocessing.impute_missing_values()
-    data_preprocessing.drop_under_and_above_age()
-    data_preprocessing.drop_outliers()
-    data_preprocessing.get_preprocessed_data()
-    data_preprocessing.save_preprocessed_data()
+
+    if len(sys.argv) > 1 and sys.argv[1] == "verify":
+        # Equivalence check of the chunked path against the in-memory path: `verify [chunk size]`
+        from src.RuralCreditPredictor.utils.common import read_table
+
+        chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else data_preprocessing_config.chunk_size or 100000
+        root_dir = Path(data_preprocessing_config.root_dir)
+        suffix = Path(data_preprocessing_config.preprocessed_file).suffix
+
+        in_memory = DataPreprocessing(config=dataclasses.replace(
+            data_preprocessing_config, chunk_size=None, preprocessed_file=root_dir / f"verify_in_memory{suffix}"))
+        in_memory.impute_missing_values()
+        in_memory.drop_under_and_above_age()
+        in_memory.drop_outliers()
+        in_memory.get_preprocessed_data()
+        in_memory.save_preprocessed_data()
+
+        chunked = DataPreprocessing(config=dataclasses.replace(
+            data_preprocessing_config, chunk_size=chunk_size, preprocessed_file=root_dir / f"verify_chunked{suffix}"))
+        chunked.preprocess_in_chunks()
+
+        expected = read_table(Path(in_memory.config.preprocessed_file))
+        actual = read_table(Path(chunked.config.preprocessed_file))
+        identical = expected.equals(actual) and dict(expected.dtypes) == dict(actual.dtypes)
+
+        for path in (in_memory.config.preprocessed_file, chunked.config.preprocessed_file):
+            Path(path).unlink()
+
+        if identical:
+            logging.info(f"Chunked preprocessing (chunks of {chunk_size} rows) matches the in-memory path exactly!")
+        else:
+            logging.error(f"Chunked preprocessing (chunks of {chunk_size} rows) differs from the in-memory path!")
+            sys.exit(1)
+
+    else:
+        data_preprocessing = DataPreprocessing(config=data_preprocessing_config)
+        if data_preprocessing_config.chunk_size:
+            data_preprocessing.preprocess_in_chunks()
+        else:
+            data_preprocessing.impute_missing_values()
+            data_preprocessing.drop_under_and_above_age()
+            data_preprocessing.drop_outliers()
+            data_preprocessing.get_preprocessed_data()
+            data_preprocessing.save_preprocessed_data()
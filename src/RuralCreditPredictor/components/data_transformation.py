@@ -1,6 +1,7 @@
 import sys
 import pandas as pd
 import pickle
+from pathlib import Path
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.compose import ColumnTransformer
@@ -8,12 +9,19 @@ from src.RuralCreditPredictor.logger import logging
 from src.RuralCreditPredictor.exception import CustomException
 from src.RuralCreditPredictor.config.configuration import ConfigurationManager
 from src.RuralCreditPredictor.entity.config_entity import DataTransformationConfig
+from src.RuralCreditPredictor.components.data_loader import SchemaDataLoader
 
 
 class DataTransformation:
     def __init__(self, config: DataTransformationConfig):
         self.config = config
-        self.processed_data = pd.read_csv(self.config.preprocessed_file)
+        self.processed_data = SchemaDataLoader(
+            {**self.config.selected_features, **self.config.target_variable},
+            self.config.categoricals, self.config.downcast_integers
+        ).read(
+            Path(self.config.preprocessed_file),
+            columns=list(self.config.selected_features.keys()) + list(self.config.target_variable.keys())
+        )
 
     def split_data(self, log=True) -> tuple:
         try:
@@ -1,7 +1,8 @@
 import sys
-import pandas as pd
+from pathlib import Path
 from src.RuralCreditPredictor.logger import logging
 from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.utils.common import get_table_columns
 from src.RuralCreditPredictor.config.configuration import ConfigurationManager
 from src.RuralCreditPredictor.entity.config_entity import DataValidationConfig
 
@@ -16,8 +17,7 @@ class DataValidation:
 
             validation_status = None
 
-            data = pd.read_csv(self.config.raw_file)
-            all_cols = list(data.columns)
+            all_cols = get_table_columns(Path(self.config.raw_file))
 
             raw_schema = self.config.raw_schema.keys()
 
@@ -0,0 +1,231 @@
+import os
+import sys
+import json
+import numpy as np
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+
+
+def _to_json(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class CompiledEncoder:
+    """
+    Lightweight replacement for the fitted ColumnTransformer on the serving path.
+
+    One-hot columns are resolved through a precomputed category -> output column lookup table (the dropped
+    category maps to no column), and numerical columns are scaled with the StandardScaler's precomputed means and
+    scales. Inputs can be a list of record dicts, a NumPy structured/record array, or any mapping of column name
+    to values (including a DataFrame), so no DataFrame has to be built per request.
+    """
+
+    _DROPPED = -1
+
+    def __init__(self, cat_features, category_lookup, handle_unknown, num_features, num_columns, means, scales,
+                 n_output_features):
+        self.cat_features = cat_features
+        self.category_lookup = category_lookup
+        self.handle_unknown = handle_unknown
+        self.num_features = num_features
+        self.num_columns = num_columns
+        self.means = means
+        self.scales = scales
+        self.n_output_features = n_output_features
+
+    @classmethod
+    def from_column_transformer(cls, data_transformer):
+        try:
+            logging.info("> Compiling the data transformer into a lookup/scaling encoder:")
+
+            from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+            cat_features, category_lookup, handle_unknown = [], [], []
+            num_features, num_columns, means, scales = [], [], [], []
+            offset = 0
+
+            for name, transformer, columns in data_transformer.transformers_:
+                if transformer == "drop" or len(columns) == 0:
+                    continue
+
+                if isinstance(transformer, OneHotEncoder):
+                    drop_idx = transformer.drop_idx_
+                    for i, (feature, categories) in enumerate(zip(columns, transformer.categories_)):
+                        dropped = None if drop_idx is None or drop_idx[i] is None else int(drop_idx[i])
+
+                        lookup = {}
+                        for j, category in enumerate(categories):
+                            if j == dropped:
+                                lookup[category] = cls._DROPPED
+                            else:
+                                lookup[category] = offset
+                                offset += 1
+
+                        cat_features.append(feature)
+                        category_lookup.append(lookup)
+                        handle_unknown.append(transformer.handle_unknown)
+
+                elif isinstance(transformer, StandardScaler):
+                    n = len(columns)
+                    num_features.extend(columns)
+                    num_columns.extend(range(offset, offset + n))
+                    means.append(transformer.mean_ if transformer.mean_ is not None else np.zeros(n))
+                    scales.append(transformer.scale_ if transformer.scale_ is not None else np.ones(n))
+                    offset += n
+
+                else:
+                    raise TypeError(f"Cannot compile transformer '{name}' of type {type(transformer).__name__}")
+
+            n_output_features = len(data_transformer.get_feature_names_out())
+            if offset != n_output_features:
+                raise ValueError(f"Compiled encoder produces {offset} features, transformer has {n_output_features}")
+
+            compiled_encoder = cls(
+                cat_features=cat_features,
+                category_lookup=category_lookup,
+                handle_unknown=handle_unknown,
+                num_features=num_features,
+                num_columns=np.asarray(num_columns, dtype=np.intp),
+                means=np.concatenate(means) if means else np.zeros(0),
+                scales=np.concatenate(scales) if scales else np.ones(0),
+                n_output_features=n_output_features
+            )
+
+            logging.info(f"Data transformer compiled successfully! Output features: {n_output_features}")
+
+            return compiled_encoder
+
+        except Exception as e:
+            logging.error(f"Error in compiling the data transformer!")
+            raise CustomException(e, sys)
+
+    def save(self, directory) -> None:
+        """
+        Writes the scaler parameters as .npy files and the category lookup tables as json.
+        """
+        try:
+            os.makedirs(directory, exist_ok=True)
+
+            np.save(os.path.join(directory, "num_columns.npy"), self.num_columns)
+            np.save(os.path.join(directory, "means.npy"), self.means)
+            np.save(os.path.join(directory, "scales.npy"), self.scales)
+
+            # Lookup tables as [category, column] pairs: categories can be strings or numbers
+            encoder = {
+                "cat_features": list(self.cat_features),
+                "category_lookup": [[[_to_json(category), column] for category, column in lookup.items()]
+                                    for lookup in self.category_lookup],
+                "handle_unknown": list(self.handle_unknown),
+                "num_features": list(self.num_features),
+                "n_output_features": int(self.n_output_features)
+            }
+            with open(os.path.join(directory, "encoder.json"), "w") as file:
+                json.dump(encoder, file, indent=4)
+
+            logging.info(f"Compiled encoder saved at: {directory}")
+
+        except Exception as e:
+            logging.error(f"Error in saving the compiled encoder!")
+            raise CustomException(e, sys)
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        try:
+            with open(os.path.join(directory, "encoder.json")) as file:
+                encoder = json.load(file)
+
+            return cls(
+                cat_features=encoder["cat_features"],
+                category_lookup=[{category: column for category, column in lookup}
+                                 for lookup in encoder["category_lookup"]],
+                handle_unknown=encoder["handle_unknown"],
+                num_features=encoder["num_features"],
+                num_columns=np.load(os.path.join(directory, "num_columns.npy"), mmap_mode=mmap_mode),
+                means=np.load(os.path.join(directory, "means.npy"), mmap_mode=mmap_mode),
+                scales=np.load(os.path.join(directory, "scales.npy"), mmap_mode=mmap_mode),
+                n_output_features=encoder["n_output_features"]
+            )
+
+        except Exception as e:
+            logging.error(f"Error in loading the compiled encoder from: {directory}")
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def _get_column(data, feature):
+        if isinstance(data, list):
+            return [record[feature] for record in data]
+
+        # DataFrame, structured array or mapping of column name -> values
+        return data[feature]
+
+    def transform(self, data) -> np.ndarray:
+        if isinstance(data, dict) and not isinstance(next(iter(data.values())), (list, tuple, np.ndarray)):
+            data = [data]
+
+        n_rows = len(data) if isinstance(data, (list, np.ndarray)) else len(data[next(iter(data.keys()))])
+        output = np.zeros((n_rows, self.n_output_features), dtype=np.float64)
+
+        for feature, lookup, handle_unknown in zip(self.cat_features, self.category_lookup, self.handle_unknown):
+            for row, category in enumerate(self._get_column(data, feature)):
+                column = lookup.get(category)
+
+                if column is None:
+                    if handle_unknown == "error":
+                        raise ValueError(f"Found unknown category {category!r} in column '{feature}'")
+                elif column != self._DROPPED:
+                    output[row, column] = 1.0
+
+        if self.num_features:
+            values = np.column_stack(
+                [np.asarray(self._get_column(data, feature), dtype=np.float64) for feature in self.num_features]
+            )
+            # Same operation order as StandardScaler.transform (subtract, then divide) for identical results
+            values -= self.means
+            values /= self.scales
+            output[:, self.num_columns] = values
+
+        return output
+
+    def verify(self, data_transformer, data) -> bool:
+        """
+        Checks that the compiled encoder reproduces `data_transformer.transform(data)` exactly.
+        """
+        try:
+            logging.info(f"> Verifying the compiled encoder against the data transformer on {len(data)} rows:")
+
+            expected = data_transformer.transform(data)
+            expected = expected.toarray() if hasattr(expected, "toarray") else np.asarray(expected)
+
+            actual = self.transform(data)
+
+            mismatches = int(np.sum(np.any(expected != actual, axis=1)))
+            if mismatches:
+                logging.error(f"Compiled encoder mismatch on {mismatches} rows!")
+            else:
+                logging.info("Compiled encoder matches the data transformer exactly!")
+
+            return mismatches == 0
+
+        except Exception as e:
+            logging.error(f"Error in verifying the compiled encoder!")
+            raise CustomException(e, sys)
+
+
+if __name__ == '__main__':
+    from pathlib import Path
+    from src.RuralCreditPredictor.utils.common import read_table
+    from src.RuralCreditPredictor.config.configuration import ConfigurationManager
+    from src.RuralCreditPredictor.components.prediction import Predictor
+
+    # Equivalence check against the sklearn transformer over the whole processed dataset
+    config_manager = ConfigurationManager()
+    data_transformation_config = config_manager.get_data_transformer_config()
+    predictor = Predictor(config=config_manager.get_prediction_config())
+
+    data_transformer = predictor.load_data_transformer()
+    processed_data = read_table(Path(data_transformation_config.preprocessed_file),
+                                columns=list(data_transformation_config.selected_features.keys()))
+
+    compiled_encoder = CompiledEncoder.from_column_transformer(data_transformer)
+    if not compiled_encoder.verify(data_transformer, processed_data):
+        sys.exit(1)
@@ -0,0 +1,332 @@
+import os
+import sys
+import json
+import numpy as np
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+
+
+def _smallest_index_dtype(max_value: int):
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if max_value <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _float32_floor(values) -> np.ndarray:
+    """
+    Largest float32 <= each float64 value: for any float32 x, `x <= value` and `x <= floor` agree.
+    """
+    rounded = np.asarray(values, dtype=np.float64).astype(np.float32)
+    too_big = rounded.astype(np.float64) > values
+    rounded[too_big] = np.nextafter(rounded[too_big], np.float32(-np.inf))
+    return rounded
+
+
+class CompiledForest:
+    """
+    Array-compiled inference engine for a fitted sklearn RandomForestRegressor.
+
+    All trees are flattened into contiguous node arrays (feature, threshold, left/right child, leaf value) and a
+    whole batch is pushed through every tree at once, one tree level per vectorized step. Leaves point to
+    themselves, and (row, tree) pairs that reached a leaf are retired from the active set after each step.
+
+    Scoring reproduces sklearn exactly: features are compared as float32 against float64 thresholds, and leaf
+    values are summed tree by tree in estimator order before dividing by the number of trees.
+    """
+
+    _ARRAYS = ("feature", "threshold", "children_left", "children_right", "value", "roots", "is_leaf")
+
+    def __init__(self, feature, threshold, children_left, children_right, value, roots, n_features, is_leaf=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.value = value
+        self.roots = roots
+        self.n_features = n_features
+        self.n_trees = len(roots)
+        if is_leaf is None:
+            is_leaf = children_left == np.arange(len(children_left), dtype=children_left.dtype)
+        self.is_leaf = is_leaf
+
+    @classmethod
+    def from_sklearn(cls, model):
+        try:
+            logging.info("> Compiling the random forest into flat node arrays:")
+
+            features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+            offset = 0
+
+            for estimator in model.estimators_:
+                tree = estimator.tree_
+                node_ids = np.arange(tree.node_count)
+                leaf = tree.children_left == -1
+
+                features.append(np.where(leaf, 0, tree.feature))
+                thresholds.append(np.where(leaf, 0.0, tree.threshold))
+                lefts.append(np.where(leaf, node_ids, tree.children_left) + offset)
+                rights.append(np.where(leaf, node_ids, tree.children_right) + offset)
+                values.append(tree.value[:, 0, 0])
+                roots.append(offset)
+
+                offset += tree.node_count
+
+            compiled_forest = cls(
+                feature=np.ascontiguousarray(np.concatenate(features), dtype=np.int32),
+                threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+                children_left=np.ascontiguousarray(np.concatenate(lefts), dtype=np.int32),
+                children_right=np.ascontiguousarray(np.concatenate(rights), dtype=np.int32),
+                value=np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+                roots=np.asarray(roots, dtype=np.int32),
+                n_features=model.n_features_in_
+            )
+
+            logging.info(f"Random forest compiled successfully! Trees: {compiled_forest.n_trees}, "
+                         f"nodes: {offset}, size: {compiled_forest.nbytes / 1024 ** 2:.2f} MB")
+
+            return compiled_forest
+
+        except Exception as e:
+            logging.error(f"Error in compiling the random forest!")
+            raise CustomException(e, sys)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self._ARRAYS)
+
+    def save(self, directory) -> None:
+        """
+        Writes every node array as a raw .npy file (memory-mappable) plus the scalar metadata.
+        """
+        try:
+            os.makedirs(directory, exist_ok=True)
+
+            for name in self._ARRAYS:
+                np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+
+            with open(os.path.join(directory, "forest.json"), "w") as file:
+                json.dump({"n_features": int(self.n_features), "n_trees": int(self.n_trees)}, file, indent=4)
+
+            logging.info(f"Compiled forest saved at: {directory}")
+
+        except Exception as e:
+            logging.error(f"Error in saving the compiled forest!")
+            raise CustomException(e, sys)
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        """
+        Loads a saved forest. With mmap_mode="r" the node arrays are mapped read-only, so every process attached to
+        the same files shares a single physical copy through the page cache.
+        """
+        try:
+            with open(os.path.join(directory, "forest.json")) as file:
+                meta = json.load(file)
+
+            arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+                      for name in cls._ARRAYS}
+
+            return cls(n_features=meta["n_features"], **arrays)
+
+        except Exception as e:
+            logging.error(f"Error in loading the compiled forest from: {directory}")
+            raise CustomException(e, sys)
+
+    def compact(self, tolerance: float = 0.0):
+        """
+        Returns a smaller, equivalent forest:
+
+        - thresholds are stored as float32, rounded down, which is lossless since inputs are compared as float32
+        - node and feature indices use the smallest unsigned dtype that fits
+        - identical leaves are deduplicated into one shared pool of leaf nodes
+        - any subtree whose leaf values span at most `tolerance` is collapsed into a single leaf (the midpoint)
+
+        With tolerance=0 only subtrees predicting one single value are collapsed, so predictions are unchanged bit
+        for bit; a positive tolerance changes each tree's output by at most tolerance / 2.
+        """
+        try:
+            logging.info(f"> Compacting the compiled forest (tolerance: {tolerance}):")
+
+            is_leaf = np.asarray(self.is_leaf).tolist()
+            lefts = np.asarray(self.children_left).tolist()
+            rights = np.asarray(self.children_right).tolist()
+            values = np.asarray(self.value).tolist()
+
+            # Preorder over the internal nodes of every tree: parents come before their children
+            preorder = []
+            for root in np.asarray(self.roots).tolist():
+                stack = [root]
+                while stack:
+                    node = stack.pop()
+                    if not is_leaf[node]:
+                        preorder.append(node)
+                        stack.append(rights[node])
+                        stack.append(lefts[node])
+
+            # Range of leaf values under every node, children first
+            low, high = list(values), list(values)
+            for node in reversed(preorder):
+                left, right = lefts[node], rights[node]
+                low[node] = min(low[left], low[right])
+                high[node] = max(high[left], high[right])
+
+            # Kept internal nodes get new ids after the leaf pool; collapsed nodes become shared leaves
+            kept, leaf_value = [], {}
+            for root in np.asarray(self.roots).tolist():
+                stack = [root]
+                while stack:
+                    node = stack.pop()
+                    if is_leaf[node] or high[node] - low[node] <= tolerance:
+                        leaf_value[node] = low[node] if low[node] == high[node] else (low[node] + high[node]) / 2
+                    else:
+                        kept.append(node)
+                        stack.append(rights[node])
+                        stack.append(lefts[node])
+
+            leaf_pool = sorted(set(leaf_value.values()))
+            leaf_ids = {value: i for i, value in enumerate(leaf_pool)}
+            n_leaves, n_nodes = len(leaf_pool), len(leaf_pool) + len(kept)
+            new_ids = {node: n_leaves + i for i, node in enumerate(kept)}
+
+            def new_id(node):
+                return leaf_ids[leaf_value[node]] if node in leaf_value else new_ids[node]
+
+            index_dtype = _smallest_index_dtype(n_nodes - 1)
+            feature_dtype = _smallest_index_dtype(max(self.n_features - 1, 0))
+            kept_old = np.asarray(kept, dtype=np.int64)
+            leaf_nodes = np.arange(n_leaves)
+
+            feature = np.zeros(n_nodes, dtype=feature_dtype)
+            feature[n_leaves:] = np.asarray(self.feature)[kept_old]
+
+            threshold = np.zeros(n_nodes, dtype=np.float32)
+            threshold[n_leaves:] = _float32_floor(np.asarray(self.threshold)[kept_old])
+
+            children_left = np.empty(n_nodes, dtype=index_dtype)
+            children_right = np.empty(n_nodes, dtype=index_dtype)
+            children_left[:n_leaves] = children_right[:n_leaves] = leaf_nodes
+            children_left[n_leaves:] = [new_id(lefts[node]) for node in kept]
+            children_right[n_leaves:] = [new_id(rights[node]) for node in kept]
+
+            value = np.zeros(n_nodes, dtype=np.float64)
+            value[:n_leaves] = leaf_pool
+
+            is_leaf = np.zeros(n_nodes, dtype=bool)
+            is_leaf[:n_leaves] = True
+
+            compact_forest = CompiledForest(
+                feature=feature,
+                threshold=threshold,
+                children_left=children_left,
+                children_right=children_right,
+                value=value,
+                roots=np.asarray([new_id(root) for root in np.asarray(self.roots).tolist()], dtype=index_dtype),
+                n_features=self.n_features,
+                is_leaf=is_leaf
+            )
+
+            logging.info(f"Forest compacted successfully! Nodes: {self.n_nodes} -> {n_nodes} "
+                         f"({n_leaves} unique leaves), size: {self.nbytes / 1024 ** 2:.2f} MB -> "
+                         f"{compact_forest.nbytes / 1024 ** 2:.2f} MB")
+
+            return compact_forest
+
+        except Exception as e:
+            logging.error(f"Error in compacting the compiled forest!")
+            raise CustomException(e, sys)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.value)
+
+    def apply(self, x) -> np.ndarray:
+        """
+        Returns the global leaf index reached in every tree, shape (n_rows, n_trees).
+        """
+        # sklearn trees evaluate splits on float32 inputs
+        x = np.asarray(x.toarray() if hasattr(x, "toarray") else x, dtype=np.float32)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+
+        n_rows = x.shape[0]
+        leaves = np.empty(n_rows * self.n_trees, dtype=np.int32)
+
+        # Active (row, tree) pairs, flattened; `position` is where each pair's leaf goes in `leaves`
+        node = np.tile(self.roots, n_rows)
+        row = np.repeat(np.arange(n_rows), self.n_trees)
+        position = np.arange(n_rows * self.n_trees)
+
+        done = self.is_leaf[node]
+        while True:
+            if done.any():
+                leaves[position[done]] = node[done]
+                active = ~done
+                node, row, position = node[active], row[active], position[active]
+
+            if len(node) == 0:
+                break
+
+            go_left = x[row, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.children_left[node], self.children_right[node])
+            done = self.is_leaf[node]
+
+        return leaves.reshape(n_rows, self.n_trees)
+
+    def predict(self, x) -> np.ndarray:
+        leaf_values = self.value[self.apply(x)]
+
+        # Same accumulation order as RandomForestRegressor.predict, so results match bit for bit
+        prediction = np.zeros(leaf_values.shape[0], dtype=np.float64)
+        for tree_values in leaf_values.T:
+            prediction += tree_values
+        prediction /= self.n_trees
+
+        return prediction
+
+    def verify(self, model, x) -> bool:
+        """
+        Checks that the compiled forest reproduces `model.predict(x)` bit for bit.
+        """
+        try:
+            logging.info(f"> Verifying the compiled forest against sklearn on {x.shape[0]} rows:")
+
+            # Threaded sklearn scoring sums tree outputs in completion order; pin it to estimator order
+            n_jobs = model.n_jobs
+            model.n_jobs = 1
+            try:
+                expected = model.predict(x)
+            finally:
+                model.n_jobs = n_jobs
+
+            actual = self.predict(x)
+
+            mismatches = int(np.sum(expected != actual))
+            if mismatches:
+                logging.error(f"Compiled forest mismatch on {mismatches} rows! "
+                              f"Max abs diff: {np.max(np.abs(expected - actual))}")
+            else:
+                logging.info("Compiled forest matches sklearn bit for bit!")
+
+            return mismatches == 0
+
+        except Exception as e:
+            logging.error(f"Error in verifying the compiled forest!")
+            raise CustomException(e, sys)
+
+
+if __name__ == '__main__':
+    from src.RuralCreditPredictor.config.configuration import ConfigurationManager
+    from src.RuralCreditPredictor.components.model_trainer import ModelTrainer
+    from src.RuralCreditPredictor.components.prediction import Predictor
+
+    # Verification mode: compile the served model and compare it with sklearn on the test split
+    config_manager = ConfigurationManager()
+    predictor = Predictor(config=config_manager.get_prediction_config())
+    model = predictor.load_model()
+
+    _, x_test, _, _ = ModelTrainer.get_data()
+
+    compiled_forest = CompiledForest.from_sklearn(model)
+    if not compiled_forest.verify(model, x_test):
+        sys.exit(1)
@@ -0,0 +1,183 @@
+import os
+import sys
+import json
+import time
+import socket
+import threading
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.utils.common import save_json_atomic
+from src.RuralCreditPredictor.entity.config_entity import InferenceParallelismConfig
+
+
+CALIBRATION_BATCH_SIZES = (1, 16, 64, 256, 1024, 4096, 16384)
+
+# One scoring pool per process, shared by every predictor in it
+_executor = {"pool": None, "n_threads": None}
+_executor_lock = threading.Lock()
+
+
+def _get_executor(n_threads: int) -> ThreadPoolExecutor:
+    with _executor_lock:
+        if _executor["n_threads"] != n_threads:
+            _executor["pool"] = ThreadPoolExecutor(max_workers=n_threads, thread_name_prefix="inference")
+            _executor["n_threads"] = n_threads
+        return _executor["pool"]
+
+
+def _usable_cpus() -> int:
+    # Respects CPU affinity / cgroup cpusets where the platform exposes them
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _host_id() -> dict:
+    return {"hostname": socket.gethostname(), "usable_cpus": _usable_cpus()}
+
+
+class InferenceParallelismPolicy:
+    """
+    Decides how a batch is scored: serially below `parallel_threshold` rows, otherwise split into row chunks
+    scored on a per-process thread pool of `n_threads` (the forest's tree traversal releases the GIL). Chunking by
+    rows leaves every row's result bit for bit unchanged.
+
+    `n_threads` is this worker's share of the host, usable CPUs / web workers (WEB_CONCURRENCY), so several web
+    workers on one machine never oversubscribe it. The threshold comes from calibration on the host when a
+    calibration file for it exists.
+    """
+
+    def __init__(self, n_threads: int = 1, parallel_threshold: int = None):
+        self.n_threads = max(1, int(n_threads))
+        self.parallel_threshold = parallel_threshold
+
+    @classmethod
+    def serial(cls):
+        return cls(n_threads=1, parallel_threshold=None)
+
+    @classmethod
+    def from_config(cls, config: InferenceParallelismConfig):
+        try:
+            web_workers = config.web_workers or int(os.environ.get("WEB_CONCURRENCY", 1))
+            n_threads = config.cores_per_worker or max(1, _usable_cpus() // max(1, web_workers))
+            parallel_threshold = config.parallel_threshold
+
+            if os.path.exists(config.calibration_file):
+                with open(config.calibration_file) as file:
+                    calibration = json.load(file)
+
+                if calibration["host"] == _host_id() and calibration["n_threads"] == n_threads:
+                    parallel_threshold = calibration["parallel_threshold"]
+                else:
+                    logging.warning(f"Ignoring calibration made for another host or thread count: "
+                                    f"{config.calibration_file}")
+
+            policy = cls(n_threads=n_threads, parallel_threshold=parallel_threshold)
+
+            logging.info(f"Inference parallelism: {policy.n_threads} threads per worker, parallel above "
+                         f"{policy.parallel_threshold} rows")
+
+            return policy
+
+        except Exception as e:
+            logging.error(f"Error in setting up the inference parallelism policy!")
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def configure(model):
+        """
+        Parallelism is owned by the policy: sklearn's own joblib fan-out (and its per-call verbose output) is
+        turned off on the loaded model.
+        """
+        if hasattr(model, "n_jobs"):
+            model.n_jobs = 1
+        if hasattr(model, "verbose"):
+            model.verbose = 0
+        return model
+
+    def is_parallel(self, n_rows: int) -> bool:
+        return self.n_threads > 1 and self.parallel_threshold is not None and n_rows >= self.parallel_threshold
+
+    def predict(self, model, x):
+        n_rows = x.shape[0]
+        if not self.is_parallel(n_rows):
+            return model.predict(x)
+
+        n_chunks = min(self.n_threads, n_rows)
+        chunks = np.array_split(np.arange(n_rows), n_chunks)
+        executor = _get_executor(self.n_threads)
+
+        return np.concatenate(list(executor.map(lambda rows: model.predict(x[rows[0]:rows[-1] + 1]), chunks)))
+
+    def calibrate(self, model, x, min_speedup: float = 1.2, repeats: int = 5) -> dict:
+        """
+        Times serial vs parallel scoring of growing batches (rows of `x`, repeated as needed) and sets the
+        threshold to the smallest batch size from which parallel scoring is at least `min_speedup` times faster.
+        """
+        try:
+            logging.info(f"> Calibrating inference parallelism with {self.n_threads} threads:")
+
+            timings = []
+            parallel_threshold = None
+            parallel = InferenceParallelismPolicy(n_threads=self.n_threads, parallel_threshold=1)
+
+            for batch_size in CALIBRATION_BATCH_SIZES:
+                batch = x[np.arange(batch_size) % x.shape[0]]
+
+                def best_of(predict):
+                    durations = []
+                    for _ in range(repeats):
+                        started = time.perf_counter()
+                        predict(batch)
+                        durations.append(time.perf_counter() - started)
+                    return min(durations) * 1000
+
+                serial_ms = best_of(model.predict)
+                parallel_ms = best_of(lambda rows: parallel.predict(model, rows))
+                timings.append({"batch_size": batch_size, "serial_ms": round(serial_ms, 4),
+                                "parallel_ms": round(parallel_ms, 4)})
+
+                if parallel_threshold is None and batch_size > 1 and serial_ms >= min_speedup * parallel_ms:
+                    parallel_threshold = batch_size
+
+                logging.info(f"batch {batch_size}: serial {serial_ms:.3f} ms, parallel {parallel_ms:.3f} ms")
+
+            self.parallel_threshold = parallel_threshold
+
+            logging.info(f"Calibration completed! Parallel above: {parallel_threshold} rows")
+
+            return {
+                "host": _host_id(),
+                "n_threads": self.n_threads,
+                "parallel_threshold": parallel_threshold,
+                "min_speedup": min_speedup,
+                "timings": timings,
+                "calibrated_at": datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            logging.error(f"Error in calibrating inference parallelism!")
+            raise CustomException(e, sys)
+
+
+if __name__ == '__main__':
+    from src.RuralCreditPredictor.config.configuration import ConfigurationManager
+    from src.RuralCreditPredictor.components.model_trainer import ModelTrainer
+    from src.RuralCreditPredictor.components.prediction import Predictor
+
+    # Calibration mode: run on the serving host, with WEB_CONCURRENCY set as in production
+    config_manager = ConfigurationManager()
+    inference_parallelism_config = config_manager.get_inference_parallelism_config()
+    predictor = Predictor(config=config_manager.get_prediction_config())
+    _, model = predictor.get_artifacts()
+    _, x_test, _, _ = ModelTrainer.get_data()
+
+    policy = InferenceParallelismPolicy.from_config(inference_parallelism_config)
+    calibration = policy.calibrate(InferenceParallelismPolicy.configure(model),
+                                   np.asarray(x_test, dtype=np.float64),
+                                   min_speedup=inference_parallelism_config.min_speedup)
+    save_json_atomic(Path(inference_parallelism_config.calibration_file), calibration)
@@ -0,0 +1,313 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import itertools
+import threading
+import subprocess
+import http.client
+from array import array
+from pathlib import Path
+from datetime import datetime
+from urllib.parse import urlencode, urlsplit
+import numpy as np
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.utils.common import save_json_atomic, read_table
+from src.RuralCreditPredictor.entity.config_entity import LoadTestConfig
+
+
+_RSS_METRIC = re.compile(r"^rural_credit_process_resident_memory_bytes\s+(\S+)$", re.MULTILINE)
+_MODEL_VERSION_METRIC = re.compile(r'^rural_credit_model_info\{version="([^"]*)"\}', re.MULTILINE)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _percentiles(latencies) -> dict:
+    if not len(latencies):
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+
+    p50, p95, p99 = np.percentile(np.frombuffer(latencies, dtype=np.float32), [50, 95, 99])
+    return {"p50_ms": round(float(p50), 3), "p95_ms": round(float(p95), 3), "p99_ms": round(float(p99), 3),
+            "max_ms": round(float(max(latencies)), 3)}
+
+
+class LoadTester:
+    """
+    Load generator for the prediction API.
+
+    Replays recorded applicant payloads (JSONL/CSV) or applicants sampled from the processed dataset against
+    `/predict` (form posts) or `/predict/batch` (JSON batches), from `concurrency` threads with keep-alive
+    connections. With a target `rate` the load is open-loop: every request has a scheduled send time and its
+    latency is measured from that time, so a stalled server is not hidden by the generator slowing down (no
+    coordinated omission). Without a rate, each thread sends as fast as responses come back.
+
+    In soak mode the worker RSS is scraped from /metrics at a fixed interval, and the growth after warm-up is
+    reported (and flagged above `max_rss_growth_mb`) so leaks show up over millions of requests.
+    """
+
+    def __init__(self, config: LoadTestConfig, selected_features: list, processed_file=None):
+        self.config = config
+        self.selected_features = selected_features
+        self.processed_file = processed_file
+
+        url = urlsplit(config.base_url)
+        self.host, self.port = url.hostname, url.port or (443 if url.scheme == "https" else 80)
+        self.connection_class = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def load_payloads(self) -> list:
+        """
+        Applicant dicts: from `payload_file` (JSONL of applicants, or a .csv/.parquet/.feather table) if set, else
+        sampled from the processed dataset.
+        """
+        try:
+            payload_file = self.config.payload_file or self.processed_file
+
+            if str(payload_file).endswith(".jsonl"):
+                with open(payload_file) as file:
+                    applicants = [json.loads(line) for line in file if line.strip()]
+            else:
+                data = read_table(Path(payload_file), columns=self.selected_features)
+                data = data.sample(n=min(self.config.n_payloads, len(data)), random_state=42)
+                applicants = json.loads(data.to_json(orient="records"))
+
+            logging.info(f"Loaded {len(applicants)} applicant payloads from: {payload_file}")
+
+            return applicants
+
+        except Exception as e:
+            logging.error(f"Error in loading the load test payloads!")
+            raise CustomException(e, sys)
+
+    def _encode_requests(self, applicants: list) -> list:
+        # Bodies are encoded up front so the generator threads only send
+        if self.config.route == "/predict":
+            return [(urlencode(applicant).encode(), "application/x-www-form-urlencoded")
+                    for applicant in applicants]
+
+        batch_size = self.config.batch_size
+        batches = [applicants[i:i + batch_size] for i in range(0, len(applicants), batch_size)]
+        return [(json.dumps(batch).encode(), "application/json") for batch in batches if len(batch) == batch_size
+                or len(batches) == 1]
+
+    def _get(self, path: str):
+        connection = self.connection_class(self.host, self.port, timeout=self.config.timeout_seconds)
+        try:
+            connection.request("GET", path)
+            return connection.getresponse().read().decode()
+        finally:
+            connection.close()
+
+    def _scrape_metrics(self) -> dict:
+        try:
+            text = self._get("/metrics")
+        except (OSError, http.client.HTTPException):
+            return {}
+
+        rss, version = _RSS_METRIC.search(text), _MODEL_VERSION_METRIC.search(text)
+        return {"rss_bytes": float(rss.group(1)) if rss else None,
+                "model_version": version.group(1) if version else None}
+
+    def _worker(self, bodies, tickets, results) -> None:
+        connection = None
+        interval = 1.0 / self.config.rate if self.config.rate else None
+
+        while not self._stop.is_set():
+            ticket = next(tickets, None)
+            if ticket is None:
+                return
+
+            # Open loop: wait for this request's scheduled send time and measure latency from it
+            if interval is not None:
+                scheduled = results["started"] + ticket * interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                scheduled = time.perf_counter()
+
+            body, content_type = bodies[ticket % len(bodies)]
+            try:
+                if connection is None:
+                    connection = self.connection_class(self.host, self.port, timeout=self.config.timeout_seconds)
+                connection.request("POST", self.config.route, body=body, headers={"Content-Type": content_type})
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                status = None
+                if connection is not None:
+                    connection.close()
+                connection = None
+
+            latency_ms = (time.perf_counter() - scheduled) * 1000
+
+            with self._lock:
+                results["latencies"].append(latency_ms)
+                if status != 200:
+                    results["errors"][str(status)] = results["errors"].get(str(status), 0) + 1
+
+    def run(self, soak: bool = False) -> dict:
+        try:
+            max_requests = self.config.max_requests
+
+            # A soak test bounded by its request count runs until they are all sent, however long that takes
+            duration_seconds = None if soak and max_requests else self.config.duration_seconds
+
+            # The leak check needs at least two RSS samples after the warm-up
+            min_soak_seconds = self.config.warmup_seconds + 2 * self.config.rss_interval_seconds
+            if soak and duration_seconds is not None and duration_seconds <= min_soak_seconds:
+                raise ValueError(f"A soak test of {duration_seconds}s takes no RSS sample after the "
+                                 f"{self.config.warmup_seconds}s warm-up to check for leaks: run it for more than "
+                                 f"{min_soak_seconds}s (--duration) or for a number of requests (--requests)")
+
+            logging.info(f"> Load testing {self.config.base_url}{self.config.route} (rate: "
+                         f"{self.config.rate or 'closed loop'}, concurrency: {self.config.concurrency}, "
+                         f"duration: {f'{duration_seconds}s' if duration_seconds is not None else 'unbounded'}, "
+                         f"requests: {max_requests or 'unbounded'}, soak: {soak}):")
+
+            started_at = datetime.now().isoformat()
+            applicants = self.load_payloads()
+            random.Random(42).shuffle(applicants)
+            bodies = self._encode_requests(applicants)
+
+            tickets = _LockedIterator(iter(range(max_requests)) if max_requests else itertools.count())
+
+            results = {"latencies": array("f"), "errors": {}, "started": time.perf_counter()}
+
+            threads = [threading.Thread(target=self._worker, args=(bodies, tickets, results), daemon=True,
+                                        name=f"load-{i}") for i in range(self.config.concurrency)]
+            for thread in threads:
+                thread.start()
+
+            rss_samples, windows, initial = [], [], self._scrape_metrics()
+            window_start, window_index = time.perf_counter(), 0
+            next_rss = time.perf_counter()
+
+            while any(thread.is_alive() for thread in threads):
+                elapsed = time.perf_counter() - results["started"]
+                if duration_seconds is not None and elapsed >= duration_seconds:
+                    self._stop.set()
+                    break
+
+                time.sleep(min(1.0, self.config.report_interval_seconds))
+
+                if soak and time.perf_counter() >= next_rss:
+                    rss = self._scrape_metrics().get("rss_bytes")
+                    if rss is not None:
+                        rss_samples.append((round(time.perf_counter() - results["started"], 1), rss))
+                    next_rss += self.config.rss_interval_seconds
+
+                if time.perf_counter() - window_start >= self.config.report_interval_seconds:
+                    with self._lock:
+                        window = results["latencies"][window_index:]
+                        window_index = len(results["latencies"])
+                        n_errors = sum(results["errors"].values())
+
+                    window_seconds = time.perf_counter() - window_start
+                    windows.append({"elapsed_seconds": round(elapsed, 1),
+                                    "throughput_rps": round(len(window) / window_seconds, 1),
+                                    **_percentiles(window)})
+                    logging.info(f"{window_index} requests, {windows[-1]['throughput_rps']} req/s, p99: "
+                                 f"{windows[-1]['p99_ms']} ms, errors: {n_errors}")
+                    window_start = time.perf_counter()
+
+            for thread in threads:
+                thread.join()
+
+            duration = time.perf_counter() - results["started"]
+            latencies = results["latencies"]
+            n_requests = len(latencies)
+            n_errors = sum(results["errors"].values())
+            rows_per_request = 1 if self.config.route == "/predict" else self.config.batch_size
+
+            report = {
+                "run": {
+                    "started_at": started_at,
+                    "git_commit": _git_commit(),
+                    "model_version": initial.get("model_version"),
+                    "base_url": self.config.base_url,
+                    "route": self.config.route,
+                    "batch_size": rows_per_request,
+                    "rate": self.config.rate,
+                    "concurrency": self.config.concurrency,
+                    "soak": soak
+                },
+                "requests": n_requests,
+                "duration_seconds": round(duration, 2),
+                "throughput_rps": round(n_requests / duration, 2) if duration else 0.0,
+                "applicants_per_second": round(n_requests * rows_per_request / duration, 2) if duration else 0.0,
+                "error_rate": round(n_errors / n_requests, 6) if n_requests else 0.0,
+                "errors": results["errors"],
+                "latency": _percentiles(latencies),
+                "windows": windows
+            }
+
+            if soak:
+                report["soak"] = self._summarize_rss(rss_samples)
+
+            report_path = os.path.join(
+                self.config.root_dir,
+                f"{'soak' if soak else 'load'}_{self.config.route.strip('/').replace('/', '_')}_"
+                f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            )
+            save_json_atomic(Path(report_path), report)
+
+            logging.info(f"Load test completed! {n_requests} requests, {report['throughput_rps']} req/s, "
+                         f"p50/p95/p99: {report['latency']['p50_ms']}/{report['latency']['p95_ms']}/"
+                         f"{report['latency']['p99_ms']} ms, error rate: {report['error_rate']:.4%}")
+            logging.info(f"Load test results saved at: {report_path}")
+
+            return report
+
+        except Exception as e:
+            logging.error(f"Error in running the load test!")
+            raise CustomException(e, sys)
+
+    def _summarize_rss(self, rss_samples: list) -> dict:
+        after_warmup = [(t, rss) for t, rss in rss_samples if t >= self.config.warmup_seconds]
+        summary = {"rss_samples": rss_samples, "rss_growth_mb": None, "rss_slope_mb_per_hour": None,
+                   "leak_suspected": None}
+
+        if len(after_warmup) >= 2:
+            t, rss = np.array(after_warmup).T
+            growth_mb = (rss[-1] - rss[0]) / 1024 ** 2
+            slope_mb_per_hour = float(np.polyfit(t, rss / 1024 ** 2, 1)[0] * 3600)
+
+            summary.update(rss_growth_mb=round(float(growth_mb), 2),
+                           rss_slope_mb_per_hour=round(slope_mb_per_hour, 2),
+                           leak_suspected=bool(growth_mb > self.config.max_rss_growth_mb))
+
+            if summary["leak_suspected"]:
+                logging.warning(f"Worker RSS grew by {growth_mb:.1f} MB after warm-up "
+                                f"(limit: {self.config.max_rss_growth_mb} MB): possible memory leak!")
+
+        return summary
+
+
+class _LockedIterator:
+    """
+    Hands out request tickets to the generator threads.
+    """
+
+    def __init__(self, iterator):
+        self.iterator = iterator
+        self.lock = threading.Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        with self.lock:
+            return next(self.iterator)
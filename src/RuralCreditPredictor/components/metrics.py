@@ -0,0 +1,211 @@
+import os
+import time
+import bisect
+import threading
+
+
+# Latency buckets in seconds, from sub-millisecond compiled scoring up to cold model loads
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+                   5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames, labelvalues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if value not in (float("inf"), float("-inf")) else ("+Inf" if value > 0 else "-Inf")
+
+
+class _Metric:
+    """
+    Base for the in-process metrics. Recording is a dict update under a lock; everything else (reading callbacks,
+    formatting) only happens when /metrics is scraped.
+    """
+
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._functions = {}
+        self._lock = threading.Lock()
+
+    def set_function(self, function, *labelvalues) -> None:
+        """
+        Reads the value from `function()` at scrape time instead of recording it on the hot path.
+        """
+        self._functions[labelvalues] = function
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _samples(self):
+        with self._lock:
+            values = dict(self._values)
+
+        for labelvalues, function in self._functions.items():
+            value = function()
+            if value is not None:
+                values[labelvalues] = value
+
+        for labelvalues, value in values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+
+    def render(self) -> list:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labelvalues, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, *labelvalues) -> None:
+        with self._lock:
+            self._values[labelvalues] = value
+
+
+class _Timer:
+    __slots__ = ("histogram", "labelvalues", "started")
+
+    def __init__(self, histogram, labelvalues):
+        self.histogram = histogram
+        self.labelvalues = labelvalues
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labelvalues)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labelvalues) -> None:
+        # Per-bucket (non-cumulative) counts, then sum and count; cumulated when rendered
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labelvalues)
+            if state is None:
+                state = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, *labelvalues) -> _Timer:
+        """
+        Context manager observing the duration of its block, e.g. `with STAGE_LATENCY.time("transform"):`.
+        """
+        return _Timer(self, labelvalues)
+
+    def _samples(self):
+        with self._lock:
+            values = {labelvalues: ([*counts], total, count) for labelvalues, (counts, total, count)
+                      in self._values.items()}
+
+        for labelvalues, (counts, total, count) in values.items():
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, labelvalues, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition of every registered metric (for the /metrics endpoint).
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _resident_memory_bytes():
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+    except (OSError, ValueError, AttributeError):
+        # Not Linux: fall back to the peak resident set size
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# Process-wide registry; every serving worker exposes its own metrics, labelled by the scraper with the instance
+REGISTRY = MetricsRegistry()
+
+REQUEST_LATENCY = REGISTRY.register(Histogram(
+    "rural_credit_request_latency_seconds", "End-to-end HTTP request latency.", ["route"]))
+REQUESTS = REGISTRY.register(Counter(
+    "rural_credit_requests_total", "HTTP requests by route, method and status code.", ["route", "method", "status"]))
+STAGE_LATENCY = REGISTRY.register(Histogram(
+    "rural_credit_stage_latency_seconds", "Latency of each prediction stage.", ["stage"]))
+ERRORS = REGISTRY.register(Counter(
+    "rural_credit_errors_total", "Errors raised by each prediction stage.", ["stage"]))
+PREDICTIONS = REGISTRY.register(Counter(
+    "rural_credit_predictions_total", "Applicants scored, by endpoint kind and model tier.", ["kind", "tier"]))
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "rural_credit_prediction_cache_lookups_total", "Prediction cache lookups by result.", ["result"]))
+IN_FLIGHT = REGISTRY.register(Gauge(
+    "rural_credit_requests_in_flight", "Requests admitted and being scored."))
+QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "rural_credit_admission_queue_depth", "Requests waiting for a scoring slot."))
+REJECTIONS = REGISTRY.register(Counter(
+    "rural_credit_requests_rejected_total", "Requests shed with a 503, by reason.", ["reason"]))
+MODEL_FALLBACKS = REGISTRY.register(Counter(
+    "rural_credit_stale_model_fallbacks_total", "Requests served by the previous model while a reload was pending."))
+MODEL_INFO = REGISTRY.register(Gauge(
+    "rural_credit_model_info", "Model version currently served (always 1).", ["version"]))
+MODEL_LOADED_AT = REGISTRY.register(Gauge(
+    "rural_credit_model_loaded_timestamp_seconds", "Unix time the served model was loaded."))
+MODEL_SIZE = REGISTRY.register(Gauge(
+    "rural_credit_model_size_bytes", "In-memory size of the served model arrays."))
+RESIDENT_MEMORY = REGISTRY.register(Gauge(
+    "rural_credit_process_resident_memory_bytes", "Resident memory of this worker process."))
+RESIDENT_MEMORY.set_function(_resident_memory_bytes)
+
+
+def set_served_model(version: str, model) -> None:
+    MODEL_INFO.clear()
+    MODEL_INFO.set(1, version)
+    MODEL_LOADED_AT.set(time.time())
+    if hasattr(model, "nbytes"):
+        MODEL_SIZE.set(model.nbytes)
@@ -0,0 +1,88 @@
+import sys
+import time
+import pickle
+import socket
+import warnings
+import numpy as np
+from datetime import datetime
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.components.forest_engine import CompiledForest
+from src.RuralCreditPredictor.components.inference_policy import InferenceParallelismPolicy
+
+
+class ModelBenchmark:
+    """
+    Standard serving benchmark of a trained model, recorded for every run in the model index so model selection can
+    weigh what a model costs to serve against its accuracy.
+
+    The protocol is fixed so runs stay comparable: the model is pickled and unpickled (serialized size, cold load
+    time), converted to the engine the predictor serves (the compiled forest unless `prediction.compiled_forest`
+    is off), warmed up, then timed on one thread over `single_rows` single-row predictions and `batch_repeats`
+    batches of `batch_size` rows drawn from the test split.
+    """
+
+    def __init__(self, single_rows: int = 500, batch_size: int = 100, batch_repeats: int = 50, warmup: int = 20):
+        self.single_rows = single_rows
+        self.batch_size = batch_size
+        self.batch_repeats = batch_repeats
+        self.warmup = warmup
+
+    @staticmethod
+    def _time_calls(predict, batches) -> np.ndarray:
+        durations = np.empty(len(batches))
+        for i, batch in enumerate(batches):
+            started = time.perf_counter()
+            predict(batch)
+            durations[i] = (time.perf_counter() - started) * 1000
+        return durations
+
+    def run(self, model, x, compiled: bool = True) -> dict:
+        try:
+            logging.info("> Benchmarking the model for serving:")
+
+            serialized = pickle.dumps(model)
+            started = time.perf_counter()
+            pickle.loads(serialized)
+            load_ms = (time.perf_counter() - started) * 1000
+
+            if compiled:
+                engine = CompiledForest.from_sklearn(model)
+            else:
+                # Served single-threaded, like the predictor does (see InferenceParallelismPolicy.configure)
+                engine = InferenceParallelismPolicy.configure(pickle.loads(serialized))
+
+            x = np.asarray(x, dtype=np.float64)
+            rows = [x[i % x.shape[0]:i % x.shape[0] + 1] for i in range(self.single_rows)]
+            batches = [x[np.arange(i * self.batch_size, (i + 1) * self.batch_size) % x.shape[0]]
+                       for i in range(self.batch_repeats)]
+
+            # Serving silences sklearn's per-call feature name warning too (see components/prediction.py)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                self._time_calls(engine.predict, rows[:self.warmup])
+                single_row = self._time_calls(engine.predict, rows)
+                batch = self._time_calls(engine.predict, batches)
+
+            benchmark = {
+                "engine": "compiled" if compiled else "sklearn",
+                "size_mb": round(len(serialized) / 1024 ** 2, 3),
+                "load_ms": round(load_ms, 2),
+                "single_row_p50_ms": round(float(np.percentile(single_row, 50)), 4),
+                "single_row_p99_ms": round(float(np.percentile(single_row, 99)), 4),
+                "batch_size": self.batch_size,
+                "batch_p50_ms": round(float(np.percentile(batch, 50)), 4),
+                "batch_p99_ms": round(float(np.percentile(batch, 99)), 4),
+                "host": socket.gethostname(),
+                "benchmarked_at": datetime.now().isoformat()
+            }
+
+            logging.info(f"Model benchmarked successfully! Size: {benchmark['size_mb']} MB, load: "
+                         f"{benchmark['load_ms']} ms, single-row p99: {benchmark['single_row_p99_ms']} ms, "
+                         f"batch ({self.batch_size}) p99: {benchmark['batch_p99_ms']} ms")
+
+            return benchmark
+
+        except Exception as e:
+            logging.error(f"Error in benchmarking the model!")
+            raise CustomException(e, sys)
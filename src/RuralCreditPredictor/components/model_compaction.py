@@ -0,0 +1,128 @@
+import os
+import sys
+import time
+import pickle
+from pathlib import Path
+import numpy as np
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.utils.common import save_json_atomic
+from src.RuralCreditPredictor.entity.config_entity import ModelCompactionConfig
+from src.RuralCreditPredictor.config.configuration import ConfigurationManager
+from src.RuralCreditPredictor.components.prediction import Predictor
+from src.RuralCreditPredictor.components.forest_engine import CompiledForest
+from src.RuralCreditPredictor.components.model_trainer import ModelTrainer
+from src.RuralCreditPredictor.components.model_evaluation import ModelEvaluator
+
+
+def _directory_size(directory) -> int:
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+class ModelCompactor:
+    """
+    Compacts the best model (see CompiledForest.compact) and reports what it buys on the test split: artifact size,
+    cold load time, single-row and batch latency, and the change in MAPE.
+    """
+
+    def __init__(self, config: ModelCompactionConfig, predictor: Predictor):
+        self.config = config
+        self.predictor = predictor
+
+    @staticmethod
+    def _time_predict(predict, x_test, n_rows) -> dict:
+        single_row = []
+        for i in range(min(n_rows, x_test.shape[0])):
+            started = time.perf_counter()
+            predict(x_test[i:i + 1])
+            single_row.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        predict(x_test)
+        batch_ms = (time.perf_counter() - started) * 1000
+
+        return {
+            "single_row_p50_ms": round(float(np.percentile(single_row, 50)), 4),
+            "single_row_p99_ms": round(float(np.percentile(single_row, 99)), 4),
+            "batch_ms": round(batch_ms, 2),
+            "batch_rows": int(x_test.shape[0])
+        }
+
+    def compact_model(self) -> dict:
+        try:
+            logging.info("> Compacting the best model:")
+
+            best_run = self.predictor.resolve_best_run()
+            model = self.predictor.load_model(best_run=best_run)
+            _, x_test, _, y_test = ModelTrainer.get_data()
+            x_test = np.asarray(x_test, dtype=np.float64)
+
+            compiled_forest = CompiledForest.from_sklearn(model)
+            compact_forest = compiled_forest.compact(tolerance=self.config.tolerance)
+            compact_forest.save(self.config.compact_forest)
+
+            # Cold start: unpickling the sklearn model vs reading the compact arrays into memory
+            pickled_model = pickle.dumps(model)
+            started = time.perf_counter()
+            pickle.loads(pickled_model)
+            pickle_load_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            CompiledForest.load(self.config.compact_forest, mmap_mode=None)
+            compact_load_ms = (time.perf_counter() - started) * 1000
+
+            # Pin sklearn to one thread, like the compiled engines, for a like-for-like latency comparison
+            n_jobs = model.n_jobs
+            model.n_jobs = 1
+            try:
+                sklearn_prediction = model.predict(x_test)
+                sklearn_latency = self._time_predict(model.predict, x_test, self.config.latency_rows)
+            finally:
+                model.n_jobs = n_jobs
+
+            compact_prediction = compact_forest.predict(x_test)
+            compact_latency = self._time_predict(compact_forest.predict, x_test, self.config.latency_rows)
+
+            _, sklearn_mape, _, _ = ModelEvaluator.evaluate_model(y_test, sklearn_prediction, log=False)
+            _, compact_mape, _, _ = ModelEvaluator.evaluate_model(y_test, compact_prediction, log=False)
+
+            report = {
+                "run_id": best_run[0],
+                "tolerance": self.config.tolerance,
+                "nodes": {"original": compiled_forest.n_nodes, "compact": compact_forest.n_nodes},
+                "size_bytes": {
+                    "sklearn_pickle": len(pickled_model),
+                    "compiled": compiled_forest.nbytes,
+                    "compact": _directory_size(self.config.compact_forest)
+                },
+                "load_ms": {"sklearn_pickle": round(pickle_load_ms, 2), "compact": round(compact_load_ms, 2)},
+                "latency": {"sklearn": sklearn_latency, "compact": compact_latency},
+                "mape_test": {
+                    "sklearn": float(sklearn_mape),
+                    "compact": float(compact_mape),
+                    "delta": float(compact_mape - sklearn_mape)
+                },
+                "max_abs_prediction_diff": float(np.max(np.abs(compact_prediction - sklearn_prediction)))
+            }
+
+            save_json_atomic(Path(self.config.report), report)
+
+            logging.info(f"Model compacted successfully! Size: {len(pickled_model) / 1024 ** 2:.2f} MB -> "
+                         f"{report['size_bytes']['compact'] / 1024 ** 2:.2f} MB, single-row p50: "
+                         f"{sklearn_latency['single_row_p50_ms']} ms -> {compact_latency['single_row_p50_ms']} ms, "
+                         f"MAPE delta: {report['mape_test']['delta']:+.6f}")
+            logging.info(f"Compaction report saved at: {self.config.report}")
+
+            return report
+
+        except Exception as e:
+            logging.error(f"Error in compacting the model!")
+            raise CustomException(e, sys)
+
+
+if __name__ == '__main__':
+    config_manager = ConfigurationManager()
+    model_compaction_config = config_manager.get_model_compaction_config()
+    predictor = Predictor(config=config_manager.get_prediction_config())
+    model_compactor = ModelCompactor(config=model_compaction_config, predictor=predictor)
+    model_compactor.compact_model()
@@ -0,0 +1,177 @@
+import os
+import sys
+import time
+import shutil
+from pathlib import Path
+from datetime import datetime
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.utils.common import save_json_atomic
+from src.RuralCreditPredictor.entity.config_entity import ModelDistillationConfig
+from src.RuralCreditPredictor.config.configuration import ConfigurationManager
+from src.RuralCreditPredictor.components.prediction import Predictor
+from src.RuralCreditPredictor.components.forest_engine import CompiledForest
+from src.RuralCreditPredictor.components.model_trainer import ModelTrainer
+from src.RuralCreditPredictor.components.model_evaluation import ModelEvaluator
+from src.RuralCreditPredictor.components.model_compaction import ModelCompactor
+
+
+class ModelDistiller:
+    """
+    Distills the best model into a small surrogate forest for the fast (pre-screening) serving tier.
+
+    Each candidate surrogate is fitted to the full model's predictions on the training split (not to the labels),
+    from the smallest candidate up. The first one whose test MAPE is within `max_mape_gap` of the full model's is
+    registered in the fast tier file the predictor serves it from; when none passes the guardrail the closest one is
+    still saved and reported, but registered as rejected, and fast tier requests are answered by the full model.
+
+    Like model exports, each surrogate is written to its own version directory, renamed into place once complete,
+    and the fast tier file is replaced atomically: workers may have the previous surrogate memory-mapped.
+    """
+
+    def __init__(self, config: ModelDistillationConfig, predictor: Predictor):
+        self.config = config
+        self.predictor = predictor
+
+    def _fit_surrogate(self, x_train, soft_targets, candidate: dict):
+        params = dict(candidate)
+        # A single tree is fitted on the whole training split rather than on a bootstrap sample of it
+        if params.get("n_estimators", 100) == 1:
+            params.setdefault("bootstrap", False)
+
+        surrogate = RandomForestRegressor(**params, random_state=self.config.random_state, n_jobs=-1)
+        surrogate.fit(x_train, soft_targets)
+
+        return CompiledForest.from_sklearn(surrogate).compact()
+
+    def distill_model(self) -> dict:
+        try:
+            logging.info("> Distilling the best model into the fast tier surrogate:")
+
+            best_run = self.predictor.resolve_best_run()
+            model = self.predictor.load_model(best_run=best_run)
+            x_train, x_test, y_train, y_test = ModelTrainer.get_data()
+            x_train = np.asarray(x_train, dtype=np.float64)
+            x_test = np.asarray(x_test, dtype=np.float64)
+
+            # The full model as served: compiled, so the speedup is measured against what it replaces
+            teacher = CompiledForest.from_sklearn(model)
+            soft_targets = teacher.predict(x_train)
+            teacher_prediction = teacher.predict(x_test)
+            teacher_latency = ModelCompactor._time_predict(teacher.predict, x_test, self.config.latency_rows)
+            _, teacher_mape, _, _ = ModelEvaluator.evaluate_model(y_test, teacher_prediction, log=False)
+
+            candidates, selected = [], None
+            for candidate in self.config.candidates:
+                started = time.perf_counter()
+                surrogate = self._fit_surrogate(x_train, soft_targets, candidate)
+                fit_seconds = time.perf_counter() - started
+
+                prediction = surrogate.predict(x_test)
+                _, mape, _, _ = ModelEvaluator.evaluate_model(y_test, prediction, log=False)
+                _, fidelity_mape, _, _ = ModelEvaluator.evaluate_model(teacher_prediction, prediction, log=False)
+                latency = ModelCompactor._time_predict(surrogate.predict, x_test, self.config.latency_rows)
+
+                result = {
+                    "params": dict(candidate),
+                    "nodes": surrogate.n_nodes,
+                    "size_bytes": surrogate.nbytes,
+                    "fit_seconds": round(fit_seconds, 2),
+                    "mape_test": float(mape),
+                    "mape_gap": float(mape - teacher_mape),
+                    "fidelity_mape": float(fidelity_mape),
+                    "latency": latency,
+                    "speedup": {
+                        "single_row_p50": round(teacher_latency["single_row_p50_ms"] / latency["single_row_p50_ms"], 2),
+                        "batch": round(teacher_latency["batch_ms"] / latency["batch_ms"], 2)
+                    },
+                    "passed": bool(mape - teacher_mape <= self.config.max_mape_gap)
+                }
+                candidates.append(result)
+
+                logging.info(f"Surrogate {candidate}: MAPE gap {result['mape_gap']:+.4f}, single-row speedup "
+                             f"{result['speedup']['single_row_p50']}x, batch speedup {result['speedup']['batch']}x")
+
+                if selected is None or result["mape_gap"] < selected[0]["mape_gap"]:
+                    selected = (result, surrogate)
+                if result["passed"]:
+                    selected = (result, surrogate)
+                    break
+
+            result, surrogate = selected
+
+            version = f"{best_run[0]}-fast-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            version_dir = os.path.join(self.config.surrogate_versions, version)
+            tmp_version_dir = os.path.join(self.config.surrogate_versions, f".{version}.tmp")
+
+            surrogate.save(tmp_version_dir)
+            os.rename(tmp_version_dir, version_dir)
+
+            registration = {
+                "tier": "fast",
+                "registered": result["passed"],
+                "version": version,
+                "path": version_dir,
+                "teacher_run_id": best_run[0],
+                "max_mape_gap": self.config.max_mape_gap,
+                "mape_test": result["mape_test"],
+                "mape_gap": result["mape_gap"],
+                "speedup": result["speedup"],
+                "created_at": datetime.now().isoformat()
+            }
+
+            report = {
+                "teacher": {
+                    "run_id": best_run[0],
+                    "nodes": teacher.n_nodes,
+                    "size_bytes": teacher.nbytes,
+                    "mape_test": float(teacher_mape),
+                    "latency": teacher_latency
+                },
+                "candidates": candidates,
+                "selected": result,
+                "registered": result["passed"]
+            }
+
+            save_json_atomic(Path(self.config.report), report)
+            save_json_atomic(Path(self.config.fast_tier), registration)
+
+            if result["passed"]:
+                logging.info(f"Fast tier surrogate registered as version {version}! MAPE: {teacher_mape:.4f} -> "
+                             f"{result['mape_test']:.4f}, single-row speedup: {result['speedup']['single_row_p50']}x")
+            else:
+                logging.warning(f"No surrogate within the MAPE guardrail ({self.config.max_mape_gap}): the fast tier "
+                                f"is not registered and will be served by the full model!")
+            logging.info(f"Distillation report saved at: {self.config.report}")
+
+            self.prune_versions(keep=version)
+
+            return report
+
+        except Exception as e:
+            logging.error(f"Error in distilling the model!")
+            raise CustomException(e, sys)
+
+    def prune_versions(self, keep: str) -> None:
+        """
+        Removes all but the newest `keep_versions` surrogates, once the fast tier file points at the new one. Workers
+        still mapping a removed version keep working: unlinked files stay alive until they are unmapped.
+        """
+        versions_dir = self.config.surrogate_versions
+        versions = sorted((name for name in os.listdir(versions_dir) if not name.startswith(".")),
+                          key=lambda name: os.path.getmtime(os.path.join(versions_dir, name)), reverse=True)
+
+        for version in versions[self.config.keep_versions:]:
+            if version != keep:
+                shutil.rmtree(os.path.join(versions_dir, version), ignore_errors=True)
+                logging.info(f"Removed old fast tier surrogate: {version}")
+
+
+if __name__ == '__main__':
+    config_manager = ConfigurationManager()
+    model_distillation_config = config_manager.get_model_distillation_config()
+    predictor = Predictor(config=config_manager.get_prediction_config())
+    model_distiller = ModelDistiller(config=model_distillation_config, predictor=predictor)
+    model_distiller.distill_model()
@@ -1,5 +1,8 @@
+import os
 import sys
 import json
+from pathlib import Path
+from datetime import datetime
 
 import mlflow
 from urllib.parse import urlparse
@@ -8,8 +11,10 @@ import numpy as np
 from sklearn.metrics import mean_absolute_error, mean_squared_error, mean_absolute_percentage_error
 from src.RuralCreditPredictor.logger import logging
 from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.utils.common import save_json_atomic
 from src.RuralCreditPredictor.config.configuration import ConfigurationManager
 from src.RuralCreditPredictor.components.model_trainer import ModelTrainer
+from src.RuralCreditPredictor.components.model_benchmark import ModelBenchmark
 
 
 class ModelEvaluator:
@@ -77,6 +82,50 @@ class ModelEvaluator:
             logging.error(f"Error occurred while getting model!")
             raise CustomException(e, sys)
 
+    def _update_model_index(self, run_id, run_name, experiment_id, model_uri, metrics, benchmark=None) -> None:
+        """
+        Adds/refreshes the run in the local model index and recomputes the best run per metric (lower is better
+        for every metric we log), so the predictor can resolve the best model without querying MLflow. The run's
+        serving benchmark is kept next to its metrics for latency-aware selection.
+        """
+        try:
+            logging.info("> Updating local model index:")
+
+            model_index_path = self.config.model_index
+
+            if os.path.exists(model_index_path):
+                with open(model_index_path, 'r') as file:
+                    model_index = json.load(file)
+            else:
+                model_index = {"experiment_name": self.config.experiment_name, "runs": {}, "best": {}}
+
+            model_index["runs"][run_id] = {
+                "run_name": run_name,
+                "experiment_id": experiment_id,
+                "model_uri": model_uri,
+                "metrics": metrics,
+                "benchmark": benchmark
+            }
+
+            runs = model_index["runs"]
+            metric_names = {name for run in runs.values() for name in run["metrics"]}
+            model_index["best"] = {
+                name: min(
+                    (_run_id for _run_id in runs if name in runs[_run_id]["metrics"]),
+                    key=lambda _run_id: runs[_run_id]["metrics"][name]
+                )
+                for name in sorted(metric_names)
+            }
+            model_index["updated_at"] = datetime.now().isoformat()
+
+            save_json_atomic(Path(model_index_path), model_index)
+
+            logging.info(f"Model index updated at: {model_index_path}. Runs indexed: {len(runs)}")
+
+        except Exception as e:
+            logging.error(f"Error occurred while updating model index!")
+            raise CustomException(e, sys)
+
     def get_model_metrics(self):
         try:
             logging.info("> Getting model metrics:")
@@ -95,7 +144,14 @@ class ModelEvaluator:
             mae_train, mape_train, mse_train, rmse_train = self.evaluate_model(y_train, y_pred_train, log=False)
             mae_test, mape_test, mse_test, rmse_test = self.evaluate_model(y_test, y_pred_test, log=False)
 
-            with mlflow.start_run(run_id=run_id):
+            # What the model costs to serve, measured on the engine the predictor would serve it with
+            benchmark = ModelBenchmark(
+                single_rows=self.config.benchmark_single_rows,
+                batch_size=self.config.benchmark_batch_size,
+                batch_repeats=self.config.benchmark_batch_repeats
+            ).run(model, x_test, compiled=config.get_prediction_config(log=False).compiled_forest)
+
+            with mlflow.start_run(run_id=run_id) as run:
                 mlflow.log_metric("mae_train", mae_train)
                 mlflow.log_metric("mape_train", mape_train)
                 mlflow.log_metric("mse_train", mse_train)
@@ -110,6 +166,15 @@ class ModelEvaluator:
 
                 logging.info(f"Test metrics: MAE: {mae_test}, MAPE: {mape_test}, MSE: {mse_test}, RMSE: {rmse_test}")
 
+                mlflow.log_metric("size_mb", benchmark["size_mb"])
+                mlflow.log_metric("load_ms", benchmark["load_ms"])
+                mlflow.log_metric("single_row_p99_ms", benchmark["single_row_p99_ms"])
+                mlflow.log_metric("batch_p99_ms", benchmark["batch_p99_ms"])
+
+                run_name = run.data.tags.get("mlflow.runName")
+                experiment_id = run.info.experiment_id
+                model_uri = mlflow.get_artifact_uri("model")
+
             logging.info("Model metrics logged successfully! Ending run....")
 
             # End Run
@@ -146,6 +211,24 @@ class ModelEvaluator:
 
             logging.info(f"Model metrics are ready. Saved at: {train_metrics_path}, {train_metrics_path}!")
 
+            self._update_model_index(
+                run_id=run_id,
+                run_name=run_name,
+                experiment_id=experiment_id,
+                model_uri=model_uri,
+                metrics={
+                    "mae_train": mae_train,
+                    "mape_train": mape_train,
+                    "mse_train": mse_train,
+                    "rmse_train": rmse_train,
+                    "mae_test": mae_test,
+                    "mape_test": mape_test,
+                    "mse_test": mse_test,
+                    "rmse_test": rmse_test
+                },
+                benchmark=benchmark
+            )
+
         except Exception as e:
             logging.error(f"Error occurred while getting model metrics!")
             raise CustomException(e, sys)
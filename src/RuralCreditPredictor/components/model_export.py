@@ -0,0 +1,89 @@
+import os
+import sys
+import shutil
+from pathlib import Path
+from datetime import datetime
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.utils.common import save_json_atomic
+from src.RuralCreditPredictor.entity.config_entity import ModelExportConfig
+from src.RuralCreditPredictor.config.configuration import ConfigurationManager
+from src.RuralCreditPredictor.components.prediction import Predictor
+from src.RuralCreditPredictor.components.forest_engine import CompiledForest
+from src.RuralCreditPredictor.components.feature_encoder import CompiledEncoder
+
+
+class ModelExporter:
+    """
+    Exports the best model and its data transformer as memory-mappable arrays for pre-forked serving workers.
+
+    Each export is written to its own version directory, which is renamed into place only once complete; the
+    `current.json` pointer is then replaced atomically, so workers always attach to a complete version and swap to
+    the new one on their next request.
+    """
+
+    def __init__(self, config: ModelExportConfig, predictor: Predictor):
+        self.config = config
+        self.predictor = predictor
+
+    def export_model(self) -> str:
+        try:
+            logging.info("> Exporting the best model as memory-mapped arrays:")
+
+            run_id, run_name, _, _ = best_run = self.predictor.resolve_best_run()
+
+            compiled_encoder = CompiledEncoder.from_column_transformer(self.predictor.load_data_transformer())
+            compiled_forest = CompiledForest.from_sklearn(self.predictor.load_model(best_run=best_run))
+            if self.config.compact:
+                compiled_forest = compiled_forest.compact(tolerance=self.config.compaction_tolerance)
+
+            version = f"{run_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            versions_dir = os.path.join(self.config.root_dir, "versions")
+            version_dir = os.path.join(versions_dir, version)
+            tmp_version_dir = os.path.join(versions_dir, f".{version}.tmp")
+
+            compiled_forest.save(os.path.join(tmp_version_dir, "forest"))
+            compiled_encoder.save(os.path.join(tmp_version_dir, "encoder"))
+            os.rename(tmp_version_dir, version_dir)
+
+            save_json_atomic(Path(self.config.current_pointer), {
+                "version": version,
+                "path": version_dir,
+                "run_id": run_id,
+                "run_name": run_name,
+                "size_bytes": compiled_forest.nbytes,
+                "exported_at": datetime.now().isoformat()
+            })
+
+            logging.info(f"Model exported successfully! Version: {version}, "
+                         f"size: {compiled_forest.nbytes / 1024 ** 2:.2f} MB, path: {version_dir}")
+
+            self.prune_versions(keep=version)
+
+            return version_dir
+
+        except Exception as e:
+            logging.error(f"Error in exporting the model!")
+            raise CustomException(e, sys)
+
+    def prune_versions(self, keep: str) -> None:
+        """
+        Removes all but the newest `keep_versions` exports. Workers still mapping a removed version keep working:
+        unlinked files stay alive until they are unmapped.
+        """
+        versions_dir = os.path.join(self.config.root_dir, "versions")
+        versions = sorted((name for name in os.listdir(versions_dir) if not name.startswith(".")),
+                          key=lambda name: os.path.getmtime(os.path.join(versions_dir, name)), reverse=True)
+
+        for version in versions[self.config.keep_versions:]:
+            if version != keep:
+                shutil.rmtree(os.path.join(versions_dir, version), ignore_errors=True)
+                logging.info(f"Removed old model export: {version}")
+
+
+if __name__ == '__main__':
+    config_manager = ConfigurationManager()
+    model_export_config = config_manager.get_model_export_config()
+    predictor = Predictor(config=config_manager.get_prediction_config())
+    model_exporter = ModelExporter(config=model_export_config, predictor=predictor)
+    model_exporter.export_model()
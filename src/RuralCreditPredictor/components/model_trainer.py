@@ -2,7 +2,6 @@ import os
 import sys
 
 import mlflow
-import dagshub
 from urllib.parse import urlparse
 
 from sklearn.ensemble import RandomForestRegressor
@@ -44,6 +43,8 @@ class ModelTrainer:
 
             x_train, x_test, y_train, y_test = self.get_data()
 
+            import dagshub
+
             # Initialize DagsHub
             # Note: Comment below line to run experiment/save model locally
             dagshub.init("RuralCreditPredictor", "heydido", mlflow=True)
@@ -1,23 +1,305 @@
+import os
 import json
 import sys
+import time
 import pickle
-import pandas as pd
-
-import mlflow
-from urllib.parse import urlparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
 from src.RuralCreditPredictor.logger import logging
 from src.RuralCreditPredictor.exception import CustomException
 from src.RuralCreditPredictor.entity.config_entity import PredictionConfig
 from src.RuralCreditPredictor.config.configuration import ConfigurationManager
+from src.RuralCreditPredictor.components.forest_engine import CompiledForest
+from src.RuralCreditPredictor.components.feature_encoder import CompiledEncoder
+from src.RuralCreditPredictor.components.inference_policy import InferenceParallelismPolicy
+from src.RuralCreditPredictor.components.admission_control import DeadlineExceededError
+from src.RuralCreditPredictor.components.metrics import STAGE_LATENCY, ERRORS, set_served_model
 
 import warnings
 warnings.filterwarnings("ignore")
 
 
+# Served models: the full forest, and the distilled surrogate for high-volume pre-screening
+MODEL_TIERS = ("full", "fast")
+
+# Serving benchmark metrics the budgets apply to, as logged per run to MLflow and the model index
+_BENCHMARK_METRICS = ("single_row_p99_ms", "batch_p99_ms", "size_mb")
+
+# Process-wide cache of the loaded serving artifacts, shared by every Predictor instance.
+# The entry is swapped as a single (signature, data_transformer, model, model_version, fast_model, fast_version) tuple
+# so readers never see a torn update; fast_model is None while no fast tier surrogate is registered.
+_artifact_cache = {"entry": None}
+_artifact_cache_lock = threading.Lock()
+
+# Reload started for requests with a deadline: runs on its own thread, so a request can stop waiting for it
+_background_reload = {"future": None, "executor": None}
+_background_reload_lock = threading.Lock()
+
+
+def _get_file_signature(path) -> tuple:
+    """
+    Cheap change detector for an artifact file: (mtime_ns, size), or None if the file is missing.
+    """
+    try:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    except FileNotFoundError:
+        return None
+
+
+def clear_artifact_cache() -> None:
+    """
+    Drops the cached data transformer and model, forcing a reload on the next prediction.
+    """
+    with _artifact_cache_lock:
+        _artifact_cache["entry"] = None
+
+
 class Predictor:
-    def __init__(self, config: PredictionConfig):
+    def __init__(self, config: PredictionConfig, inference_policy: InferenceParallelismPolicy = None):
         self.config = config
+        # Serial unless the caller hands in a policy sized for its share of the host
+        self.inference_policy = inference_policy or InferenceParallelismPolicy.serial()
+
+    def _get_artifacts_signature(self) -> tuple:
+        return (
+            _get_file_signature(self.config.latest_run_id),
+            _get_file_signature(self.config.model_index),
+            _get_file_signature(self.config.data_transformer),
+            _get_file_signature(self.config.shared_model_pointer),
+            _get_file_signature(self.config.fast_tier)
+        )
+
+    def artifacts_are_current(self) -> bool:
+        """
+        True when the cached artifacts match the files on disk, i.e. the next prediction will not trigger a load.
+        """
+        entry = _artifact_cache["entry"]
+        return entry is not None and entry[0] == self._get_artifacts_signature()
+
+    def has_artifacts(self) -> bool:
+        """
+        True once any model is loaded, current or not, i.e. there is a model to fall back to.
+        """
+        return _artifact_cache["entry"] is not None
+
+    def reload_in_background(self):
+        """
+        Starts a reload of the serving artifacts on the background loading thread, unless one is already running,
+        and returns its future.
+        """
+        with _background_reload_lock:
+            future = _background_reload["future"]
+            if future is None or future.done():
+                if _background_reload["executor"] is None:
+                    _background_reload["executor"] = ThreadPoolExecutor(max_workers=1,
+                                                                        thread_name_prefix="model-loading")
+                future = _background_reload["executor"].submit(self._reload_artifacts)
+                _background_reload["future"] = future
+
+            return future
+
+    def _get_entry(self, deadline: float = None) -> tuple:
+        """
+        Returns (entry, stale): stale is True when the previous model is returned because the reload did not finish
+        before the deadline or failed.
+        """
+        signature = self._get_artifacts_signature()
+
+        # Fast path: no lock needed while the artifacts on disk are unchanged
+        entry = _artifact_cache["entry"]
+        if entry is not None and entry[0] == signature:
+            return entry, False
+
+        if deadline is None:
+            return self._reload_artifacts(), False
+
+        # With a deadline the load runs in the background; past the deadline the previous model answers instead
+        future = self.reload_in_background()
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic())), False
+
+        except FutureTimeoutError:
+            if entry is None:
+                raise DeadlineExceededError("the model is still loading")
+            logging.warning(f"Model reload did not finish before the request deadline, serving model {entry[3]}")
+            return entry, True
+
+        except Exception:
+            if entry is None:
+                raise
+            logging.warning(f"Model reload failed, serving model {entry[3]}")
+            return entry, True
+
+    def wait_for_artifacts(self, deadline: float = None) -> bool:
+        """
+        Waits for the serving artifacts like get_artifacts does and returns whether the previous model answers
+        instead of the one being reloaded (a stale fallback).
+        """
+        try:
+            return self._get_entry(deadline)[1]
+
+        except DeadlineExceededError:
+            raise
+
+        except Exception as e:
+            logging.error(f"Error in waiting for the serving artifacts!")
+            raise CustomException(e, sys)
+
+    def get_artifacts(self, tier: str = "full", deadline: float = None) -> tuple:
+        """
+        Returns the cached (data_transformer, model) pair of the tier, reloading it only when latest_run_id.txt, the
+        model index, the data transformer or a model pointer has changed. Concurrent callers wait for a single
+        in-flight load. The fast tier falls back to the full model while no surrogate is registered.
+
+        With a (time.monotonic) `deadline`, the caller stops waiting for a reload at the deadline and gets the
+        previously loaded model; with none loaded yet, DeadlineExceededError is raised.
+        """
+        try:
+            entry, _ = self._get_entry(deadline)
+
+            if tier == "fast" and entry[4] is not None:
+                return entry[1], entry[4]
+
+            return entry[1], entry[2]
+
+        except DeadlineExceededError:
+            raise
+
+        except Exception as e:
+            logging.error(f"Error in getting the serving artifacts!")
+            raise CustomException(e, sys)
+
+    def get_model_version(self, tier: str = "full", deadline: float = None) -> str:
+        """
+        Returns the version of the model currently served for the tier (loading it first if needed): the run id
+        for the full model, the surrogate version for the fast tier.
+        """
+        try:
+            entry, _ = self._get_entry(deadline)
+
+            if tier == "fast" and entry[4] is not None:
+                return entry[5]
+
+            return entry[3]
+
+        except DeadlineExceededError:
+            raise
+
+        except Exception as e:
+            logging.error(f"Error in getting the served model version!")
+            raise CustomException(e, sys)
+
+    def served_tier(self, tier: str) -> str:
+        """
+        The tier that actually answers requests for `tier`: "full" when the fast tier has no registered surrogate.
+        """
+        # The model that just answered, even when it is a stale fallback
+        entry = _artifact_cache["entry"] or self._get_entry()[0]
+        return "fast" if tier == "fast" and entry[4] is not None else "full"
+
+    def _reload_artifacts(self) -> tuple:
+        try:
+            with _artifact_cache_lock:
+                # Another request may have finished loading while we were waiting for the lock
+                signature = self._get_artifacts_signature()
+                entry = _artifact_cache["entry"]
+                if entry is not None and entry[0] == signature:
+                    return entry
+
+                logging.info("> Serving artifacts changed or not loaded yet. Reloading:")
+
+                if self.config.shared_model and os.path.exists(self.config.shared_model_pointer):
+                    with STAGE_LATENCY.time("attach_exported_model"):
+                        data_transformer, model, model_version = self.attach_exported_model()
+
+                else:
+                    best_run = self.resolve_best_run()
+                    model_version = best_run[0]
+
+                    with STAGE_LATENCY.time("load_data_transformer"):
+                        data_transformer = self.load_data_transformer()
+                    with STAGE_LATENCY.time("load_model"):
+                        model = self.load_model(best_run=best_run)
+
+                    with STAGE_LATENCY.time("compile"):
+                        if self.config.compiled_encoder:
+                            data_transformer = CompiledEncoder.from_column_transformer(data_transformer)
+
+                        if self.config.compiled_forest:
+                            model = CompiledForest.from_sklearn(model)
+                        else:
+                            # The trained forest comes with n_jobs=-1 and verbose=2
+                            InferenceParallelismPolicy.configure(model)
+
+                fast_model, fast_version = None, None
+                if os.path.exists(self.config.fast_tier):
+                    with STAGE_LATENCY.time("load_fast_tier"):
+                        fast_model, fast_version = self.load_fast_tier()
+
+                entry = (signature, data_transformer, model, model_version, fast_model, fast_version)
+                _artifact_cache["entry"] = entry
+                set_served_model(model_version, model)
+
+                logging.info("Serving artifacts cached successfully!")
+
+                return entry
+
+        except Exception as e:
+            ERRORS.inc("load_artifacts")
+            logging.error(f"Error in reloading the serving artifacts!")
+            raise CustomException(e, sys)
+
+    def attach_exported_model(self) -> tuple:
+        """
+        Attaches read-only to the model exported by the model export stage: the forest and encoder arrays are
+        memory-mapped, so all workers on the host share one physical copy. Returns (data_transformer, model, run_id).
+        """
+        try:
+            logging.info(f"> Attaching to the exported model via: {self.config.shared_model_pointer}")
+
+            with open(self.config.shared_model_pointer, 'r') as file:
+                current = json.load(file)
+
+            data_transformer = CompiledEncoder.load(os.path.join(current["path"], "encoder"), mmap_mode="r")
+            model = CompiledForest.load(os.path.join(current["path"], "forest"), mmap_mode="r")
+
+            logging.info(f"Attached to exported model version: {current['version']}")
+
+            return data_transformer, model, current["run_id"]
+
+        except Exception as e:
+            logging.error(f"Error in attaching to the exported model!")
+            raise CustomException(e, sys)
+
+    def load_fast_tier(self) -> tuple:
+        """
+        Loads the fast tier surrogate registered by the model distillation stage. Returns (model, version), or
+        (None, None) when the surrogate did not pass the accuracy guardrail.
+        """
+        try:
+            logging.info(f"> Loading the fast tier surrogate via: {self.config.fast_tier}")
+
+            with open(self.config.fast_tier, 'r') as file:
+                registration = json.load(file)
+
+            if not registration["registered"]:
+                logging.warning(f"Fast tier surrogate {registration['version']} was rejected by the accuracy "
+                                f"guardrail, the fast tier is served by the full model!")
+                return None, None
+
+            # Mapped like the exported model, so pre-forked workers share it
+            model = CompiledForest.load(registration["path"], mmap_mode="r" if self.config.shared_model else None)
+
+            logging.info(f"Fast tier surrogate loaded successfully! Version: {registration['version']}")
+
+            return model, registration["version"]
+
+        except Exception as e:
+            logging.error(f"Error in loading the fast tier surrogate!")
+            raise CustomException(e, sys)
 
     def load_data_transformer(self):
         try:
@@ -35,69 +317,225 @@ class Predictor:
             logging.error(f"Error in loading the data transformer!")
             raise CustomException(e, sys)
 
-    def load_model(self):
+    def load_model_index(self) -> dict:
+        try:
+            logging.info("> Loading the local model index:")
+
+            with open(self.config.model_index, 'r') as file:
+                model_index = json.load(file)
+
+            logging.info(f"Model index loaded successfully! Runs indexed: {len(model_index['runs'])}")
+
+            return model_index
+
+        except Exception as e:
+            logging.error(f"Error in loading the model index!")
+            raise CustomException(e, sys)
+
+    def _search_best_run(self, metric_name) -> tuple:
+        """
+        Legacy lookup of the best run through the tracking server, used only until model evaluation has written
+        the local model index.
+        """
+        import mlflow
+        import pandas as pd
+        from urllib.parse import urlparse
+
+        # Note: Comment below two lines to run do prediction using a local model
+        remote_server_uri = "https://dagshub.com/heydido/RuralCreditPredictor.mlflow"
+        mlflow.set_tracking_uri(remote_server_uri)
+
+        experiment_name = self.config.experiment_name
+        experiment_id = mlflow.get_experiment_by_name(experiment_name).experiment_id
+
+        runs = mlflow.search_runs(experiment_ids=experiment_id)
+        if 'metrics.' + metric_name not in runs.columns or runs['metrics.' + metric_name].isna().all():
+            raise ValueError(f"No run of experiment '{experiment_name}' recorded the selection metric "
+                             f"'{metric_name}' (prediction.selection_metric)")
+        runs = runs[runs['metrics.' + metric_name].notna()]
+
+        # Model evaluation logs the serving benchmark with every run's metrics, so the budgets apply here too
+        metrics = dict(zip(runs.run_id, runs['metrics.' + metric_name]))
+        benchmarks = {}
+        if all(f"metrics.{name}" in runs.columns for name in _BENCHMARK_METRICS):
+            for _, row in runs.iterrows():
+                benchmark = {name: row[f"metrics.{name}"] for name in _BENCHMARK_METRICS}
+                if not any(pd.isna(value) for value in benchmark.values()):
+                    benchmarks[row.run_id] = benchmark
+
+        run_id = self._apply_budgets(min(metrics, key=metrics.get), metrics, benchmarks)
+        run_name = runs[run_id == runs.run_id]["tags.mlflow.runName"].values[0]
+
+        tracking_url_type_store = urlparse(mlflow.get_tracking_uri()).scheme
+        if tracking_url_type_store != "file":
+            model_uri = f"runs:/{run_id}/model"
+        else:
+            model_uri = f"mlruns/{experiment_id}/{run_id}/artifacts/model"
+
+        return run_id, run_name, experiment_id, model_uri
+
+    def _select_run(self, model_index: dict) -> str:
+        metric_name = self.config.selection_metric
+
+        runs = {run_id: run for run_id, run in model_index["runs"].items() if metric_name in run["metrics"]}
+        if not runs:
+            raise ValueError(f"No run in the model index recorded the selection metric '{metric_name}' "
+                             f"(prediction.selection_metric)")
+
+        metrics = {run_id: run["metrics"][metric_name] for run_id, run in runs.items()}
+        return self._apply_budgets(
+            model_index["best"].get(metric_name) or min(metrics, key=metrics.get),
+            metrics,
+            {run_id: run["benchmark"] for run_id, run in runs.items() if run.get("benchmark")}
+        )
+
+    def _apply_budgets(self, best_run_id: str, metrics: dict, benchmarks: dict) -> str:
+        """
+        Selection policy: the run with the lowest selection metric (`metrics`: run id -> metric) among the runs whose
+        serving benchmark (`benchmarks`: run id -> benchmark) fits the configured budgets (single-row p99, batch p99,
+        serialized size). A more accurate model that is over budget is never promoted; when no run fits, the one
+        least over budget is served.
+        """
+        metric_name = self.config.selection_metric
+
+        budgets = {"single_row_p99_ms": self.config.max_p99_ms, "batch_p99_ms": self.config.max_batch_p99_ms,
+                   "size_mb": self.config.max_size_mb}
+        budgets = {name: budget for name, budget in budgets.items() if budget is not None}
+        if not budgets:
+            return best_run_id
+
+        runs = {run_id: benchmark for run_id, benchmark in benchmarks.items() if run_id in metrics}
+        if not runs:
+            logging.warning(f"No run has a serving benchmark, selecting by {metric_name} only!")
+            return best_run_id
+
+        within_budget = [run_id for run_id, benchmark in runs.items()
+                         if all(benchmark[name] <= budget for name, budget in budgets.items())]
+
+        if within_budget:
+            run_id = min(within_budget, key=lambda _run_id: metrics[_run_id])
+            if run_id != best_run_id:
+                logging.info(f"Run {best_run_id} has the best {metric_name} but is over the serving budget "
+                             f"{budgets}, selecting run {run_id}")
+            return run_id
+
+        run_id = min(runs, key=lambda _run_id: max(runs[_run_id][name] / budget for name, budget in budgets.items()))
+        logging.warning(f"No run fits the serving budget {budgets}, selecting the run least over it: {run_id}")
+        return run_id
+
+    def resolve_best_run(self) -> tuple:
+        """
+        Resolves (run_id, run_name, experiment_id, model_uri) of the best model by the configured selection metric,
+        within the configured serving budgets.
+        """
+        metric_name = self.config.selection_metric
+
+        if os.path.exists(self.config.model_index):
+            model_index = self.load_model_index()
+
+            run_id = self._select_run(model_index)
+            run = model_index["runs"][run_id]
+
+            return run_id, run["run_name"], run["experiment_id"], run["model_uri"]
+
+        logging.warning(f"Model index not found at: {self.config.model_index}. Falling back to MLflow search!")
+
+        return self._search_best_run(metric_name)
+
+    def load_model(self, best_run: tuple = None):
         try:
             logging.info("> Loading the model:")
 
+            import mlflow.sklearn
+
             # Note: Comment below two lines to run do prediction using a local model
             remote_server_uri = "https://dagshub.com/heydido/RuralCreditPredictor.mlflow"
             mlflow.set_tracking_uri(remote_server_uri)
 
-            experiment_name = self.config.experiment_name
-            experiment_id = mlflow.get_experiment_by_name(experiment_name).experiment_id
+            run_id, run_name, experiment_id, model_uri = best_run or self.resolve_best_run()
+
+            model = mlflow.sklearn.load_model(model_uri)
 
-            runs = mlflow.search_runs(experiment_ids=experiment_id)
-            metric_name = "mape_test"
-            best_run = runs.sort_values(by=['metrics.' + metric_name], ascending=True).iloc[0]
-            run_id = best_run.run_id
-            run_name = runs[run_id == runs.run_id]["tags.mlflow.runName"].values[0]
+            logging.info(
+                f"Best model loaded successfully with following info: \n"
+                f" - experiment_id: {experiment_id} \n"
+                f" - run_id: {run_id} \n"
+                f" - run_name: {run_name} \n"
+                f" - model_uri: {model_uri}"
+            )
 
-            tracking_url_type_store = urlparse(mlflow.get_tracking_uri()).scheme
-            if tracking_url_type_store != "file":
-                logging.info("Mode - Remote")
+            return model
 
-                model = mlflow.sklearn.load_model(f"runs:/{run_id}/model")
+        except Exception as e:
+            logging.error(f"Error in loading the model!")
+            raise CustomException(e, sys)
 
-                logging.info(
-                    f"Best model loaded successfully with following info: \n"
-                    f" - experiment_id: {experiment_id} \n"
-                    f" - run_id: {run_id} \n"
-                    f" - run_name: {run_name}"
-                )
+    @staticmethod
+    def _transform(data_transformer, prediction_data):
+        # The compiled encoder takes records/columns as they are; the sklearn ColumnTransformer needs a DataFrame
+        if not isinstance(data_transformer, CompiledEncoder):
+            import pandas as pd
 
-                return model
+            if not isinstance(prediction_data, pd.DataFrame):
+                prediction_data = pd.DataFrame(prediction_data)
+
+        return data_transformer.transform(prediction_data)
+
+    def predict_batch(self, prediction_data, tier: str = "full", deadline: float = None):
+        """
+        Scores a whole batch of applicants with a single transform and a single forest pass.
+        `prediction_data` can be a DataFrame, a list of record dicts, a mapping of column -> values or a structured
+        array. Predictions are returned in input row order.
+        """
+        try:
+            logging.info("> Getting batch prediction:")
 
-            else:
-                logging.info("Mode - Local")
+            with STAGE_LATENCY.time("get_artifacts"):
+                data_transformer, model = self.get_artifacts(tier, deadline)
 
-                model_path = f"mlruns/{experiment_id}/{run_id}/artifacts/model"
+            with STAGE_LATENCY.time("transform_batch"):
+                prediction_data = self._transform(data_transformer, prediction_data)
 
-                model = mlflow.sklearn.load_model(model_path)
+            with STAGE_LATENCY.time("predict_batch"):
+                predictions = self.inference_policy.predict(model, prediction_data)
 
-                logging.info(f"Model loaded successfully. experiment_id: {experiment_id}, run_id: {run_id}")
+            logging.info("Batch prediction done successfully!")
 
-                return model
+            return predictions
+
+        except DeadlineExceededError:
+            raise
 
         except Exception as e:
-            logging.error(f"Error in loading the model!")
+            ERRORS.inc("predict_batch")
+            logging.error(f"Error in predicting batch prediction!")
             raise CustomException(e, sys)
 
-    def predict(self, prediction_datapoint):
+    def predict(self, prediction_datapoint, tier: str = "full", deadline: float = None):
         try:
             logging.info("> Getting prediction:")
 
-            data_transformer = self.load_data_transformer()
-            model = self.load_model()
+            with STAGE_LATENCY.time("get_artifacts"):
+                data_transformer, model = self.get_artifacts(tier, deadline)
+
+            if isinstance(prediction_datapoint, dict):
+                prediction_datapoint = [prediction_datapoint]
 
-            prediction_datapoint = data_transformer.transform(prediction_datapoint)
+            with STAGE_LATENCY.time("transform"):
+                prediction_datapoint = self._transform(data_transformer, prediction_datapoint)
 
-            prediction = model.predict(prediction_datapoint)[0]
+            with STAGE_LATENCY.time("predict"):
+                prediction = model.predict(prediction_datapoint)[0]
 
             logging.info(f"Prediction done successfully! Loan Amount: {prediction}")
 
             return prediction
 
+        except DeadlineExceededError:
+            raise
+
         except Exception as e:
+            ERRORS.inc("predict")
             logging.error(f"Error in predicting prediction!")
             raise CustomException(e, sys)
 
@@ -137,6 +575,8 @@ class CustomData:
         try:
             logging.info("> Getting data for prediction:")
 
+            import pandas as pd
+
             data = pd.DataFrame([self.input_data])
 
             logging.info("Data ready for prediction!")
@@ -0,0 +1,95 @@
+import time
+import json
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from src.RuralCreditPredictor.logger import logging
+
+
+class PredictionCache:
+    """
+    Bounded LRU + TTL cache of single-applicant predictions.
+
+    Keys are a canonical hash of the normalized applicant features together with the served model version, and the
+    whole cache is dropped as soon as a different model version is seen, so stale predictions are never returned.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 600):
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()
+        self._model_version = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(record, model_version: str) -> str:
+        """
+        Canonical hash of an applicant: the bytes of a decoded structured record (already typed and normalized by
+        the request decoder), or the sorted JSON of a plain dict, plus the model version.
+        """
+        if isinstance(record, np.ndarray):
+            features = record.tobytes()
+        else:
+            features = json.dumps(record, sort_keys=True, default=str).encode()
+
+        return hashlib.blake2b(features + model_version.encode(), digest_size=16).hexdigest()
+
+    def _check_model_version(self, model_version: str) -> None:
+        if model_version != self._model_version:
+            if self._entries:
+                logging.info(f"Model changed to {model_version}, dropping {len(self._entries)} cached predictions")
+            self._entries.clear()
+            self._model_version = model_version
+
+    def get_or_compute(self, record, model_version: str, compute_fn):
+        key = self.make_key(record, model_version)
+        now = time.monotonic()
+
+        with self._lock:
+            self._check_model_version(model_version)
+
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            self.misses += 1
+
+        # Scored outside the lock so a slow miss never blocks hits
+        value = compute_fn(record)
+
+        with self._lock:
+            if model_version == self._model_version:
+                self._entries[key] = (now + self.ttl, value)
+                self._entries.move_to_end(key)
+
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "model_version": self._model_version
+            }
@@ -0,0 +1,99 @@
+import sys
+import time
+import queue
+import threading
+from concurrent.futures import Future
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.components.admission_control import ServiceOverloadedError
+
+
+class PredictionCoalescer:
+    """
+    Gathers single-row prediction requests arriving close together and scores them in one vectorized call.
+
+    Callers block on their own Future, so the request/response API is unchanged. The gathering window adapts to
+    load: it collapses to zero while requests arrive one at a time (no added latency) and grows, up to
+    `max_window_ms`, while batches of more than one request keep forming.
+    """
+
+    def __init__(self, score_fn, max_batch_size: int = 64, max_window_ms: float = 5.0, min_window_ms: float = 0.25):
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_window = max_window_ms / 1000
+        self.min_window = min_window_ms / 1000
+
+        self._window = 0.0
+        self._queue = queue.SimpleQueue()
+        self._worker = threading.Thread(target=self._run, name="PredictionCoalescer", daemon=True)
+        self._worker.start()
+
+        logging.info(f"Prediction coalescer started (max_batch_size: {max_batch_size}, "
+                     f"max_window_ms: {max_window_ms})")
+
+    @property
+    def window_ms(self) -> float:
+        return self._window * 1000
+
+    def submit(self, item) -> Future:
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def predict(self, item, timeout=None):
+        try:
+            return self.submit(item).result(timeout=timeout)
+
+        except ServiceOverloadedError:
+            raise
+
+        except Exception as e:
+            logging.error(f"Error in coalesced prediction!")
+            raise CustomException(e, sys)
+
+    def _collect_batch(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self._window
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                # Requests already queued are always taken, even with a zero window
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _adapt_window(self, batch_size: int) -> None:
+        if batch_size > 1:
+            self._window = min(self.max_window, max(self.min_window, self._window * 2))
+        else:
+            self._window = self._window / 2 if self._window / 2 >= self.min_window else 0.0
+
+    def _dispatch(self, batch: list) -> None:
+        items = [item for item, _ in batch]
+
+        try:
+            results = self.score_fn(items)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+
+            # Re-score one by one so a single bad row does not fail every request in the batch
+            logging.warning(f"Coalesced batch of {len(batch)} failed, re-scoring individually: {e}")
+            for item, future in batch:
+                try:
+                    future.set_result(self.score_fn([item])[0])
+                except Exception as item_error:
+                    future.set_exception(item_error)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            self._dispatch(batch)
+            self._adapt_window(len(batch))
@@ -0,0 +1,165 @@
+import sys
+import time
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.config.configuration import ConfigurationManager
+from src.RuralCreditPredictor.components.prediction import Predictor, MODEL_TIERS
+from src.RuralCreditPredictor.components.request_decoder import RequestDecoder, RequestDecodeError
+from src.RuralCreditPredictor.components.prediction_cache import PredictionCache
+from src.RuralCreditPredictor.components.prediction_coalescer import PredictionCoalescer
+from src.RuralCreditPredictor.components.sampling_profiler import SamplingProfiler
+from src.RuralCreditPredictor.components.inference_policy import InferenceParallelismPolicy
+from src.RuralCreditPredictor.components.metrics import STAGE_LATENCY, ERRORS, PREDICTIONS, CACHE_LOOKUPS, \
+    MODEL_FALLBACKS
+
+
+class BatchTooLargeError(RequestDecodeError):
+    pass
+
+
+class PredictionService:
+    """
+    Serving-side wiring shared by the WSGI (app.py) and ASGI (asgi.py) entry points: the cached predictor, the
+    schema-compiled request decoder and the optional coalescer and prediction cache, built once per worker.
+    """
+
+    def __init__(self, config_manager: ConfigurationManager = None):
+        try:
+            logging.info("> Setting up the prediction service:")
+
+            config_manager = config_manager or ConfigurationManager()
+
+            self.serving_config = config_manager.get_serving_config()
+
+            # Keeps the loaded model/transformer in a process-wide cache; large batches fan out over this worker's
+            # share of the host's cores
+            self.predictor = Predictor(
+                config=config_manager.get_prediction_config(),
+                inference_policy=InferenceParallelismPolicy.from_config(
+                    config_manager.get_inference_parallelism_config()
+                )
+            )
+
+            # Compiled once from processed_schema.yaml: validates/coerces payloads straight into typed records
+            self.request_decoder = RequestDecoder.from_schema(config_manager.processed_schema.selected_features)
+
+            # Opt-in: concurrent single-row predictions are scored together in one vectorized call. Requests have
+            # already waited for the model before they are queued, so the batch never waits for a reload
+            self.coalescer = None
+            if self.serving_config.coalescer_enabled:
+                self.coalescer = PredictionCoalescer(
+                    score_fn=lambda records: self.predictor.predict_batch(self.request_decoder.stack(records),
+                                                                          deadline=time.monotonic()),
+                    max_batch_size=self.serving_config.coalescer_max_batch_size,
+                    max_window_ms=self.serving_config.coalescer_max_window_ms
+                )
+
+            # Re-submitted applicants (retries, double-posted forms) are answered from a bounded LRU/TTL cache
+            self.prediction_cache = None
+            if self.serving_config.prediction_cache_enabled:
+                self.prediction_cache = PredictionCache(
+                    max_size=self.serving_config.prediction_cache_max_size,
+                    ttl_seconds=self.serving_config.prediction_cache_ttl_seconds
+                )
+                # Read from the cache's own counters when scraped, nothing extra per lookup
+                CACHE_LOOKUPS.set_function(lambda: self.prediction_cache.hits, "hit")
+                CACHE_LOOKUPS.set_function(lambda: self.prediction_cache.misses, "miss")
+
+            # Idle until an admin starts a profile through /admin/profile
+            self.profiler = SamplingProfiler(config=config_manager.get_profiling_config())
+
+            logging.info("Prediction service is ready!")
+
+        except Exception as e:
+            logging.error(f"Error in setting up the prediction service!")
+            raise CustomException(e, sys)
+
+    def decode(self, payload):
+        try:
+            with STAGE_LATENCY.time("decode"):
+                return self.request_decoder.decode(payload)
+
+        except RequestDecodeError:
+            ERRORS.inc("decode")
+            raise
+
+    def decode_batch(self, payload):
+        """
+        Accepts either a JSON list of applicants or {"applicants": [...]}.
+
+        Raises:
+            RequestDecodeError: if the payload is not a non-empty list or an applicant is invalid
+            BatchTooLargeError: if the batch exceeds serving.max_batch_size
+        """
+        applicants = payload.get("applicants") if isinstance(payload, dict) else payload
+
+        try:
+            if not isinstance(applicants, list) or not applicants:
+                raise RequestDecodeError({"applicants": "expected a non-empty JSON list of applicants"})
+
+            if len(applicants) > self.serving_config.max_batch_size:
+                raise BatchTooLargeError(
+                    {"applicants": f"batch too large: {len(applicants)} > {self.serving_config.max_batch_size}"}
+                )
+
+            with STAGE_LATENCY.time("decode_batch"):
+                return self.request_decoder.decode_many(applicants)
+
+        except RequestDecodeError:
+            ERRORS.inc("decode_batch")
+            raise
+
+    @staticmethod
+    def decode_tier(requested) -> str:
+        """
+        Model tier requested through the `X-Model-Tier` header (or a fast tier endpoint); the full model by default.
+
+        Raises:
+            RequestDecodeError: if the tier is not one of MODEL_TIERS
+        """
+        tier = (requested or "full").strip().lower()
+        if tier not in MODEL_TIERS:
+            raise RequestDecodeError({"X-Model-Tier": f"unknown model tier: {requested!r}, expected one of "
+                                                      f"{', '.join(MODEL_TIERS)}"})
+        return tier
+
+    def served_tier(self, tier: str) -> str:
+        return self.predictor.served_tier(tier)
+
+    def _wait_for_model(self, deadline: float = None) -> None:
+        # Once per request: the request's later reads of the artifacts return the same stale model, uncounted
+        if self.predictor.wait_for_artifacts(deadline=deadline):
+            MODEL_FALLBACKS.inc()
+
+    def _score_record(self, record, deadline: float = None):
+        if self.coalescer is not None:
+            return self.coalescer.predict(record)
+        return self.predictor.predict(record, deadline=deadline)
+
+    def predict_one(self, record, tier: str = "full", deadline: float = None) -> float:
+        """
+        With a (time.monotonic) `deadline`, a pending model reload is only waited for until the deadline, after
+        which the previous model answers (DeadlineExceededError if there is none yet).
+        """
+        PREDICTIONS.inc("single", tier)
+        self._wait_for_model(deadline)
+
+        # The surrogate scores a row in microseconds: neither the coalescer nor the cache would pay off
+        if tier == "fast":
+            return self.predictor.predict(record, tier="fast", deadline=deadline)
+
+        if self.prediction_cache is not None:
+            return self.prediction_cache.get_or_compute(record, self.predictor.get_model_version(deadline=deadline),
+                                                        lambda _record: self._score_record(_record, deadline))
+        return self._score_record(record, deadline)
+
+    def predict_many(self, records, tier: str = "full", deadline: float = None) -> list:
+        PREDICTIONS.inc("batch", tier, amount=len(records))
+        self._wait_for_model(deadline)
+        return [float(loan_amount) for loan_amount
+                in self.predictor.predict_batch(records, tier=tier, deadline=deadline)]
+
+    def cache_stats(self) -> dict:
+        if self.prediction_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.prediction_cache.stats()}
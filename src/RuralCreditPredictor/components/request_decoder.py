@@ -0,0 +1,161 @@
+import sys
+import math
+import numpy as np
+from collections.abc import Mapping
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+
+
+class RequestDecodeError(ValueError):
+    """
+    Raised when a prediction payload does not match the schema. `errors` maps each offending field to its problem.
+    """
+
+    def __init__(self, errors: dict):
+        self.errors = errors
+        super().__init__("; ".join(f"{field}: {problem}" for field, problem in errors.items()))
+
+
+class RequestDecoder:
+    """
+    Request decoder compiled once from `selected_features` in processed_schema.yaml.
+
+    Form or JSON payloads are validated and coerced field by field straight into a NumPy structured record
+    (int64 / float64 / fixed-width unicode), and records are batched with plain NumPy, without pandas.
+    """
+
+    _KINDS = {"int64": "int", "float64": "float", "object": "str"}
+    _INT64_RANGE = range(-2 ** 63, 2 ** 63)
+
+    def __init__(self, fields: list, max_str_len: int = 32):
+        self.fields = fields
+        self.max_str_len = max_str_len
+        self._coercers = [(name, getattr(self, f"_coerce_{kind}")) for name, kind in fields]
+        self.dtype = np.dtype([
+            (name, {"int": np.int64, "float": np.float64, "str": f"U{max_str_len}"}[kind]) for name, kind in fields
+        ])
+
+    @classmethod
+    def from_schema(cls, selected_features: dict, max_str_len: int = 32):
+        try:
+            logging.info("> Compiling the request decoder from the processed schema:")
+
+            fields = []
+            for name, dtype in selected_features.items():
+                if dtype not in cls._KINDS:
+                    raise ValueError(f"Unsupported dtype '{dtype}' for feature '{name}' in processed schema")
+                fields.append((name, cls._KINDS[dtype]))
+
+            request_decoder = cls(fields=fields, max_str_len=max_str_len)
+
+            logging.info(f"Request decoder ready! Fields: {[name for name, _ in fields]}")
+
+            return request_decoder
+
+        except Exception as e:
+            logging.error(f"Error in compiling the request decoder!")
+            raise CustomException(e, sys)
+
+    def _coerce_int(self, value):
+        if isinstance(value, bool):
+            raise ValueError("expected an integer, got a boolean")
+
+        number = value
+        if not isinstance(value, int):
+            try:
+                number = int(value.strip()) if isinstance(value, str) else value
+            except ValueError:
+                number = value
+            if not isinstance(number, int):
+                try:
+                    number = float(number)
+                except (TypeError, ValueError):
+                    raise ValueError(f"expected an integer, got {value!r}")
+                # Integral numbers such as 25.0 are accepted
+                if not number.is_integer():
+                    raise ValueError(f"expected an integer, got {value!r}")
+                number = int(number)
+
+        if number not in self._INT64_RANGE:
+            raise ValueError(f"integer out of range: {value!r}")
+        return number
+
+    @staticmethod
+    def _coerce_float(value):
+        if isinstance(value, bool):
+            raise ValueError("expected a number, got a boolean")
+        try:
+            number = float(value.strip() if isinstance(value, str) else value)
+        except (TypeError, ValueError):
+            raise ValueError(f"expected a number, got {value!r}")
+        if not math.isfinite(number):
+            raise ValueError(f"expected a finite number, got {value!r}")
+        return number
+
+    def _coerce_str(self, value):
+        if not isinstance(value, str):
+            raise ValueError(f"expected a string, got {type(value).__name__}")
+        value = value.strip()
+        if not value:
+            raise ValueError("must not be empty")
+        if len(value) > self.max_str_len:
+            raise ValueError(f"longer than {self.max_str_len} characters")
+        return value
+
+    def _decode_values(self, payload, prefix: str, errors: dict) -> tuple:
+        if not isinstance(payload, Mapping):
+            errors[prefix or "payload"] = f"expected an object, got {type(payload).__name__}"
+            return None
+
+        values = []
+        for name, coerce in self._coercers:
+            field = f"{prefix}.{name}" if prefix else name
+
+            if name not in payload:
+                errors[field] = "missing"
+                continue
+
+            try:
+                values.append(coerce(payload[name]))
+            except ValueError as e:
+                errors[field] = str(e)
+
+        return tuple(values) if len(values) == len(self._coercers) else None
+
+    def decode(self, payload) -> np.ndarray:
+        """
+        Decodes one form/JSON payload into a single structured record (shape (1,)).
+
+        Raises:
+            RequestDecodeError: with every missing or invalid field
+        """
+        errors = {}
+        values = self._decode_values(payload, "", errors)
+        if errors:
+            raise RequestDecodeError(errors)
+
+        return np.array([values], dtype=self.dtype)
+
+    def decode_many(self, payloads: list, prefix: str = "applicants") -> np.ndarray:
+        """
+        Decodes a list of payloads into one structured array, reporting errors as `applicants[i].field`.
+
+        Raises:
+            RequestDecodeError: with every missing or invalid field across all payloads
+        """
+        errors, rows = {}, []
+        for i, payload in enumerate(payloads):
+            values = self._decode_values(payload, f"{prefix}[{i}]", errors)
+            if values is not None:
+                rows.append(values)
+
+        if errors:
+            raise RequestDecodeError(errors)
+
+        return np.array(rows, dtype=self.dtype)
+
+    def stack(self, records: list) -> np.ndarray:
+        """
+        Batches decoded records (as returned by `decode`) into one structured array.
+        """
+        return np.concatenate(records) if records else np.empty(0, dtype=self.dtype)
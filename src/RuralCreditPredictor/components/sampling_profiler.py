@@ -0,0 +1,200 @@
+import os
+import sys
+import json
+import hmac
+import math
+import time
+import threading
+from collections import Counter
+from datetime import datetime
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.entity.config_entity import ProfilingConfig
+
+
+# Innermost frames of threads that are blocked waiting for work rather than running anything
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("socket.py", "accept"),
+    ("queues.py", "get"),
+    ("connection.py", "_recv"),
+    ("thread.py", "_worker"),  # executor thread blocked on its (C-level) work queue
+}
+
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ProfileOptionsError(ValueError):
+    pass
+
+
+def _positive_option(options: dict, name: str, cast):
+    # Query parameters arrive as strings, JSON bodies as numbers (or anything else)
+    value = options.get(name)
+    if value is None:
+        return None
+
+    try:
+        number = None if isinstance(value, bool) else cast(value)
+    except (TypeError, ValueError, OverflowError):
+        number = None
+
+    if number is None or not math.isfinite(number) or number <= 0 or (cast is int and number != float(value)):
+        raise ProfileOptionsError(f"{name} must be a positive {'integer' if cast is int else 'number'}, "
+                                  f"got: {value!r}")
+    return number
+
+
+def _frame_label(code) -> str:
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class SamplingProfiler:
+    """
+    On-demand statistical profiler for a live serving worker.
+
+    While idle it costs nothing: no thread, no hooks, and `request_finished` is a single attribute check. Once
+    started (for a number of seconds or of requests), a background thread samples the stack of every busy thread
+    through `sys._current_frames()` every `interval_ms`, and when done writes:
+
+    - `<profile>.collapsed`: one `thread;frame;...;frame count` line per distinct stack, for flamegraph.pl or
+      speedscope
+    - `<profile>.json`: a summary attributing samples to the innermost project stage (Predictor._transform,
+      CompiledForest.apply, ...), the share spent inside sklearn, and the hottest leaf functions
+    """
+
+    def __init__(self, config: ProfilingConfig):
+        self.config = config
+        self.active = False
+        self.last_profile = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._requests_left = None
+
+    def is_authorized(self, token) -> bool:
+        """
+        Admin switch: only enabled when the token environment variable is set, and then only for that token.
+        """
+        expected = os.environ.get(self.config.token_env)
+        return bool(expected) and token is not None and hmac.compare_digest(str(token), expected)
+
+    def start(self, seconds: float = None, requests: int = None, interval_ms: float = None) -> dict:
+        """
+        Raises:
+            ProfileOptionsError: if an option is not a positive number (integer for `requests`)
+            RuntimeError: if a profile is already being recorded
+        """
+        options = {"seconds": seconds, "requests": requests, "interval_ms": interval_ms}
+        seconds = _positive_option(options, "seconds", float)
+        requests = _positive_option(options, "requests", int)
+        interval_ms = _positive_option(options, "interval_ms", float)
+
+        with self._lock:
+            if self.active:
+                raise RuntimeError("A profile is already being recorded")
+
+            seconds = min(seconds or self.config.max_seconds, self.config.max_seconds)
+            requests = min(requests, self.config.max_requests) if requests else None
+            interval = max(interval_ms or self.config.interval_ms, 1.0) / 1000
+
+            self._requests_left = requests
+            self._stop.clear()
+            self.active = True
+
+            threading.Thread(target=self._run, args=(seconds, interval), name="sampling-profiler",
+                             daemon=True).start()
+
+        logging.info(f"> Sampling profiler started for {seconds}s"
+                     f"{f' or {requests} requests' if requests else ''}, every {interval * 1000:.1f} ms")
+
+        return self.status()
+
+    def request_finished(self) -> None:
+        if not self.active:
+            return
+
+        with self._lock:
+            if self._requests_left is not None:
+                self._requests_left -= 1
+                if self._requests_left <= 0:
+                    self._stop.set()
+
+    def status(self) -> dict:
+        return {"active": self.active, "requests_left": self._requests_left, "last_profile": self.last_profile}
+
+    def _run(self, seconds: float, interval: float) -> None:
+        own_thread = threading.get_ident()
+        stacks = Counter()
+        n_samples = 0
+        started = time.monotonic()
+
+        try:
+            while not self._stop.wait(interval) and time.monotonic() - started < seconds:
+                thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_thread:
+                        continue
+
+                    code = frame.f_code
+                    if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+                        continue
+
+                    stack = []
+                    while frame is not None:
+                        stack.append(frame.f_code)
+                        frame = frame.f_back
+
+                    stacks[(thread_names.get(thread_id, str(thread_id)), tuple(reversed(stack)))] += 1
+                    n_samples += 1
+
+            self.last_profile = self._write_profile(stacks, n_samples, time.monotonic() - started, interval)
+
+        except Exception as e:
+            logging.error(f"Error in recording the profile!")
+            logging.error(str(CustomException(e, sys)))
+
+        finally:
+            self._requests_left = None
+            self.active = False
+
+    def _write_profile(self, stacks: Counter, n_samples: int, duration: float, interval: float) -> dict:
+        os.makedirs(self.config.root_dir, exist_ok=True)
+        name = f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+        collapsed_path = os.path.join(self.config.root_dir, f"{name}.collapsed")
+        summary_path = os.path.join(self.config.root_dir, f"{name}.json")
+
+        stages, leaves = Counter(), Counter()
+        sklearn_samples = 0
+
+        with open(collapsed_path, "w") as file:
+            for (thread_name, codes), count in stacks.most_common():
+                file.write(";".join([thread_name, *map(_frame_label, codes)]) + f" {count}\n")
+
+                leaves[_frame_label(codes[-1])] += count
+                if any(f"{os.sep}sklearn{os.sep}" in code.co_filename for code in codes):
+                    sklearn_samples += count
+
+                # Innermost frame of this project: the stage the time is attributed to
+                project_frames = [code for code in codes if code.co_filename.startswith(_PACKAGE_DIR)]
+                stages[_frame_label(project_frames[-1]) if project_frames else "<outside prediction code>"] += count
+
+        summary = {
+            "samples": n_samples,
+            "duration_seconds": round(duration, 3),
+            "interval_ms": interval * 1000,
+            "pid": os.getpid(),
+            "sklearn_share": round(sklearn_samples / n_samples, 4) if n_samples else 0.0,
+            "stages": {stage: count for stage, count in stages.most_common()},
+            "top_leaf_functions": {leaf: count for leaf, count in leaves.most_common(20)},
+            "collapsed_stacks": collapsed_path
+        }
+
+        with open(summary_path, "w") as file:
+            json.dump(summary, file, indent=4)
+
+        logging.info(f"Profile recorded: {n_samples} samples over {duration:.1f}s, saved at: {collapsed_path}")
+
+        return {"collapsed_stacks": collapsed_path, "summary": summary_path, "samples": n_samples}
@@ -0,0 +1,100 @@
+import sys
+import subprocess
+from src.RuralCreditPredictor.constants import PROJECT_ROOT
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.entity.config_entity import StartupBudgetConfig
+
+
+class StartupBudgetChecker:
+    """
+    Measures how long importing each serving entry point takes in a fresh interpreter (`python -X importtime`) and
+    checks it against the configured budget, and that none of the heavy packages that must load lazily (mlflow,
+    pandas, ...) is imported at startup. Meant to run in CI: exits non-zero when a budget is exceeded.
+    """
+
+    def __init__(self, config: StartupBudgetConfig):
+        self.config = config
+
+    @staticmethod
+    def _parse_importtime(stderr: str) -> list:
+        """
+        Returns (level, module, self_us, cumulative_us) for every line of `-X importtime` output, in output order
+        (a module is listed after everything it imported).
+        """
+        imports = []
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "imported package" in line:
+                continue
+
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            level = (len(name) - len(name.lstrip()) - 1) // 2
+            imports.append((level, name.strip(), int(self_us), int(cumulative_us)))
+
+        return imports
+
+    def measure(self, entry_point: str) -> dict:
+        try:
+            runs = []
+            for _ in range(self.config.repeats):
+                result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {entry_point}"],
+                                        cwd=PROJECT_ROOT, capture_output=True, text=True)
+                if result.returncode != 0:
+                    raise RuntimeError(f"Importing {entry_point} failed:\n{result.stderr[-2000:]}")
+
+                runs.append(self._parse_importtime(result.stderr))
+
+            # Best of the runs: the least disturbed by other load on the machine
+            best = min(runs, key=lambda imports: next(cumulative for level, name, _, cumulative in imports
+                                                      if level == 0 and name == entry_point))
+
+            entry_index = next(i for i, (level, name, _, _) in enumerate(best) if level == 0 and name == entry_point)
+            children = [(name, cumulative) for level, name, _, cumulative in best[:entry_index] if level == 1]
+
+            forbidden = sorted({name.split(".")[0] for _, name, _, _ in best} & set(self.config.forbidden_imports))
+
+            return {
+                "entry_point": entry_point,
+                "import_ms": best[entry_index][3] / 1000,
+                "slowest_imports": sorted(children, key=lambda child: child[1], reverse=True)[:10],
+                "forbidden_imports": forbidden
+            }
+
+        except Exception as e:
+            logging.error(f"Error in measuring the import time of {entry_point}!")
+            raise CustomException(e, sys)
+
+    def check(self) -> bool:
+        logging.info("> Checking the startup budget of the serving entry points:")
+
+        within_budget = True
+        for entry_point, budget_ms in self.config.entry_points.items():
+            result = self.measure(entry_point)
+
+            logging.info(f"{entry_point}: {result['import_ms']:.0f} ms (budget: {budget_ms} ms); slowest imports: "
+                         + ", ".join(f"{name} {cumulative / 1000:.0f} ms"
+                                     for name, cumulative in result["slowest_imports"][:5]))
+
+            if result["import_ms"] > budget_ms:
+                logging.error(f"{entry_point} takes {result['import_ms']:.0f} ms to import, over its "
+                              f"{budget_ms} ms budget!")
+                within_budget = False
+
+            if result["forbidden_imports"]:
+                logging.error(f"{entry_point} imports heavy packages at startup: "
+                              f"{', '.join(result['forbidden_imports'])}")
+                within_budget = False
+
+        if within_budget:
+            logging.info("All serving entry points are within the startup budget!")
+
+        return within_budget
+
+
+if __name__ == '__main__':
+    from src.RuralCreditPredictor.config.configuration import ConfigurationManager
+
+    config_manager = ConfigurationManager()
+    startup_budget_checker = StartupBudgetChecker(config=config_manager.get_startup_budget_config())
+    if not startup_budget_checker.check():
+        sys.exit(1)
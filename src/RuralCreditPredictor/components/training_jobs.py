@@ -0,0 +1,277 @@
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import fcntl
+import signal
+import threading
+import subprocess
+from pathlib import Path
+from datetime import datetime
+from collections import deque
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.constants import PROJECT_ROOT
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.utils.common import save_json_atomic
+from src.RuralCreditPredictor.entity.config_entity import TrainingJobsConfig
+
+
+_JOB_ID = re.compile(r"^[0-9]{8}_[0-9]{6}_[0-9a-f]{8}$")
+_DVC_STAGE = re.compile(r"^Running stage '([^']+)'")
+
+# Thread pools of the libraries the pipeline trains with (sklearn/joblib, OpenMP, BLAS)
+_THREAD_ENV_VARS = ("LOKY_MAX_CPU_COUNT", "OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+def _is_runner_alive(pid: int, job_id: str) -> bool:
+    if os.path.isdir("/proc/self"):
+        # The job id is on the runner's command line, so a reused pid is not mistaken for the runner; a runner
+        # that exited but was not reaped yet has an empty command line
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as file:
+                return job_id.encode() in file.read().split(b"\0")
+        except OSError:
+            return False
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class TrainingJobRunningError(Exception):
+    def __init__(self, job_id):
+        super().__init__(f"Training job {job_id} is already running")
+        self.job_id = job_id
+
+
+class TrainingJobManager:
+    """
+    Runs the training pipeline (`dvc repro`) as a background job instead of inside a web worker.
+
+    `submit` starts a detached runner process and returns at once. The runner takes an exclusive lock on
+    `<root_dir>/train.lock` for its whole lifetime (the kernel releases it when the process ends, so a crashed job
+    never leaves a stale lock), which rejects a second run submitted through any worker of any entry point. It
+    lowers its own priority and applies the configured CPU, memory and thread limits, which the pipeline
+    inherits, so the serving workers keep their cores. Everything about a job is written under
+    `<root_dir>/<job_id>/`: `status.json` (state, exit code, per-stage timings) and `train.log` (pipeline output),
+    and can be read back by any worker through `status`.
+    """
+
+    def __init__(self, config: TrainingJobsConfig):
+        self.config = config
+        self.lock_file = os.path.join(config.root_dir, "train.lock")
+
+    def _job_dir(self, job_id: str) -> str:
+        return os.path.join(self.config.root_dir, job_id)
+
+    def _status_path(self, job_id: str) -> str:
+        return os.path.join(self._job_dir(job_id), "status.json")
+
+    def running_job(self):
+        """
+        Id of the job currently running, None when no job is running. Read from the lock file (job id and runner
+        pid, recorded by `submit`) rather than by probing the lock: a probe holding the lock, even briefly or
+        shared, would make a submission racing with it fail with a spurious 409.
+        """
+        try:
+            with open(self.lock_file) as lock:
+                job_id, pid = lock.read().split()
+                pid = int(pid)
+        except (OSError, ValueError):
+            return None
+
+        return job_id if _is_runner_alive(pid, job_id) else None
+
+    def submit(self) -> dict:
+        try:
+            os.makedirs(self.config.root_dir, exist_ok=True)
+
+            job_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+            # Taken here and handed over to the runner, so two simultaneous submissions cannot both start
+            lock = open(self.lock_file, "a+")
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock.seek(0)
+                running = (lock.read().split() or ["unknown"])[0]
+                lock.close()
+                raise TrainingJobRunningError(running)
+
+            try:
+                os.makedirs(self._job_dir(job_id))
+                status = {"job_id": job_id, "state": "queued", "command": self.config.command,
+                          "submitted_at": datetime.now().isoformat(), "pid": None, "exit_code": None,
+                          "stages": []}
+                save_json_atomic(Path(self._status_path(job_id)), status)
+
+                # Own session: the job outlives web worker restarts and is not hit by their signals
+                process = subprocess.Popen(
+                    [sys.executable, "-m", "src.RuralCreditPredictor.components.training_jobs", "run", job_id,
+                     str(lock.fileno())],
+                    cwd=PROJECT_ROOT, pass_fds=(lock.fileno(),), start_new_session=True, stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+
+                # Recorded before the job id is returned, so every status query for the job finds it
+                lock.seek(0)
+                lock.truncate()
+                lock.write(f"{job_id} {process.pid}")
+                lock.flush()
+            finally:
+                # The runner holds its own copy of the locked descriptor from here on
+                lock.close()
+
+            # Reaps the runner when it exits, so it does not linger as a zombie of this worker
+            threading.Thread(target=process.wait, name=f"training-job-{job_id}", daemon=True).start()
+
+            logging.info(f"Training job {job_id} submitted (runner pid: {process.pid})")
+
+            return {**status, "pid": process.pid}
+
+        except TrainingJobRunningError:
+            raise
+
+        except Exception as e:
+            logging.error(f"Error in submitting the training job!")
+            raise CustomException(e, sys)
+
+    def status(self, job_id: str):
+        """
+        The job's status.json plus the last `log_tail_lines` lines of its log; None for an unknown job id.
+        """
+        if not _JOB_ID.match(job_id) or not os.path.exists(self._status_path(job_id)):
+            return None
+
+        with open(self._status_path(job_id)) as file:
+            status = json.load(file)
+
+        # A runner killed outright never writes its final state, and is no longer running either
+        if status["state"] in ("queued", "running") and self.running_job() != job_id:
+            status["state"] = "abandoned"
+
+        log_path = os.path.join(self._job_dir(job_id), "train.log")
+        if os.path.exists(log_path):
+            with open(log_path, errors="replace") as file:
+                status["log_tail"] = [line.rstrip("\n") for line in deque(file, maxlen=self.config.log_tail_lines)]
+        else:
+            status["log_tail"] = []
+
+        return status
+
+    def _apply_resource_limits(self) -> None:
+        # Runs in the runner before the pipeline starts; every process of the pipeline inherits these
+        import resource
+
+        os.nice(self.config.nice)
+
+        if self.config.cpus and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, self.config.cpus)
+
+        if self.config.max_memory_mb:
+            limit = int(self.config.max_memory_mb * 1024 ** 2)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+        if self.config.max_threads:
+            for name in _THREAD_ENV_VARS:
+                os.environ[name] = str(self.config.max_threads)
+
+    def run(self, job_id: str, lock_fd: int = None) -> int:
+        """
+        Runner process body: runs the pipeline under the resource limits, streaming its output to the job log
+        and recording when each DVC stage starts and how long it takes. The pipeline shares the lock, so a runner
+        killed mid-run does not free it while the pipeline is still running. It also runs in its own process group:
+        dvc does not hand the lock to the stage commands it starts, so on timeout the whole group is killed, those
+        commands included, instead of leaving them training without the lock.
+        """
+        status_path = Path(self._status_path(job_id))
+        with open(status_path) as file:
+            status = json.load(file)
+
+        started = time.monotonic()
+        status.update(state="running", pid=os.getpid(), started_at=datetime.now().isoformat())
+        save_json_atomic(status_path, status)
+
+        def finish_stage():
+            if status["stages"] and status["stages"][-1]["duration_seconds"] is None:
+                stage = status["stages"][-1]
+                stage["duration_seconds"] = round(time.monotonic() - started - stage["offset_seconds"], 2)
+
+        try:
+            self._apply_resource_limits()
+
+            with open(os.path.join(self._job_dir(job_id), "train.log"), "w") as log:
+                pipeline = subprocess.Popen(self.config.command, cwd=PROJECT_ROOT, stdout=subprocess.PIPE,
+                                            stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL, text=True,
+                                            errors="replace", bufsize=1, start_new_session=True,
+                                            pass_fds=(lock_fd,) if lock_fd is not None else ())
+
+                timed_out = threading.Event()
+
+                def kill_group():
+                    try:
+                        os.killpg(pipeline.pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+
+                def kill_on_timeout():
+                    timed_out.set()
+                    kill_group()
+
+                timer = threading.Timer(self.config.timeout_seconds, kill_on_timeout) \
+                    if self.config.timeout_seconds else None
+                if timer is not None:
+                    timer.start()
+
+                for line in pipeline.stdout:
+                    log.write(line)
+                    log.flush()
+
+                    stage = _DVC_STAGE.match(line)
+                    if stage:
+                        finish_stage()
+                        status["stages"].append({"stage": stage.group(1),
+                                                 "offset_seconds": round(time.monotonic() - started, 2),
+                                                 "duration_seconds": None})
+                        save_json_atomic(status_path, status)
+
+                exit_code = pipeline.wait()
+                if timer is not None:
+                    timer.cancel()
+
+                # Nothing the pipeline started may outlive the runner, which releases the lock when it exits
+                kill_group()
+
+            finish_stage()
+            status.update(state="succeeded" if exit_code == 0 else "timed_out" if timed_out.is_set() else "failed",
+                          exit_code=exit_code)
+
+        except Exception as e:
+            status.update(state="failed", error=str(e))
+            exit_code = 1
+
+        status.update(finished_at=datetime.now().isoformat(),
+                      duration_seconds=round(time.monotonic() - started, 2))
+        save_json_atomic(status_path, status)
+
+        return exit_code
+
+
+if __name__ == '__main__':
+    from src.RuralCreditPredictor.config.configuration import ConfigurationManager
+
+    # Runner mode, started by TrainingJobManager.submit: `run <job_id> <locked fd>`
+    _, mode, run_job_id, lock_fd = sys.argv
+    if mode != "run":
+        sys.exit(f"Unknown mode: {mode}")
+
+    manager = TrainingJobManager(config=ConfigurationManager().get_training_jobs_config(log=False))
+
+    with open(int(lock_fd)) as lock:
+        sys.exit(manager.run(run_job_id, lock_fd=lock.fileno()))
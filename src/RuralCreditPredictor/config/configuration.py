@@ -1,3 +1,4 @@
+import os
 import sys
 from src.RuralCreditPredictor.constants import *
 from src.RuralCreditPredictor.logger import logging
@@ -6,9 +7,20 @@ from src.RuralCreditPredictor.entity.config_entity import (DataIngestionConfig,
                                                            DataValidationConfig,
                                                            DataPreprocessingConfig,
                                                            DataTransformationConfig,
+                                                           DataLoadingConfig,
                                                            ModelTrainingConfig,
                                                            ModelEvaluationConfig,
-                                                           PredictionConfig)
+                                                           ModelDistillationConfig,
+                                                           ModelCompactionConfig,
+                                                           ModelExportConfig,
+                                                           PredictionConfig,
+                                                           InferenceParallelismConfig,
+                                                           BulkPredictionConfig,
+                                                           ServingConfig,
+                                                           LoadTestConfig,
+                                                           TrainingJobsConfig,
+                                                           ProfilingConfig,
+                                                           StartupBudgetConfig)
 from src.RuralCreditPredictor.utils.common import read_yaml, create_directories
 
 
@@ -33,6 +45,8 @@ class ConfigurationManager:
                 logging.info("Getting data ingestion configuration:")
 
             config = self.config.data_ingestion
+            data_loading = self.config.data_loading
+            raw_schema = self.raw_schema.independent_variables
 
             create_directories([config.root_dir])
 
@@ -41,7 +55,11 @@ class ConfigurationManager:
                 source_URL=config.source_URL,
                 data_file=config.data_file,
                 unzip_dir=config.unzip_dir,
-                raw_file=config.raw_file
+                raw_file=config.raw_file,
+                raw_table=config.raw_table,
+                raw_schema=raw_schema,
+                categoricals=data_loading.categoricals,
+                downcast_integers=data_loading.downcast_integers
             )
 
             if log:
@@ -87,6 +105,8 @@ class ConfigurationManager:
                 logging.info("Getting data preprocessing configuration:")
 
             config = self.config.data_preprocessing
+            data_loading = self.config.data_loading
+            raw_schema = self.raw_schema.independent_variables
             cat_features = self.processed_schema.cat_features
             discrete_num_features = self.processed_schema.discrete_num_features
             continuous_num_features = self.processed_schema.continuous_num_features
@@ -103,7 +123,11 @@ class ConfigurationManager:
                 discrete_num_features=discrete_num_features,
                 continuous_num_features=continuous_num_features,
                 selected_features=selected_features,
-                target_variable=target_variable
+                target_variable=target_variable,
+                raw_schema=raw_schema,
+                chunk_size=config.chunk_size,
+                categoricals=data_loading.categoricals,
+                downcast_integers=data_loading.downcast_integers
             )
 
             if log:
@@ -122,6 +146,7 @@ class ConfigurationManager:
                 logging.info("Getting data transformation configuration:")
 
             config = self.config.data_transformation
+            data_loading = self.config.data_loading
             cat_features = self.processed_schema.cat_features
             discrete_num_features = self.processed_schema.discrete_num_features
             continuous_num_features = self.processed_schema.continuous_num_features
@@ -138,7 +163,9 @@ class ConfigurationManager:
                 continuous_num_features=continuous_num_features,
                 selected_features=selected_features,
                 target_variable=target_variable,
-                data_transformer=config.data_transformer
+                data_transformer=config.data_transformer,
+                categoricals=data_loading.categoricals,
+                downcast_integers=data_loading.downcast_integers
             )
 
             if log:
@@ -151,6 +178,32 @@ class ConfigurationManager:
                 logging.error(f"Error occurred while getting data transformation configuration!")
             raise CustomException(e, sys)
 
+    def get_data_loading_config(self, log=True) -> DataLoadingConfig:
+        try:
+            if log:
+                logging.info("Getting data loading configuration:")
+
+            config = self.config.data_loading
+
+            create_directories([config.root_dir])
+
+            data_loading_config = DataLoadingConfig(
+                root_dir=config.root_dir,
+                memory_report=config.memory_report,
+                categoricals=config.categoricals,
+                downcast_integers=config.downcast_integers
+            )
+
+            if log:
+                logging.info("Data loading configuration loaded successfully!")
+
+            return data_loading_config
+
+        except Exception as e:
+            if log:
+                logging.error(f"Error occurred while getting data loading configuration!")
+            raise CustomException(e, sys)
+
     def get_model_training_config(self, log=True) -> ModelTrainingConfig:
         try:
             if log:
@@ -192,7 +245,11 @@ class ConfigurationManager:
                 latest_run_id=config.latest_run_id,
                 experiment_name=config.experiment_name,
                 train_metrics=config.train_metrics,
-                test_metrics=config.test_metrics
+                test_metrics=config.test_metrics,
+                model_index=config.model_index,
+                benchmark_single_rows=config.benchmark_single_rows,
+                benchmark_batch_size=config.benchmark_batch_size,
+                benchmark_batch_repeats=config.benchmark_batch_repeats
             )
 
             if log:
@@ -205,6 +262,92 @@ class ConfigurationManager:
                 logging.error(f"Error occurred while getting model evaluation configuration!")
             raise CustomException(e, sys)
 
+    def get_model_distillation_config(self, log=True) -> ModelDistillationConfig:
+        try:
+            if log:
+                logging.info("Getting model distillation configuration:")
+
+            config = self.config.model_distillation
+            surrogate_params = self.params.SurrogateModel
+
+            create_directories([config.root_dir])
+
+            model_distillation_config = ModelDistillationConfig(
+                root_dir=config.root_dir,
+                surrogate_versions=config.surrogate_versions,
+                keep_versions=config.keep_versions,
+                report=config.report,
+                fast_tier=config.fast_tier,
+                max_mape_gap=config.max_mape_gap,
+                latency_rows=config.latency_rows,
+                candidates=[dict(candidate) for candidate in surrogate_params.candidates],
+                random_state=surrogate_params.random_state
+            )
+
+            if log:
+                logging.info("Model distillation configuration loaded successfully!")
+
+            return model_distillation_config
+
+        except Exception as e:
+            if log:
+                logging.error(f"Error occurred while getting model distillation configuration!")
+            raise CustomException(e, sys)
+
+    def get_model_compaction_config(self, log=True) -> ModelCompactionConfig:
+        try:
+            if log:
+                logging.info("Getting model compaction configuration:")
+
+            config = self.config.model_compaction
+
+            create_directories([config.root_dir])
+
+            model_compaction_config = ModelCompactionConfig(
+                root_dir=config.root_dir,
+                compact_forest=config.compact_forest,
+                report=config.report,
+                tolerance=config.tolerance,
+                latency_rows=config.latency_rows
+            )
+
+            if log:
+                logging.info("Model compaction configuration loaded successfully!")
+
+            return model_compaction_config
+
+        except Exception as e:
+            if log:
+                logging.error(f"Error occurred while getting model compaction configuration!")
+            raise CustomException(e, sys)
+
+    def get_model_export_config(self, log=True) -> ModelExportConfig:
+        try:
+            if log:
+                logging.info("Getting model export configuration:")
+
+            config = self.config.model_export
+
+            create_directories([config.root_dir, os.path.join(config.root_dir, "versions")])
+
+            model_export_config = ModelExportConfig(
+                root_dir=config.root_dir,
+                current_pointer=config.current_pointer,
+                keep_versions=config.keep_versions,
+                compact=config.compact,
+                compaction_tolerance=self.config.model_compaction.tolerance
+            )
+
+            if log:
+                logging.info("Model export configuration loaded successfully!")
+
+            return model_export_config
+
+        except Exception as e:
+            if log:
+                logging.error(f"Error occurred while getting model export configuration!")
+            raise CustomException(e, sys)
+
     def get_prediction_config(self, log=True) -> PredictionConfig:
         try:
             if log:
@@ -212,10 +355,27 @@ class ConfigurationManager:
 
             config = self.config.prediction
 
+            # Selection divides by the budgets to rank the runs over them
+            for budget in ("max_p99_ms", "max_batch_p99_ms", "max_size_mb"):
+                value = config.get(budget)
+                if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))
+                                          or not value > 0):
+                    raise ValueError(f"prediction.{budget} must be a positive number or null, got: {value!r}")
+
             prediction_config = PredictionConfig(
                 latest_run_id=config.latest_run_id,
                 experiment_name=config.experiment_name,
-                data_transformer=config.data_transformer
+                data_transformer=config.data_transformer,
+                model_index=config.model_index,
+                selection_metric=config.selection_metric,
+                max_p99_ms=config.max_p99_ms,
+                max_batch_p99_ms=config.max_batch_p99_ms,
+                max_size_mb=config.max_size_mb,
+                compiled_forest=config.compiled_forest,
+                compiled_encoder=config.compiled_encoder,
+                shared_model=config.shared_model,
+                shared_model_pointer=config.shared_model_pointer,
+                fast_tier=config.fast_tier
             )
 
             if log:
@@ -227,3 +387,202 @@ class ConfigurationManager:
             if log:
                 logging.error(f"Error occurred while getting prediction configuration!")
             raise CustomException(e, sys)
+
+    def get_inference_parallelism_config(self, log=True) -> InferenceParallelismConfig:
+        try:
+            if log:
+                logging.info("Getting inference parallelism configuration:")
+
+            config = self.config.inference_parallelism
+
+            inference_parallelism_config = InferenceParallelismConfig(
+                parallel_threshold=config.parallel_threshold,
+                cores_per_worker=config.cores_per_worker,
+                web_workers=config.web_workers,
+                calibration_file=config.calibration_file,
+                min_speedup=config.min_speedup
+            )
+
+            if log:
+                logging.info("Inference parallelism configuration loaded successfully!")
+
+            return inference_parallelism_config
+
+        except Exception as e:
+            if log:
+                logging.error(f"Error occurred while getting inference parallelism configuration!")
+            raise CustomException(e, sys)
+
+    def get_bulk_prediction_config(self, log=True) -> BulkPredictionConfig:
+        try:
+            if log:
+                logging.info("Getting bulk prediction configuration:")
+
+            config = self.config.bulk_prediction
+
+            create_directories([config.root_dir])
+
+            bulk_prediction_config = BulkPredictionConfig(
+                root_dir=config.root_dir,
+                chunk_size=config.chunk_size,
+                n_workers=config.n_workers,
+                max_pending_chunks=config.max_pending_chunks,
+                prediction_column=config.prediction_column
+            )
+
+            if log:
+                logging.info("Bulk prediction configuration loaded successfully!")
+
+            return bulk_prediction_config
+
+        except Exception as e:
+            if log:
+                logging.error(f"Error occurred while getting bulk prediction configuration!")
+            raise CustomException(e, sys)
+
+    def get_serving_config(self, log=True) -> ServingConfig:
+        try:
+            if log:
+                logging.info("Getting serving configuration:")
+
+            config = self.config.serving
+
+            serving_config = ServingConfig(
+                max_batch_size=config.max_batch_size,
+                coalescer_enabled=config.coalescer.enabled,
+                coalescer_max_batch_size=config.coalescer.max_batch_size,
+                coalescer_max_window_ms=config.coalescer.max_window_ms,
+                prediction_cache_enabled=config.prediction_cache.enabled,
+                prediction_cache_max_size=config.prediction_cache.max_size,
+                prediction_cache_ttl_seconds=config.prediction_cache.ttl_seconds,
+                executor_workers=config.executor_workers,
+                admission_enabled=config.admission.enabled,
+                admission_max_concurrency=config.admission.max_concurrency or config.executor_workers,
+                admission_max_queue=config.admission.max_queue,
+                deadline_ms=config.admission.deadline_ms
+            )
+
+            if log:
+                logging.info("Serving configuration loaded successfully!")
+
+            return serving_config
+
+        except Exception as e:
+            if log:
+                logging.error(f"Error occurred while getting serving configuration!")
+            raise CustomException(e, sys)
+
+    def get_load_test_config(self, log=True) -> LoadTestConfig:
+        try:
+            if log:
+                logging.info("Getting load test configuration:")
+
+            config = self.config.load_test
+
+            create_directories([config.root_dir])
+
+            load_test_config = LoadTestConfig(
+                root_dir=config.root_dir,
+                base_url=config.base_url,
+                route=config.route,
+                batch_size=config.batch_size,
+                rate=config.rate,
+                concurrency=config.concurrency,
+                duration_seconds=config.duration_seconds,
+                max_requests=config.max_requests,
+                timeout_seconds=config.timeout_seconds,
+                payload_file=config.payload_file,
+                n_payloads=config.n_payloads,
+                report_interval_seconds=config.report_interval_seconds,
+                rss_interval_seconds=config.rss_interval_seconds,
+                warmup_seconds=config.warmup_seconds,
+                max_rss_growth_mb=config.max_rss_growth_mb
+            )
+
+            if log:
+                logging.info("Load test configuration loaded successfully!")
+
+            return load_test_config
+
+        except Exception as e:
+            if log:
+                logging.error(f"Error occurred while getting load test configuration!")
+            raise CustomException(e, sys)
+
+    def get_training_jobs_config(self, log=True) -> TrainingJobsConfig:
+        try:
+            if log:
+                logging.info("Getting training jobs configuration:")
+
+            config = self.config.training_jobs
+
+            create_directories([config.root_dir])
+
+            training_jobs_config = TrainingJobsConfig(
+                root_dir=config.root_dir,
+                command=list(config.command),
+                timeout_seconds=config.timeout_seconds,
+                nice=config.nice,
+                cpus=list(config.cpus) if config.cpus else None,
+                max_threads=config.max_threads,
+                max_memory_mb=config.max_memory_mb,
+                log_tail_lines=config.log_tail_lines
+            )
+
+            if log:
+                logging.info("Training jobs configuration loaded successfully!")
+
+            return training_jobs_config
+
+        except Exception as e:
+            if log:
+                logging.error(f"Error occurred while getting training jobs configuration!")
+            raise CustomException(e, sys)
+
+    def get_profiling_config(self, log=True) -> ProfilingConfig:
+        try:
+            if log:
+                logging.info("Getting profiling configuration:")
+
+            config = self.config.profiling
+
+            profiling_config = ProfilingConfig(
+                root_dir=config.root_dir,
+                token_env=config.token_env,
+                interval_ms=config.interval_ms,
+                max_seconds=config.max_seconds,
+                max_requests=config.max_requests
+            )
+
+            if log:
+                logging.info("Profiling configuration loaded successfully!")
+
+            return profiling_config
+
+        except Exception as e:
+            if log:
+                logging.error(f"Error occurred while getting profiling configuration!")
+            raise CustomException(e, sys)
+
+    def get_startup_budget_config(self, log=True) -> StartupBudgetConfig:
+        try:
+            if log:
+                logging.info("Getting startup budget configuration:")
+
+            config = self.config.startup_budget
+
+            startup_budget_config = StartupBudgetConfig(
+                entry_points=dict(config.entry_points),
+                repeats=config.repeats,
+                forbidden_imports=list(config.forbidden_imports)
+            )
+
+            if log:
+                logging.info("Startup budget configuration loaded successfully!")
+
+            return startup_budget_config
+
+        except Exception as e:
+            if log:
+                logging.error(f"Error occurred while getting startup budget configuration!")
+            raise CustomException(e, sys)
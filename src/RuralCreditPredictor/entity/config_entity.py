@@ -9,6 +9,10 @@ class DataIngestionConfig:
     data_file: Path
     unzip_dir: Path
     raw_file: Path
+    raw_table: Path
+    raw_schema: dict
+    categoricals: bool
+    downcast_integers: bool
 
 
 @dataclass(frozen=True)
@@ -29,6 +33,10 @@ class DataPreprocessingConfig:
     continuous_num_features: list
     selected_features: list
     target_variable: str
+    raw_schema: dict
+    chunk_size: int
+    categoricals: bool
+    downcast_integers: bool
 
 
 @dataclass(frozen=True)
@@ -41,6 +49,16 @@ class DataTransformationConfig:
     selected_features: list
     target_variable: str
     data_transformer: Path
+    categoricals: bool
+    downcast_integers: bool
+
+
+@dataclass(frozen=True)
+class DataLoadingConfig:
+    root_dir: Path
+    memory_report: Path
+    categoricals: bool
+    downcast_integers: bool
 
 
 @dataclass(frozen=True)
@@ -58,6 +76,41 @@ class ModelEvaluationConfig:
     experiment_name: str
     train_metrics: Path
     test_metrics: Path
+    model_index: Path
+    benchmark_single_rows: int
+    benchmark_batch_size: int
+    benchmark_batch_repeats: int
+
+
+@dataclass(frozen=True)
+class ModelDistillationConfig:
+    root_dir: Path
+    surrogate_versions: Path
+    keep_versions: int
+    report: Path
+    fast_tier: Path
+    max_mape_gap: float
+    latency_rows: int
+    candidates: list
+    random_state: int
+
+
+@dataclass(frozen=True)
+class ModelCompactionConfig:
+    root_dir: Path
+    compact_forest: Path
+    report: Path
+    tolerance: float
+    latency_rows: int
+
+
+@dataclass(frozen=True)
+class ModelExportConfig:
+    root_dir: Path
+    current_pointer: Path
+    keep_versions: int
+    compact: bool
+    compaction_tolerance: float
 
 
 @dataclass(frozen=True)
@@ -65,3 +118,94 @@ class PredictionConfig:
     latest_run_id: Path
     experiment_name: str
     data_transformer: Path
+    model_index: Path
+    selection_metric: str
+    max_p99_ms: float
+    max_batch_p99_ms: float
+    max_size_mb: float
+    compiled_forest: bool
+    compiled_encoder: bool
+    shared_model: bool
+    shared_model_pointer: Path
+    fast_tier: Path
+
+
+@dataclass(frozen=True)
+class InferenceParallelismConfig:
+    parallel_threshold: int
+    cores_per_worker: int
+    web_workers: int
+    calibration_file: Path
+    min_speedup: float
+
+
+@dataclass(frozen=True)
+class BulkPredictionConfig:
+    root_dir: Path
+    chunk_size: int
+    n_workers: int
+    max_pending_chunks: int
+    prediction_column: str
+
+
+@dataclass(frozen=True)
+class ServingConfig:
+    max_batch_size: int
+    coalescer_enabled: bool
+    coalescer_max_batch_size: int
+    coalescer_max_window_ms: float
+    prediction_cache_enabled: bool
+    prediction_cache_max_size: int
+    prediction_cache_ttl_seconds: float
+    executor_workers: int
+    admission_enabled: bool
+    admission_max_concurrency: int
+    admission_max_queue: int
+    deadline_ms: float
+
+
+@dataclass(frozen=True)
+class LoadTestConfig:
+    root_dir: Path
+    base_url: str
+    route: str
+    batch_size: int
+    rate: float
+    concurrency: int
+    duration_seconds: float
+    max_requests: int
+    timeout_seconds: float
+    payload_file: Path
+    n_payloads: int
+    report_interval_seconds: float
+    rss_interval_seconds: float
+    warmup_seconds: float
+    max_rss_growth_mb: float
+
+
+@dataclass(frozen=True)
+class TrainingJobsConfig:
+    root_dir: Path
+    command: list
+    timeout_seconds: float
+    nice: int
+    cpus: list
+    max_threads: int
+    max_memory_mb: float
+    log_tail_lines: int
+
+
+@dataclass(frozen=True)
+class ProfilingConfig:
+    root_dir: Path
+    token_env: str
+    interval_ms: float
+    max_seconds: float
+    max_requests: int
+
+
+@dataclass(frozen=True)
+class StartupBudgetConfig:
+    entry_points: dict
+    repeats: int
+    forbidden_imports: list
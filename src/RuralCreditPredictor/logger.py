@@ -1,31 +1,176 @@
 import os
+import sys
+import queue
+import atexit
+import random
 import logging
+import logging.handlers
 from datetime import datetime
-from src.RuralCreditPredictor.constants import PROJECT_ROOT
+from src.RuralCreditPredictor.constants import PROJECT_ROOT, CONFIG_FILE_PATH
 
 
-LOG_FILE = f"{datetime.now().strftime('%Y_%m_%d_%H_%M_%S')}.log"
+# Defaults, overridden by the `logging` section of config/config.yaml
+LOGGING_CONFIG = {
+    "mode": "queue",  # "queue": a background thread writes the records; "sync": the calling thread does
+    "level": "INFO",
+    "rotate": True,  # one size-rotated file per process instead of one timestamped file per run
+    "max_bytes": 10 * 1024 ** 2,
+    "backup_count": 5,
+    "queue_size": 10000,
+    "component_levels": {},
+    "sample_rates": {}
+}
+
 logs_path = os.path.join(PROJECT_ROOT, "logs")
 os.makedirs(logs_path, exist_ok=True)
 
-LOG_FILE_PATH = os.path.join(logs_path, LOG_FILE)
-
 # Create formatter
 formatter = logging.Formatter("[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s")
 
-# Create file handler
-file_handler = logging.FileHandler(LOG_FILE_PATH)
-file_handler.setFormatter(formatter)
 
-# Create stream handler
-stream_handler = logging.StreamHandler()
-stream_handler.setFormatter(formatter)
+def _load_logging_config() -> dict:
+    # Read directly: utils.common and the ConfigurationManager both log, so they cannot be used here
+    import yaml
+
+    config = dict(LOGGING_CONFIG)
+    try:
+        with open(os.path.join(PROJECT_ROOT, CONFIG_FILE_PATH)) as file:
+            config.update((yaml.safe_load(file) or {}).get("logging") or {})
+    except OSError:
+        pass
+
+    return config
+
+
+def _get_log_file_path(config: dict) -> str:
+    if not config["rotate"]:
+        return os.path.join(logs_path, f"{datetime.now().strftime('%Y_%m_%d_%H_%M_%S')}.log")
+
+    # Rotating handlers must not share a file across processes: one file per process, named after its entry point
+    process_name = os.path.splitext(os.path.basename(sys.argv[0]))[0] or "python"
+    return os.path.join(logs_path, f"{process_name}_{os.getpid()}.log")
+
+
+def _level_number(level, setting: str) -> int:
+    # getLevelName maps an unknown name to the string "Level <name>" instead of failing
+    number = level if isinstance(level, int) and not isinstance(level, bool) \
+        else logging.getLevelName(str(level).upper())
+    if not isinstance(number, int):
+        levels = (logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR, logging.CRITICAL)
+        raise ValueError(f"Unknown log level {level!r} for {setting}, expected one of: "
+                         f"{', '.join(map(logging.getLevelName, levels))}")
+    return number
+
+
+class ComponentFilter(logging.Filter):
+    """
+    Per-component level gating and sampling. Components log through the root logger, so they are told apart by
+    the module the record comes from (e.g. `prediction`, `app`). Records below a component's level are dropped;
+    records below WARNING are additionally kept with the component's sample rate. Warnings and errors are never
+    sampled.
+    """
+
+    def __init__(self, component_levels: dict, sample_rates: dict):
+        super().__init__()
+        self.component_levels = {component: _level_number(level, f"logging.component_levels.{component}")
+                                 for component, level in component_levels.items()}
+        self.sample_rates = dict(sample_rates)
+
+    def filter(self, record) -> bool:
+        if record.levelno < self.component_levels.get(record.module, logging.NOTSET):
+            return False
+
+        if record.levelno < logging.WARNING and record.module in self.sample_rates:
+            return random.random() < self.sample_rates[record.module]
+
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never blocks the caller: when the writer thread falls behind and the queue is full, the
+    record is dropped and counted instead.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener = None
+
+
+def _stop_listener() -> None:
+    # Flushes the records still queued at exit
+    if _listener is not None:
+        _listener.stop()
+
+
+def configure_logging() -> None:
+    """
+    (Re)builds the root logger handlers from the logging config. Also runs in forked children (pre-forked web
+    workers, process pools): the writer thread does not survive a fork and each process gets its own log file.
+    """
+    global _listener, LOG_FILE_PATH
+
+    config = _load_logging_config()
+    LOG_FILE_PATH = _get_log_file_path(config)
+
+    # Create file handler; the file is only created on the first record, not at import time
+    if config["rotate"]:
+        file_handler = logging.handlers.RotatingFileHandler(LOG_FILE_PATH, maxBytes=config["max_bytes"],
+                                                            backupCount=config["backup_count"], delay=True)
+    else:
+        file_handler = logging.FileHandler(LOG_FILE_PATH, delay=True)
+    file_handler.setFormatter(formatter)
+
+    # Create stream handler
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    # Get root logger
+    logger = logging.getLogger()
+    logger.setLevel(config["level"])
+
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    for log_filter in list(logger.filters):
+        logger.removeFilter(log_filter)
+
+    # Gate on the logger itself, so dropped records are never queued or formatted
+    logger.addFilter(ComponentFilter(config["component_levels"], config["sample_rates"]))
+
+    if config["mode"] == "queue":
+        log_queue = queue.Queue(maxsize=config["queue_size"])
+        logger.addHandler(DroppingQueueHandler(log_queue))
+
+        _listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler,
+                                                   respect_handler_level=True)
+        _listener.start()
+    else:
+        _listener = None
+        logger.addHandler(file_handler)
+        logger.addHandler(stream_handler)
+
+
+def _configure_logging_after_fork() -> None:
+    configure_logging()
+
+    # multiprocessing children leave through os._exit, skipping atexit: flush through its own exit hook instead
+    if "multiprocessing" in sys.modules:
+        from multiprocessing import util
+        util.Finalize(None, _stop_listener, exitpriority=0)
+
 
-# Get root logger
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
-logger.addHandler(file_handler)
-logger.addHandler(stream_handler)
+configure_logging()
+atexit.register(_stop_listener)
+os.register_at_fork(after_in_child=_configure_logging_after_fork)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,47 @@
+import sys
+import argparse
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.config.configuration import ConfigurationManager
+from src.RuralCreditPredictor.components.bulk_scoring import BulkScorer
+
+
+STAGE_NAME = "Bulk Prediction"
+
+
+class BulkPredictionPipeline:
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def main(input_file, output_file, n_workers=None):
+        config = ConfigurationManager()
+        bulk_prediction_config = config.get_bulk_prediction_config()
+        prediction_config = config.get_prediction_config()
+        selected_features = list(config.processed_schema.selected_features.keys())
+
+        bulk_scorer = BulkScorer(config=bulk_prediction_config,
+                                 prediction_config=prediction_config,
+                                 selected_features=selected_features)
+
+        return bulk_scorer.score_file(input_file, output_file, n_workers=n_workers)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Score a CSV/Parquet file of applicants in parallel chunks.")
+    parser.add_argument("--input", required=True, help="CSV or Parquet file of applicants")
+    parser.add_argument("--output", required=True, help="CSV or Parquet file to write predictions to")
+    parser.add_argument("--workers", type=int, default=None, help="Scoring processes (default: config/CPU count)")
+    args = parser.parse_args()
+
+    try:
+        logging.info(f">>>>>> stage '{STAGE_NAME}' started <<<<<<")
+
+        bulk_predictor = BulkPredictionPipeline()
+        bulk_predictor.main(args.input, args.output, n_workers=args.workers)
+
+        logging.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<")
+
+    except Exception as e:
+        logging.error(f"Error occurred while running {STAGE_NAME}!")
+        raise CustomException(e, sys)
@@ -20,6 +20,7 @@ class DataIngestionPipeline:
         data_ingestion = DataIngestion(config=data_ingestion_config)
         data_ingestion.download_file()
         data_ingestion.unzip_file()
+        data_ingestion.convert_raw_file()
 
 
 if __name__ == '__main__':
@@ -17,11 +17,14 @@ class DataPreprocessingPipeline:
         config = ConfigurationManager()
         data_preprocessing_config = config.get_data_preprocessing_config()
         data_preprocessing = DataPreprocessing(config=data_preprocessing_config)
-        data_preprocessing.impute_missing_values()
-        data_preprocessing.drop_under_and_above_age()
-        data_preprocessing.drop_outliers()
-        data_preprocessing.get_preprocessed_data()
-        data_preprocessing.save_preprocessed_data()
+        if data_preprocessing_config.chunk_size:
+            data_preprocessing.preprocess_in_chunks()
+        else:
+            data_preprocessing.impute_missing_values()
+            data_preprocessing.drop_under_and_above_age()
+            data_preprocessing.drop_outliers()
+            data_preprocessing.get_preprocessed_data()
+            data_preprocessing.save_preprocessed_data()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,56 @@
+import sys
+import argparse
+import dataclasses
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.config.configuration import ConfigurationManager
+from src.RuralCreditPredictor.components.load_test import LoadTester
+
+
+STAGE_NAME = "Load Test"
+
+
+class LoadTestPipeline:
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def main(soak=False, **overrides):
+        config = ConfigurationManager()
+        load_test_config = config.get_load_test_config()
+        load_test_config = dataclasses.replace(
+            load_test_config, **{name: value for name, value in overrides.items() if value is not None}
+        )
+
+        load_tester = LoadTester(config=load_test_config,
+                                 selected_features=list(config.processed_schema.selected_features.keys()),
+                                 processed_file=config.get_data_transformer_config(log=False).preprocessed_file)
+
+        return load_tester.run(soak=soak)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Drive load against a running prediction API (app.py/asgi.py).")
+    parser.add_argument("--url", dest="base_url", help="Base URL of the API (default: config)")
+    parser.add_argument("--route", choices=["/predict", "/predict/batch"], help="Route to load")
+    parser.add_argument("--batch-size", dest="batch_size", type=int, help="Applicants per /predict/batch request")
+    parser.add_argument("--rate", type=float, help="Target requests/s (open loop); omit for closed loop")
+    parser.add_argument("--concurrency", type=int, help="Generator threads")
+    parser.add_argument("--duration", dest="duration_seconds", type=float,
+                        help="Run time in seconds (a soak test with --requests runs until they are all sent)")
+    parser.add_argument("--requests", dest="max_requests", type=int, help="Stop after this many requests")
+    parser.add_argument("--payloads", dest="payload_file", help="JSONL/CSV/Parquet of recorded applicants")
+    parser.add_argument("--soak", action="store_true", help="Track worker RSS growth from /metrics")
+    args = parser.parse_args()
+
+    try:
+        logging.info(f">>>>>> stage '{STAGE_NAME}' started <<<<<<")
+
+        load_tester = LoadTestPipeline()
+        load_tester.main(**vars(args))
+
+        logging.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<")
+
+    except Exception as e:
+        logging.error(f"Error occurred while running {STAGE_NAME}!")
+        raise CustomException(e, sys)
@@ -0,0 +1,36 @@
+import sys
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.config.configuration import ConfigurationManager
+from src.RuralCreditPredictor.components.prediction import Predictor
+from src.RuralCreditPredictor.components.model_compaction import ModelCompactor
+
+
+STAGE_NAME = "Model Compaction"
+
+
+class ModelCompactionPipeline:
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def main():
+        config = ConfigurationManager()
+        model_compaction_config = config.get_model_compaction_config()
+        predictor = Predictor(config=config.get_prediction_config())
+        model_compactor = ModelCompactor(config=model_compaction_config, predictor=predictor)
+        model_compactor.compact_model()
+
+
+if __name__ == '__main__':
+    try:
+        logging.info(f">>>>>> stage '{STAGE_NAME}' started <<<<<<")
+
+        model_compaction = ModelCompactionPipeline()
+        model_compaction.main()
+
+        logging.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<")
+
+    except Exception as e:
+        logging.error(f"Error occurred while running {STAGE_NAME}!")
+        raise CustomException(e, sys)
@@ -0,0 +1,36 @@
+import sys
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.config.configuration import ConfigurationManager
+from src.RuralCreditPredictor.components.prediction import Predictor
+from src.RuralCreditPredictor.components.model_distillation import ModelDistiller
+
+
+STAGE_NAME = "Model Distillation"
+
+
+class ModelDistillationPipeline:
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def main():
+        config = ConfigurationManager()
+        model_distillation_config = config.get_model_distillation_config()
+        predictor = Predictor(config=config.get_prediction_config())
+        model_distiller = ModelDistiller(config=model_distillation_config, predictor=predictor)
+        model_distiller.distill_model()
+
+
+if __name__ == '__main__':
+    try:
+        logging.info(f">>>>>> stage '{STAGE_NAME}' started <<<<<<")
+
+        model_distillation = ModelDistillationPipeline()
+        model_distillation.main()
+
+        logging.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<")
+
+    except Exception as e:
+        logging.error(f"Error occurred while running {STAGE_NAME}!")
+        raise CustomException(e, sys)
@@ -0,0 +1,36 @@
+import sys
+from src.RuralCreditPredictor.logger import logging
+from src.RuralCreditPredictor.exception import CustomException
+from src.RuralCreditPredictor.config.configuration import ConfigurationManager
+from src.RuralCreditPredictor.components.prediction import Predictor
+from src.RuralCreditPredictor.components.model_export import ModelExporter
+
+
+STAGE_NAME = "Model Export"
+
+
+class ModelExportPipeline:
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def main():
+        config = ConfigurationManager()
+        model_export_config = config.get_model_export_config()
+        predictor = Predictor(config=config.get_prediction_config())
+        model_exporter = ModelExporter(config=model_export_config, predictor=predictor)
+        model_exporter.export_model()
+
+
+if __name__ == '__main__':
+    try:
+        logging.info(f">>>>>> stage '{STAGE_NAME}' started <<<<<<")
+
+        model_export = ModelExportPipeline()
+        model_export.main()
+
+        logging.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<")
+
+    except Exception as e:
+        logging.error(f"Error occurred while running {STAGE_NAME}!")
+        raise CustomException(e, sys)
@@ -2,8 +2,8 @@ import os
 import sys
 import json
 import yaml
-import joblib
 from typing import Any
+from contextlib import contextmanager
 from pathlib import Path
 from box import ConfigBox
 from ensure import ensure_annotations
@@ -97,6 +97,36 @@ def save_json(path: Path, data: dict):
         raise CustomException(e, sys)
 
 
+@ensure_annotations
+def save_json_atomic(path: Path, data: dict):
+    """
+    Saves json data atomically: readers see either the previous or the new file, never a partial write
+
+    Args:
+        path (Path): path to json file
+        data (dict): data to be saved in json file
+
+    Returns:
+        None
+    """
+    try:
+        logging.info(f"Atomically saving json file to: {path}")
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, path)
+
+        logging.info(f"json file saved at: {path}")
+
+    except Exception as e:
+        logging.error(f"Error atomically saving json file to: {path}")
+        raise CustomException(e, sys)
+
+
 @ensure_annotations
 def load_json(path: Path) -> ConfigBox:
     """
@@ -134,6 +164,8 @@ def save_bin(data: Any, path: Path):
     try:
         logging.info(f"Saving binary file to: {path}")
 
+        import joblib
+
         joblib.dump(value=data, filename=path)
 
         logging.info(f"Binary file saved at: {path}")
@@ -157,6 +189,8 @@ def load_bin(path: Path) -> Any:
     try:
         logging.info(f"Loading binary file from: {path}")
 
+        import joblib
+
         data = joblib.load(path)
 
         logging.info(f"binary file loaded successfully from: {path}")
@@ -188,3 +222,222 @@ def get_size(path: Path) -> str:
     except Exception as e:
         logging.error(f"Error getting size of file: {path}")
         raise CustomException(e, sys)
+
+
+TABLE_FORMATS = {".parquet": "parquet", ".feather": "feather", ".csv": "csv"}
+
+
+def _table_format(path: Path) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix not in TABLE_FORMATS:
+        raise ValueError(f"Unsupported table format '{suffix}', expected one of: {list(TABLE_FORMATS)}")
+    return TABLE_FORMATS[suffix]
+
+
+def cast_to_schema(data, dtypes: dict):
+    """
+    Casts the columns of a DataFrame to the dtypes of a schema (e.g. processed_schema.yaml). A column is only cast
+    when no value changes (e.g. an int64 column of the schema that was mean imputed keeps its float values); those
+    columns are left as they are and logged.
+
+    Args:
+        data (DataFrame): table to cast
+        dtypes (dict): column -> dtype name; columns not in the DataFrame are ignored
+
+    Returns:
+        DataFrame: the table with cast columns
+    """
+    import numpy as np
+
+    for column, dtype in dtypes.items():
+        # Strings are stored as they are by every format
+        if column not in data.columns or dtype == "object" or str(data[column].dtype) == dtype:
+            continue
+
+        try:
+            cast = data[column].astype(dtype)
+            lossless = np.array_equal(cast.to_numpy(dtype=np.float64), data[column].to_numpy(dtype=np.float64),
+                                      equal_nan=True)
+        except (TypeError, ValueError):
+            lossless = False
+
+        if lossless:
+            data[column] = cast
+        else:
+            logging.warning(f"Column '{column}' kept as {data[column].dtype}: casting it to {dtype} would change "
+                            f"its values")
+
+    return data
+
+
+@ensure_annotations
+def read_table(path: Path, columns=None, dtypes=None):
+    """
+    Reads a tabular artifact, in the format given by its extension (.parquet, .feather or .csv)
+
+    Args:
+        path (Path): path to the table file
+        columns (list): columns to read (column projection: only these are read from a columnar file); all if None
+        dtypes (dict): schema dtypes applied to a CSV file (columnar files store their own dtypes)
+
+    Returns:
+        DataFrame: the table
+    """
+    try:
+        logging.info(f"Reading table from: {path}")
+
+        import pandas as pd
+
+        table_format = _table_format(path)
+        columns = list(columns) if columns is not None else None
+
+        if table_format == "parquet":
+            data = pd.read_parquet(path, columns=columns)
+        elif table_format == "feather":
+            data = pd.read_feather(path, columns=columns)
+        else:
+            data = pd.read_csv(path, usecols=columns)
+            if dtypes:
+                data = cast_to_schema(data, dtypes)
+
+        # read_csv(usecols=...) keeps the file's column order; every format returns the requested order
+        if columns is not None:
+            data = data[columns]
+
+        logging.info(f"Table read successfully from: {path} ({data.shape[0]} rows, {data.shape[1]} columns)")
+        return data
+
+    except Exception as e:
+        logging.error(f"Error reading table from: {path}")
+        raise CustomException(e, sys)
+
+
+@ensure_annotations
+def write_table(data, path: Path, dtypes=None):
+    """
+    Writes a tabular artifact atomically, in the format given by its extension (.parquet, .feather or .csv)
+
+    Args:
+        data (DataFrame): table to write; its index is not written
+        path (Path): path to the table file
+        dtypes (dict): schema dtypes the columns are cast to before writing (see cast_to_schema)
+
+    Returns:
+        None
+    """
+    try:
+        logging.info(f"Writing table to: {path}")
+
+        table_format = _table_format(path)
+        data = data.reset_index(drop=True)
+        if dtypes:
+            data = cast_to_schema(data, dtypes)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        if table_format == "parquet":
+            data.to_parquet(tmp_path, index=False)
+        elif table_format == "feather":
+            data.to_feather(tmp_path)
+        else:
+            data.to_csv(tmp_path, index=False)
+
+        os.replace(tmp_path, path)
+
+        logging.info(f"Table written at: {path} ({data.shape[0]} rows, {data.shape[1]} columns)")
+
+    except Exception as e:
+        logging.error(f"Error writing table to: {path}")
+        raise CustomException(e, sys)
+
+
+@contextmanager
+def table_writer(path: Path, dtypes=None):
+    """
+    Writes a tabular artifact chunk by chunk (format given by its extension, as write_table), atomically: the file
+    appears at `path` only once every chunk is written
+
+    Args:
+        path (Path): path to the table file
+        dtypes (dict): schema dtypes every chunk is cast to before writing (see cast_to_schema); every chunk must
+            end up with the same dtypes
+
+    Yields:
+        function: write(chunk), appending a DataFrame to the table
+    """
+    table_format = _table_format(path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    state = {"writer": None, "schema": None, "header": True, "rows": 0}
+
+    def write(chunk):
+        chunk = chunk.reset_index(drop=True)
+        if dtypes:
+            chunk = cast_to_schema(chunk, dtypes)
+
+        if table_format == "csv":
+            chunk.to_csv(tmp_path, mode="w" if state["header"] else "a", header=state["header"], index=False)
+            state["header"] = False
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk, schema=state["schema"], preserve_index=False)
+            if state["writer"] is None:
+                state["schema"] = table.schema
+                state["writer"] = pq.ParquetWriter(tmp_path, table.schema) if table_format == "parquet" \
+                    else pa.ipc.new_file(tmp_path, table.schema)
+            state["writer"].write_table(table)
+
+        state["rows"] += len(chunk)
+
+    try:
+        logging.info(f"Writing table in chunks to: {path}")
+
+        yield write
+
+        if state["writer"] is not None:
+            state["writer"].close()
+        os.replace(tmp_path, path)
+
+        logging.info(f"Table written at: {path} ({state['rows']} rows)")
+
+    except Exception as e:
+        if state["writer"] is not None:
+            state["writer"].close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        logging.error(f"Error writing table in chunks to: {path}")
+        raise CustomException(e, sys)
+
+
+@ensure_annotations
+def get_table_columns(path: Path) -> list:
+    """
+    Column names of a tabular artifact, read from the file's schema/header only
+
+    Args:
+        path (Path): path to the table file
+
+    Returns:
+        list: column names, in file order
+    """
+    try:
+        table_format = _table_format(path)
+
+        if table_format == "parquet":
+            import pyarrow.parquet as pq
+
+            return list(pq.read_schema(path).names)
+
+        if table_format == "feather":
+            import pyarrow.feather as feather
+
+            return list(feather.read_table(path, memory_map=True).schema.names)
+
+        import pandas as pd
+
+        return list(pd.read_csv(path, nrows=0).columns)
+
+    except Exception as e:
+        logging.error(f"Error reading the columns of table: {path}")
+        raise CustomException(e, sys)